@@ -0,0 +1,153 @@
+"""
+Scaling benchmark of the simulator on synthetic topologies (see
+`utils/functions/generateTopology.py`).
+
+Usage (from the `src` folder):
+------------------------------
+    python3 -m benchmarks.benchmarkSuite [--kinds tree,isp] [--sizes 10,1000]
+                                         [--pairs 20] [--seed 0] [--routing tree]
+                                         [--no-memory] [--json results.json]
+
+For every kind of topology and size it reports the wall time and the peak
+memory (tracemalloc) of each phase:
+
+- `construct_graph`: building the graph from the generated edges
+  (`build_graph`, the streaming equivalent of `construct_graph`).
+- `construct_routings_tables`: all the routing tables, by default in
+  `"tree"` mode up to `LAZY_THRESHOLD` vertices and in `"lazy"` mode above
+  it (all-pairs tables do not fit in memory at 100k vertices).
+- `dijkstra`: one `dijkstra` per sampled pair.
+- `ping` / `traceroute`: `batch_ping` / `batch_traceroute` over the sampled
+  pairs (what `Terminal.ping` and `Terminal.traceroute` compute, without
+  printing or sleeping). In `"lazy"` mode they include building the routes
+  of every vertex crossed, since packets are forwarded hop by hop, so they
+  dominate the run time of the largest sizes.
+
+Tracing memory slows Python down: use `--no-memory` for clean times.
+"""
+
+from utils.functions.generateTopology import TOPOLOGY_KINDS, generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.functions.adaptedDijkstra import dijkstra
+from utils.functions.batchProbes import batch_ping, batch_traceroute
+from time import perf_counter
+import argparse
+import json
+import random
+import tracemalloc
+
+SIZES = [10, 100, 1000, 10000, 100000]
+LAZY_THRESHOLD = 1000
+PHASES = ["construct_graph", "construct_routings_tables", "dijkstra", "ping", "traceroute"]
+
+def measure(function, memory):
+    """
+    Runs 'function' and returns its result, the elapsed time (seconds) and
+    the peak of memory allocated while it ran (bytes, None if 'memory' is
+    False).
+    """
+
+    if memory:
+        tracemalloc.start()
+
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, elapsed, peak
+
+
+def bench(kind, size, pairs=20, seed=0, routing=None, SPEED="fiber", memory=True):
+    """
+    Benchmarks every phase on one generated topology, with the given
+    routing mode (default: chosen by size, see `LAZY_THRESHOLD`).
+
+    Returns:
+    --------
+    result (dict):
+        `kind`, `size`, `vertices`, `edges`, `routing` (the routing mode) and,
+        for each phase, `{"seconds": float, "peak_bytes": int or None}`.
+    """
+
+    records = list(generate_topology(kind, size, seed))
+    routing = routing or ("tree" if size <= LAZY_THRESHOLD else "lazy")
+    result = {"kind": kind, "size": size, "edges": len(records), "routing": routing}
+
+    def record(phase, function):
+        value, elapsed, peak = measure(function, memory)
+        result[phase] = {"seconds": elapsed, "peak_bytes": peak}
+        return value
+
+    graph, vertex_map = record("construct_graph", lambda: build_graph(records, SPEED, backend="dict", routing=routing))
+    result["vertices"] = len(vertex_map)
+
+    record("construct_routings_tables", lambda: graph.construct_routings_tables(vertex_map))
+
+    rng = random.Random(seed)
+    identifiers = graph.vertices
+    sample = [(rng.choice(identifiers), rng.choice(identifiers)) for _ in range(pairs)]
+
+    record("dijkstra", lambda: [dijkstra(graph, vertex_map[source], vertex_map[destiny]) for source, destiny in sample])
+    record("ping", lambda: batch_ping(sample, vertex_map))
+    record("traceroute", lambda: batch_traceroute(sample, vertex_map))
+
+    return result
+
+
+def run(kinds=TOPOLOGY_KINDS, sizes=SIZES, pairs=20, seed=0, routing=None, memory=True):
+    """
+    Runs the benchmark and prints one line per topology and phase.
+
+    Returns:
+    --------
+    results (list of dict): The results of `bench`.
+    """
+
+    results = []
+
+    print(f"{'kind':<10}{'vertices':>9}{'edges':>9}  {'phase':<33}{'time (ms)':>12}{'peak (MB)':>11}")
+
+    for kind in kinds:
+        for size in sizes:
+            result = bench(kind, size, pairs, seed, routing, memory=memory)
+            results.append(result)
+
+            for phase in PHASES:
+                seconds = result[phase]["seconds"]
+                peak = result[phase]["peak_bytes"]
+                peak = f"{peak / 2 ** 20:>11.2f}" if peak is not None else f"{'-':>11}"
+                label = f"{phase} ({result['routing']})" if phase == "construct_routings_tables" else phase
+
+                print(f"{kind:<10}{result['vertices']:>9}{result['edges']:>9}  {label:<33}{seconds * 1000:>12.2f}{peak}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark on synthetic topologies.")
+    parser.add_argument("--kinds", default=",".join(TOPOLOGY_KINDS), help="comma separated kinds of topology")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma separated numbers of vertices")
+    parser.add_argument("--pairs", type=int, default=20, help="pairs sampled for dijkstra, ping and traceroute")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--routing", help="routing mode of every size (default: by size)")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace the peak memory")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(
+        kinds=args.kinds.split(","),
+        sizes=[int(size) for size in args.sizes.split(",")],
+        pairs=args.pairs,
+        seed=args.seed,
+        routing=args.routing,
+        memory=not args.no_memory,
+    )
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
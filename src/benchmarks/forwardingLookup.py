@@ -0,0 +1,84 @@
+"""
+Benchmarks the next hop lookups of a vertex: the exact-match routing table
+(`Vertex.next_hop`), the binary radix trie of its prefix table
+(`PrefixTrie.lookup`) and the multibit trie of its forwarding engine
+(`ForwardingEngine.lookup` and `lookup_batch`), on a synthetic ISP topology
+(see `utils/functions/generateTopology.py`).
+
+Usage (from the `src` folder):
+------------------------------
+    python3 -m benchmarks.forwardingLookup [--vertices 5000] [--lookups 1000000] [--strides 16,8,8] [--seed 0]
+
+The destinies are random addresses of the topology; the trie lookups take
+them as ints. Every lookup method is checked to return the same next hops.
+"""
+
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.functions.prefixRouting import aggregate_routes, CONNECTED, UNREACHABLE
+from utils.structures.prefixTrie import PrefixTrie, ip_to_int
+from utils.structures.forwardingEngine import ForwardingEngine
+from time import perf_counter
+import argparse
+import random
+
+def run(vertices=5000, lookups=1000000, strides=(16, 8, 8), seed=0):
+    """
+    Runs the benchmark and prints one line per lookup method.
+    """
+
+    graph, vertex_map = build_graph(generate_topology("isp", vertices, seed), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "lazy")
+
+    rng = random.Random(seed)
+    identifiers = list(graph.vertices)
+    vertex = vertex_map[identifiers[0]]
+
+    start = perf_counter()
+    trie = PrefixTrie()
+    for prefix, length, next_hop in aggregate_routes(vertex, identifiers):
+        trie.insert(prefix, length, next_hop)
+    engine = ForwardingEngine(trie.entries(), strides)
+    build = perf_counter() - start
+
+    print(f"{vertex.identifier}: {len(identifiers)} destinies, {len(trie)} prefixes, "
+          f"{engine.nbytes / 1024:.0f} KiB of tables (strides {strides}), built in {build * 1000:.0f} ms\n")
+
+    destinies = [rng.choice(identifiers) for _ in range(lookups)]
+    addresses = [ip_to_int(destiny) for destiny in destinies]
+
+    def exact(destiny):
+        next_hop = vertex.next_hop(destiny) if destiny != vertex.identifier else CONNECTED
+        return CONNECTED if next_hop == destiny else next_hop
+
+    methods = [
+        ("next_hop (dict)", lambda: [exact(destiny) for destiny in destinies]),
+        ("radix trie", lambda: [trie.lookup(address) for address in addresses]),
+        ("engine lookup", lambda: [engine.lookup(address) for address in addresses]),
+        ("engine batch", lambda: engine.lookup_batch(addresses)),
+    ]
+
+    print(f"{'method':<18}{'time (s)':>10}{'lookups/s':>14}  results")
+
+    reference = None
+    for name, method in methods:
+        start = perf_counter()
+        result = method()
+        elapsed = perf_counter() - start
+
+        if reference is None:
+            reference = result
+
+        same = result == reference or all(a == b or {a, b} <= {None, UNREACHABLE} for a, b in zip(result, reference))
+        print(f"{name:<18}{elapsed:>10.3f}{lookups / elapsed:>14,.0f}  {'identical' if same else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the next hop lookups.")
+    parser.add_argument("--vertices", type=int, default=5000, help="approximate number of vertices of the topology")
+    parser.add_argument("--lookups", type=int, default=1000000)
+    parser.add_argument("--strides", default="16,8,8", help="comma separated strides of the forwarding engine")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(vertices=args.vertices, lookups=args.lookups, strides=tuple(int(stride) for stride in args.strides.split(",")), seed=args.seed)
@@ -0,0 +1,69 @@
+"""
+Benchmarks `batch_ping` and `batch_traceroute` over a full mesh: every
+ordered pair of a set of hosts of a generated topology (see
+`utils/functions/generateTopology.py`), the reachability sweep they are
+meant for.
+
+Usage (from the `src` folder):
+------------------------------
+    python3 -m benchmarks.fullMesh [--kind tree] [--size 1640] [--hosts 500]
+                                   [--seed 0] [--ecmp] [--traceroute]
+
+It reports the time to build the routing tables and to probe every pair.
+With `--ecmp`, the tables are built in `"ecmp"` mode and every pair is its
+own flow, so the packets are hashed over the equal-cost paths.
+"""
+
+from utils.functions.generateTopology import TOPOLOGY_KINDS, generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.functions.batchProbes import batch_ping, batch_traceroute
+from time import perf_counter
+import argparse
+import itertools
+import random
+
+def run(kind="tree", size=1640, hosts=500, seed=0, ecmp=False, traceroute=False):
+    """
+    Runs the benchmark and prints the time of each phase.
+
+    Returns:
+    --------
+    result (dict):
+        `vertices`, `pairs` and the seconds of `construct_routings_tables`,
+        `ping` and (if requested) `traceroute`.
+    """
+
+    graph, vertex_map = build_graph(generate_topology(kind, size, seed), "fiber", backend="dict")
+
+    start = perf_counter()
+    graph.construct_routings_tables(vertex_map, "ecmp" if ecmp else "tree")
+    result = {"vertices": len(graph.vertices), "construct_routings_tables": perf_counter() - start}
+
+    sample = random.Random(seed).sample(graph.vertices, min(hosts, len(graph.vertices)))
+    pairs = [(source, destiny, (source, destiny)) if ecmp else (source, destiny) for source, destiny in itertools.permutations(sample, 2)]
+    result["pairs"] = len(pairs)
+
+    probes = [("ping", batch_ping)] + ([("traceroute", batch_traceroute)] if traceroute else [])
+    for name, probe in probes:
+        start = perf_counter()
+        probe(pairs, vertex_map)
+        result[name] = perf_counter() - start
+
+    print(f"{kind}: {result['vertices']} vertices, {len(sample)} hosts, {result['pairs']:,} pairs")
+    for phase in ["construct_routings_tables"] + [name for name, _ in probes]:
+        print(f"    {phase:<28}{result[phase]:>10.2f} s")
+
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full mesh benchmark of batch_ping and batch_traceroute.")
+    parser.add_argument("--kind", default="tree", choices=TOPOLOGY_KINDS)
+    parser.add_argument("--size", type=int, default=1640, help="number of vertices of the topology")
+    parser.add_argument("--hosts", type=int, default=500, help="number of hosts of the mesh")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ecmp", action="store_true", help="route in ecmp mode, one flow per pair")
+    parser.add_argument("--traceroute", action="store_true", help="also run batch_traceroute")
+    args = parser.parse_args()
+
+    run(args.kind, args.size, args.hosts, args.seed, args.ecmp, args.traceroute)
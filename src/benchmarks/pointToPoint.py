@@ -0,0 +1,95 @@
+"""
+Benchmarks the single-pair searches of `adaptedDijkstra.py` (`dijkstra`,
+`bidirectional_dijkstra` and `astar`) on large sparse random geometric
+graphs (see `utils/functions/generateTopology.py`).
+
+Usage (from the `src` folder):
+------------------------------
+    python3 -m benchmarks.pointToPoint [--sizes 10000,100000] [--pairs 50] [--seed 0]
+
+For every search it reports the average number of vertices settled and the
+average time per query, and checks that every search finds a path of the
+same cost as `dijkstra`.
+"""
+
+from utils.functions.generateTopology import random_geometric_positions, generate_random_geometric
+from utils.functions.loadTopology import build_graph
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS, dijkstra, bidirectional_dijkstra, astar
+from time import perf_counter
+import argparse
+import math
+import random
+
+SIDE = 1000000.0  # Side of the square where the routers are placed, in meters.
+DEGREE = 8  # Average number of neighbours of a router.
+
+def build(size, seed, SPEED="fiber"):
+    """
+    Builds a random geometric graph of 'size' routers.
+
+    Returns:
+    --------
+        graph, vertex_map, positions
+    """
+
+    positions = random_geometric_positions(size, seed, SIDE)
+    radius = SIDE * math.sqrt(DEGREE / (math.pi * size))
+    graph, vertex_map = build_graph(generate_random_geometric(positions, radius), SPEED, backend="dict")
+    graph.compile_weights(PACKET_SIZE_BITS)
+
+    return graph, vertex_map, positions
+
+
+def run(sizes=(10000, 100000), pairs=50, seed=0):
+    """
+    Runs the benchmark and prints one line per size and search.
+    """
+
+    print(f"{'vertices':>9}{'edges':>9}  {'search':<15}{'expanded':>10}{'time (ms)':>12}{'speedup':>9}  costs")
+
+    for size in sizes:
+        graph, vertex_map, positions = build(size, seed)
+        edges = sum(len(connections) for connections in graph.links.values()) // 2
+
+        rng = random.Random(seed)
+        identifiers = list(vertex_map)
+        sample = [(vertex_map[rng.choice(identifiers)], vertex_map[rng.choice(identifiers)]) for _ in range(pairs)]
+
+        searches = [
+            ("dijkstra", dijkstra),
+            ("bidirectional", bidirectional_dijkstra),
+            ("astar", lambda graph, start, end, stats: astar(graph, start, end, positions, stats)),
+        ]
+
+        reference = None
+        baseline = None
+
+        for name, search in searches:
+            expanded = 0
+            costs = []
+
+            start = perf_counter()
+            for source, destiny in sample:
+                stats = {}
+                path = search(graph, source, destiny, stats=stats)
+                expanded += stats["expanded"]
+                costs.append(path[-1][1] if path else math.inf)
+            elapsed = (perf_counter() - start) / pairs
+
+            if reference is None:
+                reference, baseline = costs, elapsed
+
+            same = all(cost == other or math.isclose(cost, other, rel_tol=1e-9) for cost, other in zip(costs, reference))
+            status = "identical" if same else "DIFFERENT"
+
+            print(f"{len(vertex_map):>9}{edges:>9}  {name:<15}{expanded / pairs:>10.0f}{elapsed * 1000:>12.2f}{baseline / elapsed:>8.1f}x  {status}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the single-pair searches.")
+    parser.add_argument("--sizes", default="10000,100000", help="comma separated numbers of routers")
+    parser.add_argument("--pairs", type=int, default=50, help="number of random (source, destiny) queries")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(sizes=[int(size) for size in args.sizes.split(",")], pairs=args.pairs, seed=args.seed)
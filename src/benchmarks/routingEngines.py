@@ -0,0 +1,68 @@
+"""
+Benchmarks the routing engines of `Graph.construct_routings_tables` on the
+network defined in `utils/settings/adjascentVertices.py`.
+
+Usage (from the `src` folder):
+------------------------------
+    python3 -m benchmarks.routingEngines [repetitions]
+
+For every engine the best wall time over the repetitions is reported, and
+the routing tables are checked against the per-pair `dijkstra` engine.
+"""
+
+from utils.settings.adjascentVertices import major_subnets, conections_in_same_router, host_subnets
+from utils.functions.constructGraph import construct_graph
+from time import perf_counter
+import sys
+
+ENGINES = ["pairwise", "tree", "floyd-warshall"]
+
+def build_tables(engine, SPEED):
+    """
+    Builds the graph and its routing tables with the given engine.
+
+    Returns:
+    --------
+        elapsed (float): Time spent in `construct_routings_tables`, in seconds.
+        tables (dict): { source: { destiny: path } } for every vertex.
+    """
+
+    graph, vertex_map = construct_graph(major_subnets, conections_in_same_router, host_subnets, SPEED, routing=engine)
+
+    start = perf_counter()
+    graph.construct_routings_tables(vertex_map)
+    elapsed = perf_counter() - start
+
+    tables = {
+        source: {destiny: vertex.routing_table[destiny] for destiny in graph.vertices}
+        for source, vertex in vertex_map.items()
+    }
+
+    return elapsed, tables
+
+
+def run(repetitions=5, SPEED="fiber"):
+    """
+    Runs the benchmark and prints one line per engine.
+    """
+
+    _, reference = build_tables("pairwise", SPEED)
+
+    print(f"{'engine':<16}{'best (ms)':>12}{'speedup':>10}  tables")
+
+    baseline = None
+    for engine in ENGINES:
+        best = None
+        for _ in range(repetitions):
+            elapsed, tables = build_tables(engine, SPEED)
+            best = elapsed if best is None else min(best, elapsed)
+
+        if baseline is None:
+            baseline = best
+
+        status = "identical" if tables == reference else "DIFFERENT"
+        print(f"{engine:<16}{best * 1000:>12.2f}{baseline / best:>9.1f}x  {status}")
+
+
+if __name__ == "__main__":
+    run(repetitions=int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,96 @@
+"""
+Benchmarks `TerminalServer` with many simultaneous sessions on the network
+of `utils/settings/adjascentVertices.py`.
+
+Usage (from the `src` folder):
+------------------------------
+    python3 -m benchmarks.terminalSessions [--sessions 300] [--commands 2] [--seed 0] [--virtual-time]
+
+The server and the clients run in the same event loop. Every client opens a
+session and sends random `ping` and `traceroute` commands, waiting for the
+prompt after each one. The report compares the wall time with the sum of
+the delays of the output of every session (the time they would take one
+after the other). With `--virtual-time`, the server uses a `VirtualClock` and
+the sessions run at CPU speed.
+"""
+
+from utils.settings.adjascentVertices import major_subnets, conections_in_same_router, host_subnets, routers_ips
+from utils.functions.constructGraph import construct_graph
+from utils.structures.commandDispatcher import CommandDispatcher
+from utils.structures.terminalServer import TerminalServer
+from utils.structures.clock import RealClock, VirtualClock
+from time import perf_counter
+import argparse
+import asyncio
+import random
+
+PROMPT_END = b":~$ "
+
+async def client(host, port, commands):
+    """
+    Runs one session and returns the number of lines received.
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+    received = 0
+
+    await reader.readuntil(PROMPT_END)
+    for command in commands:
+        writer.write(f"{command}\n".encode())
+        await writer.drain()
+        received += (await reader.readuntil(PROMPT_END)).count(b"\n")
+
+    writer.write(b"exit\n")
+    await writer.drain()
+    writer.close()
+
+    return received
+
+
+async def run(sessions=300, commands=2, seed=0, virtual_time=False):
+    """
+    Runs the benchmark and prints its report.
+    """
+
+    graph, vertex_map = construct_graph(major_subnets, conections_in_same_router, host_subnets, 'fiber')
+    graph.construct_routings_tables(vertex_map)
+
+    dispatcher = CommandDispatcher(graph, vertex_map, routers=routers_ips)
+    clock = VirtualClock() if virtual_time else RealClock()
+    server = TerminalServer(dispatcher, initial_vertex='172.16.10.1', clock=clock)
+
+    # Sum of the output delays of every command, to compare with the wall time.
+    delays = []
+    render = dispatcher.render
+    dispatcher.render = lambda result: [delays.append(delay) or (delay, line) for delay, line in render(result)]
+
+    ready = asyncio.get_running_loop().create_future()
+    serving = asyncio.create_task(server.serve("127.0.0.1", 0, ready))
+    host, port = await ready
+
+    rng = random.Random(seed)
+    hosts = [identifier for identifier in vertex_map if identifier not in routers_ips]
+    scripts = [[f"{rng.choice(('ping', 'traceroute'))} {rng.choice(hosts)}" for _ in range(commands)] for _ in range(sessions)]
+
+    start = perf_counter()
+    received = await asyncio.gather(*(client(host, port, script) for script in scripts))
+    elapsed = perf_counter() - start
+
+    serving.cancel()
+
+    serial = sum(delays)
+    print(f"{sessions} sessions, {server.commands} commands, {sum(received)} lines")
+    print(f"wall time: {elapsed:.2f} s, one session after the other: {serial:.2f} s ({serial / elapsed:.0f}x)")
+    if virtual_time:
+        print(f"simulated time: {clock.now():.2f} s, {server.commands / elapsed:.0f} commands/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of simultaneous terminal sessions.")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--commands", type=int, default=2, help="commands per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--virtual-time", action="store_true", help="do not wait the delays of the output")
+    args = parser.parse_args()
+
+    asyncio.run(run(sessions=args.sessions, commands=args.commands, seed=args.seed, virtual_time=args.virtual_time))
@@ -21,12 +21,54 @@ Details:
 --------
 - `construct_graph(adjacent_vertices)`: Builds a Graph object from an adjacency list 
   (`adjacent_vertices`).
+- `construct_routings_tables_cached(...)`: Loads the routing tables from the on-disk
+  cache when the topology did not change (see `diskRouteCache.py`), or builds and
+  saves them.
 - `vertex_map`: A dictionary mapping string identifiers (e.g., "H1", "CORE") to actual
   Vertex objects in the graph.
 - `Terminal`:
     - `ping(destiny, graph)`: Simulates ping output.
     - `traceroute(destiny, graph)`: Simulates traceroute output.
     - `navigate_to(new_vertex)`: Changes the current vertex on the terminal.
+- `stats`: Shows the counters and phase timers of the instrumentation (see
+  `instrumentation.py`), enabled with `stats on` or `--instrument`, and the
+  memory of the routing tables. `stats profile <command>` and
+  `stats memory <command>` run a command under cProfile or tracemalloc (saving
+  the snapshots in `--profile-dir`, if given).
+- `flow <destiny> <rate>`: With `--simulate`, the pings are sent through the
+  packet-level simulation (see `eventSimulator.py`) instead of the routing
+  tables, and this command adds background traffic of 'rate' bits per second
+  from the current host, so the pings show the queueing delay it causes.
+- `CommandDispatcher`: Parses and runs the commands of the terminal (see
+  `commandDispatcher.py`).
+
+Batch mode:
+-----------
+    python3 main.py --batch commands.txt [--seed 0]
+    python3 main.py --batch - < commands.txt
+
+runs the commands of a file (or of the standard input, with '-'), one per line,
+without interaction, and writes the result of each one as a line of JSON (see
+`batchCommands.py`). The network is built once, and nothing is waited or cleared.
+The exit status is 1 if any command failed.
+
+Startup:
+--------
+The prompt is shown before the network exists: the graph and the routing tables
+are built in a background thread (see `networkBuilder.py`) while the first
+command is typed. `--timings` prints the duration of each startup phase.
+
+Server mode:
+------------
+    python3 main.py --serve [--host 127.0.0.1] [--port 8023]
+
+serves any number of simultaneous sessions over TCP instead (see
+`terminalServer.py`), e.g. `nc 127.0.0.1 8023`. Every session shares the same
+network and instrumentation, so `changenetwork`, `stats on`, `stats off` and
+`stats reset` are not available (use `--instrument`).
+
+With `--virtual-time`, the output of the commands is shown at once: the delays
+only move a simulated clock (see `clock.py`), and the times shown stay the same.
 
 Example Commands:
 ----------------
@@ -42,79 +84,151 @@ Authors
     - Carlos Cauã
 """
 
-from utils.settings.adjascentVertices import major_subnets, conections_in_same_router, host_subnets, routers_ips
-from utils.functions.constructGraph import construct_graph
+from time import perf_counter
+started = perf_counter()
+
 from utils.structures.terminal import Terminal
-from time import sleep
-import os
+from utils.structures.commandDispatcher import CommandDispatcher, CLEAR_SCREEN
+from utils.structures.networkBuilder import NetworkBuilder
+from utils.structures.clock import RealClock, VirtualClock
+from utils.structures.instrumentation import INSTRUMENTATION
+import argparse
+import random
+import sys
+
+imported = perf_counter()
+
+def build_network(builder):
+    """
+    Builds the network and returns the dispatcher of its commands. The
+    interactive terminal runs it in the background (see `NetworkBuilder`).
+    """
+
+    with builder.phase("imports"):
+        from utils.settings.adjascentVertices import major_subnets, conections_in_same_router, host_subnets, routers_ips
+        from utils.functions.constructGraph import construct_graph
+        from utils.functions.diskRouteCache import construct_routings_tables_cached, topology_hash
+        from utils.structures.eventSimulator import EventSimulator
+
+    with builder.phase("graph"):
+        graph, vertex_map = construct_graph(major_subnets, conections_in_same_router, host_subnets, 'fiber')
+
+    with builder.phase("routing tables"):
+        construct_routings_tables_cached(graph, vertex_map, topology_hash(major_subnets, conections_in_same_router, host_subnets, 'fiber'), mode="tree")
+
+    def change_network(medium):
+        # Tables built here (not loaded from the cache) are reweighted in place.
+        if graph.routed_mode == "tree":
+            graph.set_medium(medium)
+            return
+
+        graph.set_medium(medium, reroute=False)
+        construct_routings_tables_cached(graph, vertex_map, topology_hash(major_subnets, conections_in_same_router, host_subnets, medium), mode="tree")
+
+    simulator = EventSimulator(graph, vertex_map) if args.simulate else None
+
+    return CommandDispatcher(graph, vertex_map, routers=routers_ips, change_network=change_network, simulator=simulator, profile_dir=args.profile_dir)
+
+def print_timings(first_prompt=None):
+    """
+    Prints the duration of the startup phases (with --timings) to stderr.
+    """
+
+    if not args.timings:
+        return
+
+    phases = [("imports", imported - started)]
+    if first_prompt is not None:
+        phases.append(("first prompt", first_prompt - started))
+    phases.extend((f"network {name}", duration) for name, duration in builder.timings.items())
+
+    for name, duration in phases:
+        print(f"{name:>24}: {duration * 1000:8.1f} ms", file=sys.stderr)
+
+parser = argparse.ArgumentParser(description="Simulated network terminal.")
+parser.add_argument("--serve", action="store_true", help="serve simultaneous sessions over TCP instead of the interactive terminal")
+parser.add_argument("--host", default="127.0.0.1", help="address of the server (with --serve)")
+parser.add_argument("--port", type=int, default=8023, help="port of the server (with --serve)")
+parser.add_argument("--batch", metavar="FILE", help="run the commands of a file ('-' for the standard input) and write their results as JSON lines")
+parser.add_argument("--seed", type=int, help="seed of the random variations of the times (with --batch)")
+parser.add_argument("--virtual-time", action="store_true", help="show the output of the commands at once, moving a simulated clock instead of waiting")
+parser.add_argument("--timings", action="store_true", help="print the duration of the startup phases to stderr")
+parser.add_argument("--instrument", action="store_true", help="record counters and phase timers from the start (see the 'stats' command)")
+parser.add_argument("--profile-dir", metavar="DIR", help="where 'stats profile' and 'stats memory' save their snapshots")
+parser.add_argument("--simulate", action="store_true", help="send the pings through the packet-level simulation, with the background traffic of the 'flow' command")
+args = parser.parse_args()
+
+if args.instrument:
+    INSTRUMENTATION.enable()
+clock = VirtualClock() if args.virtual_time else RealClock()
+builder = NetworkBuilder(build_network)
+
+if args.serve:
+    from utils.structures.terminalServer import TerminalServer
+    import asyncio
+
+    dispatcher = builder.result()
+    dispatcher.change_network = None  # Every session shares the network...
+    dispatcher.control_instrumentation = False  # ...and the instrumentation.
+    print_timings()
+
+    server = TerminalServer(dispatcher, initial_vertex='172.16.10.1', clock=clock)
+    print(f"Serving terminal sessions on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    raise SystemExit
+
+terminal = Terminal(initial_vertex='172.16.10.1', clock=clock)
+
+if args.batch is not None:
+    dispatcher = builder.result()
+    print_timings()
+
+    if args.seed is not None:
+        random.seed(args.seed)
 
-os.system('cls' if os.name == 'nt' else 'clear')
-graph, vertex_map = construct_graph(major_subnets, conections_in_same_router, host_subnets, 'fiber')
-graph.construct_routings_tables(vertex_map)
-terminal = Terminal(initial_vertex='172.16.10.1')
+    from utils.functions.batchCommands import run_batch
+
+    commands = sys.stdin if args.batch == '-' else open(args.batch)
+    with commands:
+        summary = run_batch(dispatcher, terminal, commands)
+
+    raise SystemExit(1 if summary["failed"] else 0)
+
+# The prompt is shown at once; the network is built while the first command
+# is typed, and only waited for if it is not ready when the command arrives.
+builder.start()
+dispatcher = None
+first_prompt = None
+
+print(CLEAR_SCREEN, end='', flush=True)
 
 while True:
-    str_input = input(f"root@{terminal.current_vertex}:~$ ")
-    str_input = str_input.split()
+    if first_prompt is None:
+        first_prompt = perf_counter()
 
     try:
-        # PING
-        if str_input[0] == 'ping':
-            if str_input[1] in vertex_map:
-                terminal.ping(destiny=str_input[1], vertex_map=vertex_map, graph=graph)
-            else:
-                print("The provided destiny dont exists in the network.\n")
-
-        # CLEAR
-        elif str_input[0] == 'clear':
-            os.system('cls' if os.name == 'nt' else 'clear')
-
-        # TRACEROUTE
-        elif str_input[0] == 'traceroute':
-            if str_input[1] in vertex_map:
-                if str_input[1] not in routers_ips:
-                    terminal.traceroute(destiny=str_input[1], graph=graph, vertex_map=vertex_map)
-                else:
-                    print("\nIt is not possible to trace the route to a router.\n")
-            else:
-                print("The provided destiny dont exists in the network.\n")
-
-        # CHANGETO - Select a new host for the terminal
-        elif str_input[0] == 'changeto':
-            if str_input[1] in vertex_map:
-                terminal.navigate_to(new_vertex=str_input[1])
-                os.system('cls' if os.name == 'nt' else 'clear')
-            else:
-                print("The provided new host dont exists in the network.\n")
-
-        # CHANGENETWORK - Select a new type of network
-        elif str_input[0] == 'changenetwork':
-            if (str_input[1] == 'fiber'):
-                graph, vertex_map = construct_graph(major_subnets, conections_in_same_router, host_subnets, 'fiber')
-                graph.construct_routings_tables(vertex_map)
-
-                os.system('cls' if os.name == 'nt' else 'clear')
-                print('New type of network defined!')
-                sleep(2)
-                os.system('cls' if os.name == 'nt' else 'clear')
-
-            if (str_input[1] == 'coaxial'):
-                graph, vertex_map = construct_graph(major_subnets, conections_in_same_router, host_subnets, 'coaxial')
-                graph.construct_routings_tables(vertex_map)
-
-                os.system('cls' if os.name == 'nt' else 'clear')
-                print('New type of network defined!')
-                sleep(2)
-                os.system('cls' if os.name == 'nt' else 'clear')
-
-            else:
-                print("The provided type of network is not available.\n")
-
-        # Invalid command
+        str_input = input(f"root@{terminal.current_vertex}:~$ ")
+    except (EOFError, KeyboardInterrupt):
+        print()
+        break
+
+    if dispatcher is None:
+        dispatcher = builder.result()
+
+    try:
+        result = dispatcher.execute(terminal, str_input)
+    except Exception as error:
+        result = dispatcher.failure(str_input, error)
+
+    for delay, line in dispatcher.render(result):
+        clock.sleep(delay)
+        if line == CLEAR_SCREEN:
+            print(line, end='', flush=True)
         else:
-            print("The provided comand is not recognized.")
-            print('Try: "ping <destiny>", "traceroute <destiny>", "clear", "changenetwork <fiber or coaxial>" or "changeto <new host>"\n')
-    
-    except:
-        print("The provided comand is not recognized.")
-        print('Try: "ping <destiny>", "traceroute <destiny>", "clear", "changenetwork <fiber or coaxial>" or "changeto <new host>"\n')
\ No newline at end of file
+            print(line)
+
+builder.ready.wait()
+print_timings(first_prompt)
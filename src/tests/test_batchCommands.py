@@ -0,0 +1,48 @@
+from utils.functions.batchCommands import run_batch
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.clock import VirtualClock
+from utils.structures.commandDispatcher import CommandDispatcher
+from utils.structures.terminal import Terminal
+import io
+import json
+
+
+def run(commands, broken=None):
+    """
+    Runs 'commands' in batch mode and returns the summary, the JSON records
+    and the vertices of the network. The handler of the 'broken' command
+    raises an exception.
+    """
+
+    graph, vertex_map = build_graph(generate_topology("tree", 20, seed=0), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "tree")
+    dispatcher = CommandDispatcher(graph, vertex_map)
+
+    if broken is not None:
+        def handler(terminal, arguments):
+            raise KeyError(arguments[0])
+        dispatcher._handlers[broken] = handler
+
+    output = io.StringIO()
+    terminal = Terminal(initial_vertex=graph.vertices[0], clock=VirtualClock())
+    summary = run_batch(dispatcher, terminal, [command.format(*graph.vertices) for command in commands], output)
+
+    return summary, [json.loads(line) for line in output.getvalue().splitlines()], graph.vertices
+
+
+def test_batch_writes_one_record_per_command():
+    summary, records, vertices = run(["# comment", "ping {19}", "", "changeto {1}", "jump {2}"])
+
+    assert summary == {"commands": 3, "failed": 1}
+    assert [(record["line"], record["command"], record["ok"]) for record in records] == [(2, "ping", True), (4, "changeto", True), (5, "jump", False)]
+    assert records[0]["source"] == vertices[0] and records[0]["destiny"] == vertices[19]
+    assert records[2]["error"] == records[2]["error"].strip()
+
+
+def test_an_exception_is_an_error_record_and_the_batch_goes_on():
+    summary, records, vertices = run(["traceroute {19}", "ping {19}"], broken="traceroute")
+
+    assert summary == {"commands": 2, "failed": 1}
+    assert records[0] == {"line": 1, "input": f"traceroute {vertices[19]}", "command": "traceroute", "ok": False, "error": repr(vertices[19])}
+    assert records[1]["ok"]
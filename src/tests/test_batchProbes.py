@@ -0,0 +1,72 @@
+from utils.functions.batchProbes import batch_ping, batch_traceroute
+from utils.functions.defineLinkProperties import define_link_properties
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.graph import Graph
+from utils.structures.vertex import Vertex
+import itertools
+import math
+import pytest
+
+
+def walk(vertex_map, source, destiny, flow=None):
+    """
+    Returns the cost of going hop by hop from 'source' to 'destiny'.
+    """
+
+    pointer = vertex_map[source]
+    if math.isinf(pointer.path_cost(destiny)):
+        return math.inf
+
+    cost = 0
+    while pointer.identifier != destiny:
+        cost += pointer.hop_cost(destiny, flow)
+        pointer = vertex_map[pointer.next_hop(destiny, flow)]
+
+    return cost
+
+
+@pytest.mark.parametrize("kind", ["fat-tree", "isp", "geometric"])
+@pytest.mark.parametrize("mode, flows", [("tree", False), ("ecmp", False), ("ecmp", True)])
+def test_full_mesh_matches_the_hop_by_hop_costs(kind, mode, flows):
+    graph, vertex_map = build_graph(generate_topology(kind, 40, seed=1), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, mode)
+
+    pairs = [(source, destiny, (source, destiny, k) if flows else None) for source, destiny in itertools.permutations(graph.vertices, 2) for k in range(2)]
+    results = batch_ping([pair if flows else pair[:2] for pair in pairs], vertex_map, count=1)
+
+    for (source, destiny, flow), result in zip(pairs, results):
+        expected = walk(vertex_map, source, destiny, flow) + walk(vertex_map, destiny, source, flow)
+
+        assert result["reachable"] == (not math.isinf(expected))
+        if result["reachable"]:
+            assert result["avg"] == pytest.approx(expected * 1000, abs=1e-9)
+
+
+def test_flows_leave_a_router_with_no_cost_links():
+    # R1, R2 and R3 are linked with no cost (the same router); only R2 and
+    # R3 lead to X.
+    graph, vertex_map = Graph(), {}
+    for identifier in ("A", "R1", "R2", "R3", "X", "B"):
+        graph.add_vertex(identifier)
+        vertex_map[identifier] = Vertex(identifier)
+
+    for identifier1, identifier2, type in [
+        ("A", "R1", "host subnet"), ("R1", "R2", "same router"), ("R2", "R3", "same router"),
+        ("R1", "R3", "same router"), ("R2", "X", "major subnet"), ("R3", "X", "major subnet"), ("X", "B", "host subnet"),
+    ]:
+        graph.link_vertices(vertex_map[identifier1], vertex_map[identifier2], define_link_properties(type, "fiber"))
+
+    graph.construct_routings_tables(vertex_map, "ecmp")
+    pairs = [(source, destiny, (source, destiny, k)) for source, destiny in itertools.permutations(graph.vertices, 2) for k in range(50)]
+
+    for source, destiny, flow in pairs:
+        pointer, hops = source, 0
+        while pointer != destiny and hops < len(graph.vertices):
+            pointer = vertex_map[pointer].next_hop(destiny, flow)
+            hops += 1
+
+        assert pointer == destiny
+
+    assert all(result["reachable"] for result in batch_ping(pairs, vertex_map, count=1))
+    assert all(result["reachable"] for result in batch_traceroute(pairs, vertex_map))
@@ -0,0 +1,54 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.clock import VirtualClock
+from utils.structures.terminal import Terminal, ping_lines
+from time import perf_counter
+import asyncio
+import random
+
+
+def test_virtual_sleep_only_moves_the_clock():
+    clock = VirtualClock(start=10.0)
+    start = perf_counter()
+
+    clock.sleep(3600)
+    clock.sleep(-5)
+    clock.sleep(0.25)
+
+    assert clock.now() == 3610.25
+    assert perf_counter() - start < 0.5
+
+
+def test_virtual_async_sleep_lets_the_other_tasks_run():
+    clock = VirtualClock()
+    steps = []
+
+    async def session(name):
+        for _ in range(3):
+            await clock.async_sleep(600)
+            steps.append(name)
+
+    async def main():
+        await asyncio.gather(session("a"), session("b"))
+
+    start = perf_counter()
+    asyncio.run(main())
+
+    assert steps == ["a", "b"] * 3
+    assert clock.now() == 3600
+    assert perf_counter() - start < 0.5
+
+
+def test_virtual_ping_shows_the_output_of_the_real_clock(capsys):
+    graph, vertex_map = build_graph(generate_topology("tree", 20, seed=0), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "tree")
+    clock = VirtualClock()
+    terminal = Terminal(initial_vertex=graph.vertices[0], clock=clock)
+
+    random.seed(1)
+    expected = ping_lines(terminal.ping_result(graph.vertices[-1], vertex_map))
+    random.seed(1)
+    terminal.ping(graph.vertices[-1], graph, vertex_map)
+
+    assert capsys.readouterr().out == "".join(f"{line}\n" for _, line in expected)
+    assert clock.now() == sum(delay for delay, _ in expected) > 0
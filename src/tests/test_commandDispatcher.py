@@ -0,0 +1,16 @@
+from utils.structures.commandDispatcher import CommandDispatcher
+from utils.structures.instrumentation import INSTRUMENTATION
+from utils.structures.terminal import Terminal
+import pytest
+
+
+@pytest.mark.parametrize("action", ["on", "off", "reset"])
+def test_instrumentation_control_can_be_turned_off(action):
+    dispatcher = CommandDispatcher(None, {"H1": None})
+    dispatcher.control_instrumentation = False
+    enabled, counters = INSTRUMENTATION.enabled, dict(INSTRUMENTATION.counters)
+
+    result = dispatcher.execute(Terminal(initial_vertex="H1"), f"stats {action}")
+
+    assert not result["ok"]
+    assert (INSTRUMENTATION.enabled, dict(INSTRUMENTATION.counters)) == (enabled, counters)
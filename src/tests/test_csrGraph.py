@@ -0,0 +1,24 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+import pytest
+
+
+@pytest.mark.parametrize("kind", ["geometric", "isp"])
+@pytest.mark.parametrize("medium", ["fiber", "coaxial"])
+def test_csr_backend_matches_the_dict_backend(kind, medium):
+    records = list(generate_topology(kind, 60, seed=4))
+    graph, vertex_map = build_graph(records, "fiber", backend="dict")
+    csr_graph, csr_vertex_map = build_graph(records, "fiber", backend="csr")
+
+    graph.set_medium(medium)
+    csr_graph.set_medium(medium)
+    graph.construct_routings_tables(vertex_map, "tree")
+    csr_graph.construct_routings_tables(csr_vertex_map, "tree")
+
+    for identifier in graph.vertices:
+        links = sorted((adj.identifier, link.distance, link.transmissionRate, link.SPEED) for adj, link in graph.links[vertex_map[identifier]])
+        csr_links = sorted((adj, link.distance, link.transmissionRate, link.SPEED) for adj, link in csr_graph.neighbors(identifier))
+        assert csr_links == links
+
+        for destiny in graph.vertices:
+            assert csr_vertex_map[identifier].path_cost(destiny) == pytest.approx(vertex_map[identifier].path_cost(destiny))
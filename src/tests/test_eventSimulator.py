@@ -0,0 +1,28 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.eventSimulator import EventSimulator
+import pytest
+
+
+def simulator(buffer_bits=None):
+    graph, vertex_map = build_graph(generate_topology("tree", 20, seed=0), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "tree")
+    return EventSimulator(graph, vertex_map, buffer_bits=buffer_bits), graph.vertices
+
+
+def test_a_packet_larger_than_the_buffer_is_dropped_on_an_idle_link():
+    events, vertices = simulator(buffer_bits=8000)
+
+    result = events.ping(vertices[0], vertices[-1], count=2, packet_size_bits=12000)
+
+    assert not result["reachable"]
+    assert (events.delivered, events.dropped) == (0, 2)
+
+
+@pytest.mark.parametrize("buffer_bits", [None, 12000])
+def test_a_packet_that_fits_the_buffer_is_delivered(buffer_bits):
+    events, vertices = simulator(buffer_bits=buffer_bits)
+
+    result = events.ping(vertices[0], vertices[-1], count=2, packet_size_bits=12000)
+
+    assert result["reachable"] and events.dropped == 0
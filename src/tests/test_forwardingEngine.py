@@ -0,0 +1,65 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.functions.prefixRouting import construct_forwarding_engines, construct_prefix_tables
+from utils.structures.forwardingEngine import ForwardingEngine
+from utils.structures.prefixTrie import PrefixTrie, ip_to_int
+import pytest
+import random
+
+
+def random_entries(rng, count):
+    """
+    Random prefixes of every length, nested around a few addresses so many
+    of them overlap.
+    """
+
+    bases = [rng.getrandbits(32) for _ in range(8)]
+    entries = []
+
+    for i in range(count):
+        length = rng.randint(0, 32)
+        address = rng.choice(bases) ^ rng.getrandbits(32 - length) if length else 0
+        mask = ((1 << length) - 1) << (32 - length)
+        entries.append((address & mask, length, f"hop{i % 13}"))
+
+    return entries
+
+
+@pytest.mark.parametrize("strides", [(16, 8, 8), (8, 8, 8, 8), (24, 8), (20, 12)])
+@pytest.mark.parametrize("seed", range(3))
+def test_lookups_agree_with_the_prefix_trie(strides, seed):
+    rng = random.Random(seed)
+    trie = PrefixTrie()
+    for prefix, length, next_hop in random_entries(rng, 300):
+        trie.insert(prefix, length, next_hop)
+
+    engine = ForwardingEngine(trie.entries(), strides)
+
+    prefixes = [prefix for prefix, _, _ in trie.entries()]
+    addresses = [rng.getrandbits(32) for _ in range(2000)]
+    addresses += [prefix ^ rng.getrandbits(rng.randint(0, 12)) for prefix in prefixes]
+    addresses += [0, 2 ** 32 - 1]
+
+    expected = [trie.lookup(address) for address in addresses]
+    assert [engine.lookup(address) for address in addresses] == expected
+    assert engine.lookup_batch(addresses) == expected
+
+
+def test_no_default_route_gives_no_next_hop():
+    engine = ForwardingEngine([(10 << 24, 8, "gateway")])
+
+    assert engine.lookup((10 << 24) + 5) == "gateway"
+    assert engine.lookup(11 << 24) is None
+
+
+def test_vertices_route_like_their_prefix_tables():
+    graph, vertex_map = build_graph(generate_topology("isp", 120, seed=6), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "tree")
+    construct_prefix_tables(graph, vertex_map)
+    expected = {identifier: [vertex_map[identifier].route(destiny) for destiny in graph.vertices] for identifier in graph.vertices}
+
+    construct_forwarding_engines(graph, vertex_map)
+
+    addresses = [ip_to_int(destiny) for destiny in graph.vertices]
+    assert {identifier: [vertex_map[identifier].route(destiny) for destiny in graph.vertices] for identifier in graph.vertices} == expected
+    assert {identifier: vertex_map[identifier].route_batch(addresses) for identifier in graph.vertices} == expected
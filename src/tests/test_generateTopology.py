@@ -0,0 +1,49 @@
+from utils.functions.adaptedDijkstra import shortest_path_tree
+from utils.functions.generateTopology import TOPOLOGY_KINDS, generate_random_geometric, generate_topology, random_geometric_positions, write_topology
+from utils.functions.loadTopology import build_graph, iter_topology_records
+import itertools
+import math
+import pytest
+
+
+@pytest.mark.parametrize("kind", ["tree", "fat-tree", "isp"])
+@pytest.mark.parametrize("size", [50, 400])
+def test_topologies_are_connected_and_about_the_requested_size(kind, size):
+    graph, vertex_map = build_graph(generate_topology(kind, size, seed=1), "fiber", backend="dict")
+
+    dist, _, _ = shortest_path_tree(graph, vertex_map[graph.vertices[0]])
+
+    assert len(dist) == len(graph.vertices)
+    if kind == "isp":
+        assert 0.5 * size <= len(graph.vertices) <= 1.5 * size
+    else:
+        assert len(graph.vertices) >= size
+
+
+def test_geometric_links_are_every_pair_within_the_radius():
+    positions = random_geometric_positions(300, seed=3)
+    radius = 90000.0
+
+    links = {(source, target): distance for source, target, _, distance, _ in generate_random_geometric(positions, radius)}
+
+    expected = {
+        (source, target): math.dist(positions[source], positions[target])
+        for source, target in itertools.combinations(sorted(positions), 2)
+        if math.dist(positions[source], positions[target]) <= radius
+    }
+    assert links == expected
+
+
+@pytest.mark.parametrize("kind", TOPOLOGY_KINDS)
+def test_topologies_depend_only_on_the_seed(kind):
+    assert list(generate_topology(kind, 100, seed=5)) == list(generate_topology(kind, 100, seed=5))
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_written_topologies_are_read_back(tmp_path, extension):
+    records = list(generate_topology("isp", 100, seed=2))
+    path = str(tmp_path / f"topology.{extension}")
+
+    write_topology(path, records)
+
+    assert list(iter_topology_records(path)) == records
@@ -0,0 +1,79 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.graph import Graph
+from utils.structures.link import Link
+from utils.structures.vertex import Vertex
+import math
+import pytest
+import random
+
+
+def rebuilt_costs(graph, vertex_map):
+    """
+    Builds the routing tables of a copy of the graph from scratch and
+    returns the cost of every route.
+    """
+
+    copy, copy_map = Graph(), {}
+    for identifier in graph.vertices:
+        copy.add_vertex(identifier)
+        copy_map[identifier] = Vertex(identifier)
+
+    for vertex, connections in graph.links.items():
+        for adj_vertex, link in connections:
+            copy.link_vertices(copy_map[vertex.identifier], copy_map[adj_vertex.identifier], link)
+
+    copy.construct_routings_tables(copy_map, "tree")
+
+    return {(source, destiny): copy_map[source].path_cost(destiny) for source in copy.vertices for destiny in copy.vertices}
+
+
+def assert_matches_rebuild(graph, vertex_map):
+    _, edge_index = graph.compile_weights(PACKET_SIZE_BITS)
+
+    for (source, destiny), cost in rebuilt_costs(graph, vertex_map).items():
+        path = vertex_map[source].routing_table[destiny]
+
+        if math.isinf(cost):
+            assert path == []
+            continue
+
+        assert path[0] == (source, 0.0) and path[-1][0] == destiny
+        assert path[-1][1] == pytest.approx(cost, rel=1e-12)
+
+        for (u, u_cost), (v, v_cost) in zip(path, path[1:]):
+            assert v_cost == pytest.approx(u_cost + edge_index[(vertex_map[u], vertex_map[v])], rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_repaired_tables_match_a_full_rebuild(seed):
+    graph, vertex_map = build_graph(generate_topology("geometric", 40, seed=seed), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "tree")
+    rng = random.Random(seed)
+
+    def link(distance):
+        return Link(distance=distance, transmissionRate=1e9, SPEED="fiber")
+
+    for step in range(40):
+        edges = [(u, v) for u, connections in graph.links.items() for v, _ in connections if u.identifier < v.identifier]
+        u, v = rng.choice(edges)
+        current = next(l for adj, l in graph.links[u] if adj is v)
+        operation = step % 5
+
+        if operation == 0:
+            graph.update_link(u, v, link(current.distance * rng.uniform(1.5, 20)))  # Increase.
+        elif operation == 1:
+            graph.update_link(u, v, link(current.distance * rng.uniform(0.01, 0.7)))  # Decrease.
+        elif operation == 2:
+            graph.unlink_vertices(u, v)
+        elif operation == 3:
+            unlinked = [w for w in graph.vertices if not graph.is_linked(u, vertex_map[w]) and w != u.identifier]
+            graph.link_vertices(u, vertex_map[rng.choice(unlinked)], link(rng.uniform(1e3, 1e5)))
+        else:
+            identifier = f"new-{step}"
+            vertex_map[identifier] = Vertex(identifier)
+            graph.add_vertex(identifier)
+            graph.link_vertices(vertex_map[identifier], u, link(rng.uniform(1e3, 1e5)))
+
+        assert_matches_rebuild(graph, vertex_map)
@@ -0,0 +1,31 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.graph import Graph
+from utils.structures.mappedNetwork import open_network, save_network
+import pytest
+
+
+@pytest.mark.parametrize("backend, mode", [("dict", "tree"), ("dict", "ecmp"), ("dict", "compact"), ("csr", "tree"), ("csr", "parallel")])
+def test_saving_keeps_the_routing_tables(tmp_path, backend, mode):
+    graph, vertex_map = build_graph(generate_topology("isp", 40, seed=2), "fiber", backend=backend)
+    graph.routing_workers = 2
+    graph.construct_routings_tables(vertex_map, mode)
+    tables = {identifier: (vertex_map[identifier].routing_table, vertex_map[identifier].multipath_table) for identifier in graph.vertices}
+
+    save_network(str(tmp_path / "network.bin"), graph, vertex_map)
+
+    assert all((vertex_map[identifier].routing_table, vertex_map[identifier].multipath_table) == tables[identifier] for identifier in graph.vertices)
+    assert all(vertex_map[identifier].routing_table is tables[identifier][0] for identifier in graph.vertices)
+
+    mapped_graph, mapped_vertex_map = open_network(str(tmp_path / "network.bin"))
+    for source in graph.vertices:
+        for destiny in graph.vertices:
+            assert mapped_vertex_map[source].path_cost(destiny) == pytest.approx(vertex_map[source].path_cost(destiny))
+
+
+def test_saving_an_empty_network(tmp_path):
+    save_network(str(tmp_path / "empty.bin"), Graph(), {})
+    mapped_graph, mapped_vertex_map = open_network(str(tmp_path / "empty.bin"))
+
+    assert mapped_graph.vertices == []
+    assert len(mapped_vertex_map) == 0
@@ -0,0 +1,45 @@
+from utils.structures.networkBuilder import NetworkBuilder
+import threading
+import pytest
+
+
+def test_the_build_runs_in_the_background():
+    release = threading.Event()
+    threads = []
+
+    def build(builder):
+        with builder.phase("graph"):
+            release.wait(5)
+        threads.append(threading.current_thread())
+        return "network"
+
+    builder = NetworkBuilder(build).start()
+
+    assert not builder.ready.is_set()  # The caller goes on while the build waits.
+    release.set()
+
+    assert builder.result() == "network"
+    assert threads[0] is not threading.current_thread()
+    assert list(builder.timings) == ["graph"]
+
+
+def test_result_builds_in_the_calling_thread_when_not_started():
+    threads = []
+
+    builder = NetworkBuilder(lambda builder: threads.append(threading.current_thread()) or len(threads))
+
+    assert builder.result() == 1
+    assert builder.result() == 1  # Built only once.
+    assert threads == [threading.current_thread()]
+
+
+def test_errors_of_the_build_are_raised_by_result():
+    def build(builder):
+        with builder.phase("routing tables"):
+            raise OSError("topology not found")
+
+    builder = NetworkBuilder(build).start()
+
+    with pytest.raises(OSError, match="topology not found"):
+        builder.result()
+    assert builder.ready.is_set() and "routing tables" in builder.timings
@@ -0,0 +1,32 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.functions.prefixRouting import construct_prefix_tables
+import math
+import pytest
+
+
+def network(kind, mode="tree"):
+    graph, vertex_map = build_graph(generate_topology(kind, 120, seed=6), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, mode)
+    return graph, vertex_map
+
+
+@pytest.mark.parametrize("kind", ["tree", "isp", "geometric"])
+def test_prefix_tables_give_the_next_hops_of_the_routing_tables(kind):
+    graph, vertex_map = network(kind)
+
+    entries = construct_prefix_tables(graph, vertex_map)
+
+    for identifier in graph.vertices:
+        vertex = vertex_map[identifier]
+        for destiny in graph.vertices:
+            if destiny == identifier:
+                expected = destiny
+            elif math.isinf(vertex.path_cost(destiny)):
+                expected = None
+            else:
+                expected = vertex.next_hop(destiny)
+            assert vertex.route(destiny) == expected
+
+    if kind != "geometric":
+        assert entries < len(graph.vertices) ** 2 / 10
@@ -0,0 +1,137 @@
+from utils.functions.diskRouteCache import construct_routings_tables_cached
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.graph import Graph
+from utils.structures.mappedNetwork import save_network
+import itertools
+import pytest
+
+MODES = ("tree", "pairwise", "floyd-warshall", "lazy", "compact", "parallel", "ecmp")
+
+
+def network():
+    graph, vertex_map = build_graph(generate_topology("isp", 40, seed=3), "fiber", backend="dict")
+    graph.routing_workers = 2
+    return graph, vertex_map
+
+
+def tables(graph, vertex_map):
+    """
+    Reads every routing and multipath table as plain dicts.
+    """
+
+    return {
+        identifier: (
+            {destiny: list(vertex_map[identifier].routing_table[destiny]) for destiny in graph.vertices},
+            dict(vertex_map[identifier].multipath_table),
+        )
+        for identifier in graph.vertices
+    }
+
+
+@pytest.fixture(scope="module")
+def reference():
+    expected = {}
+    for mode in MODES:
+        graph, vertex_map = network()
+        graph.construct_routings_tables(vertex_map, mode)
+        expected[mode] = tables(graph, vertex_map)
+    return expected
+
+
+@pytest.mark.parametrize("first, second", list(itertools.permutations(MODES, 2)))
+def test_switching_modes_rebuilds_the_tables(reference, first, second):
+    graph, vertex_map = network()
+
+    graph.construct_routings_tables(vertex_map, first)
+    graph.construct_routings_tables(vertex_map, second)
+
+    assert tables(graph, vertex_map) == reference[second]
+
+
+@pytest.mark.parametrize("second", [mode for mode in MODES if mode != "lazy"])
+def test_leaving_lazy_mode_releases_the_route_cache(reference, second):
+    graph, vertex_map = network()
+
+    graph.construct_routings_tables(vertex_map, "lazy")
+    vertex_map[graph.vertices[0]].routing_table[graph.vertices[-1]]
+    graph.construct_routings_tables(vertex_map, second)
+
+    assert graph._route_cache is None
+    assert tables(graph, vertex_map) == reference[second]
+
+
+@pytest.mark.parametrize("previous", ["tree", "lazy", "ecmp"])
+@pytest.mark.parametrize("second", ["tree", "pairwise", "ecmp"])
+def test_switching_modes_after_the_disk_cache(reference, tmp_path, previous, second):
+    graph, vertex_map = network()
+    construct_routings_tables_cached(graph, vertex_map, "key", cache_dir=str(tmp_path))
+
+    graph, vertex_map = network()
+    graph.construct_routings_tables(vertex_map, previous)
+    assert construct_routings_tables_cached(graph, vertex_map, "key", cache_dir=str(tmp_path))
+    assert graph._route_cache is None
+    assert tables(graph, vertex_map) == reference["compact"]
+
+    graph.construct_routings_tables(vertex_map, second)
+    assert tables(graph, vertex_map) == reference[second]
+
+
+@pytest.mark.parametrize("second", ["tree", "pairwise", "ecmp"])
+def test_switching_modes_after_saving_the_network(reference, tmp_path, second):
+    graph, vertex_map = network()
+    graph.construct_routings_tables(vertex_map, "compact")
+    save_network(str(tmp_path / "network.bin"), graph, vertex_map)
+
+    graph.construct_routings_tables(vertex_map, second)
+    assert tables(graph, vertex_map) == reference[second]
+
+
+def test_disk_cache_of_an_empty_graph(tmp_path):
+    graph, vertex_map = Graph(), {}
+
+    assert not construct_routings_tables_cached(graph, vertex_map, "empty", cache_dir=str(tmp_path))
+    assert construct_routings_tables_cached(graph, vertex_map, "empty", cache_dir=str(tmp_path))
+
+
+def test_parallel_mode_breaks_ties_like_compact_mode():
+    graph, vertex_map = build_graph(generate_topology("fat-tree", 60, seed=1), "fiber", backend="dict")
+    graph.routing_workers = 2
+
+    graph.construct_routings_tables(vertex_map, "compact")
+    compact = tables(graph, vertex_map)
+    graph.construct_routings_tables(vertex_map, "parallel")
+
+    assert tables(graph, vertex_map) == compact
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_set_medium_matches_a_full_rebuild(mode):
+    graph, vertex_map = network()
+    graph.construct_routings_tables(vertex_map, mode)
+    graph.set_medium("coaxial")
+
+    expected_graph, expected_map = network()
+    expected_graph.set_medium("coaxial")
+    expected_graph.construct_routings_tables(expected_map, mode)
+
+    assert graph.routed_mode == mode
+    assert tables(graph, vertex_map) == tables(expected_graph, expected_map)
+
+
+def test_tree_mode_miss_of_the_disk_cache_can_be_reweighted(tmp_path):
+    graph, vertex_map = network()
+    assert not construct_routings_tables_cached(graph, vertex_map, "key", str(tmp_path), mode="tree")
+    assert graph.routed_mode == "tree"
+    graph.set_medium("coaxial")
+
+    cached_graph, cached_map = network()
+    cached_graph.set_medium("coaxial", reroute=False)
+    assert not construct_routings_tables_cached(cached_graph, cached_map, "coaxial", str(tmp_path))
+
+    expected_graph, expected_map = network()
+    expected_graph.set_medium("coaxial")
+    expected_graph.construct_routings_tables(expected_map, "tree")
+
+    assert tables(graph, vertex_map) == tables(expected_graph, expected_map)
+    assert tables(cached_graph, cached_map) == tables(expected_graph, expected_map)
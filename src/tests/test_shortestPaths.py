@@ -0,0 +1,90 @@
+from utils.functions.adaptedDijkstra import astar, bidirectional_dijkstra, dijkstra, shortest_path_tree, shortest_path_tree_csr, paths_from_tree
+from utils.functions.generateTopology import generate_topology, random_geometric_positions
+from utils.functions.loadTopology import build_graph
+import itertools
+import math
+import pytest
+
+
+def network(kind="isp", seed=2):
+    return build_graph(generate_topology(kind, 60, seed=seed), "fiber", backend="dict")
+
+
+@pytest.mark.parametrize("kind", ["isp", "geometric", "fat-tree"])
+def test_tree_paths_are_the_paths_of_dijkstra(kind):
+    graph, vertex_map = network(kind)
+
+    for source in graph.vertices[::7]:
+        start = vertex_map[source]
+        paths = paths_from_tree(start, *shortest_path_tree(graph, start))
+
+        for destiny in graph.vertices:
+            end = vertex_map[destiny]
+            assert paths.get(end, []) == dijkstra(graph, start, end)
+
+
+def test_tree_mode_matches_pairwise_mode():
+    graph, vertex_map = network()
+    graph.construct_routings_tables(vertex_map, "pairwise")
+    expected = {identifier: dict(vertex_map[identifier].routing_table) for identifier in graph.vertices}
+
+    graph.construct_routings_tables(vertex_map, "tree")
+
+    assert {identifier: dict(vertex_map[identifier].routing_table) for identifier in graph.vertices} == expected
+
+
+@pytest.mark.parametrize("medium", ["fiber", "coaxial"])
+def test_compiled_weights_are_the_link_delays(medium):
+    graph, vertex_map = network()
+    graph.compile_weights(480)
+    graph.set_medium(medium)
+
+    adjacency, edge_index = graph.compile_weights(480)
+
+    for vertex, links in graph.links.items():
+        expected = [(adj, link.calculate_delay(480)) for adj, link in links]
+        assert adjacency[vertex] == expected
+        assert all(edge_index[(vertex, adj)] == weight for adj, weight in expected)
+
+
+@pytest.mark.parametrize("kind", ["isp", "fat-tree"])
+def test_csr_search_builds_the_tree_of_the_dict_search(kind):
+    graph, vertex_map = network(kind)
+    adjacency, _ = graph.compile_weights(480)
+    vertices = [vertex_map[identifier] for identifier in graph.vertices]
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+
+    offsets, neighbors, weights = [0], [], []
+    for vertex in vertices:
+        for adj, weight in adjacency[vertex]:
+            neighbors.append(index[adj])
+            weights.append(weight)
+        offsets.append(len(neighbors))
+
+    for source, start in enumerate(vertices):
+        dist, prev, order = shortest_path_tree(graph, start)
+        csr_dist, csr_prev, csr_order = shortest_path_tree_csr(offsets, neighbors, weights, source)
+
+        assert csr_order == [index[vertex] for vertex in order]
+        assert {vertices[i]: cost for i, cost in enumerate(csr_dist) if cost != math.inf} == dist
+        assert {vertices[i]: vertices[parent] for i, parent in enumerate(csr_prev) if parent != -1} == prev
+
+
+@pytest.mark.parametrize("kind", ["isp", "geometric", "fat-tree"])
+@pytest.mark.parametrize("medium", ["fiber", "coaxial"])
+def test_single_pair_searches_find_the_cost_of_dijkstra(kind, medium):
+    graph, vertex_map = network(kind)
+    graph.set_medium(medium)
+    positions = random_geometric_positions(60, seed=2) if kind == "geometric" else {}
+
+    for source, destiny in itertools.product(graph.vertices[::5], graph.vertices[::3]):
+        start, end = vertex_map[source], vertex_map[destiny]
+        expected = dijkstra(graph, start, end)
+
+        for path in (bidirectional_dijkstra(graph, start, end), astar(graph, start, end, positions)):
+            assert bool(path) == bool(expected)
+            if path:
+                assert (path[0][0], path[-1][0]) == (source, destiny)
+                assert path[-1][1] == pytest.approx(expected[-1][1])
+                hops = zip(path, path[1:])
+                assert sum(graph.compile_weights(480)[1][(vertex_map[u], vertex_map[v])] for (u, _), (v, _) in hops) == pytest.approx(expected[-1][1])
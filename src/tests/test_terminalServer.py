@@ -0,0 +1,54 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.structures.clock import VirtualClock
+from utils.structures.commandDispatcher import CommandDispatcher
+from utils.structures.terminalServer import TerminalServer
+import asyncio
+
+
+def server():
+    graph, vertex_map = build_graph(generate_topology("tree", 20, seed=0), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, "tree")
+    return TerminalServer(CommandDispatcher(graph, vertex_map), graph.vertices[0], clock=VirtualClock()), graph.vertices
+
+
+async def session(terminal_server, commands):
+    """
+    Serves one session that sends 'commands', and returns what it received.
+    """
+
+    ready = asyncio.get_running_loop().create_future()
+    serving = asyncio.create_task(terminal_server.serve(port=0, ready=ready))
+    host, port = await ready
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write("".join(f"{command}\n" for command in commands).encode())
+    writer.write(b"exit\n")
+    received = (await reader.read()).decode()
+
+    writer.close()
+    serving.cancel()
+    return received
+
+
+def test_sessions_answer_every_command():
+    terminal_server, vertices = server()
+
+    received = asyncio.run(session(terminal_server, [f"ping {vertices[-1]}", f"changeto {vertices[1]}"]))
+
+    assert received.count(f"60 bytes from {vertices[-1]}") == 4
+    assert received.endswith(f"root@{vertices[1]}:~$ ")
+    assert terminal_server.commands == 2 and terminal_server.sessions == 0
+
+
+def test_a_failing_command_does_not_close_the_session():
+    terminal_server, vertices = server()
+
+    def broken(terminal, arguments):
+        raise RuntimeError("the routing tables are gone")
+
+    terminal_server.dispatcher._handlers["traceroute"] = broken
+    received = asyncio.run(session(terminal_server, [f"traceroute {vertices[-1]}", f"ping {vertices[-1]}"]))
+
+    assert "the routing tables are gone\n" in received
+    assert received.count(f"60 bytes from {vertices[-1]}") == 4
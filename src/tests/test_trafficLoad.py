@@ -0,0 +1,89 @@
+from utils.functions.generateTopology import generate_topology
+from utils.functions.loadTopology import build_graph
+from utils.functions.trafficLoad import simulate_load
+from collections import defaultdict
+import pytest
+import random
+
+
+def network(mode):
+    graph, vertex_map = build_graph(generate_topology("isp", 80, seed=4), "fiber", backend="dict")
+    graph.construct_routings_tables(vertex_map, mode)
+    return graph, vertex_map
+
+
+def traffic(graph, demands=300, seed=0):
+    rng = random.Random(seed)
+    return [(*rng.sample(graph.vertices, 2), rng.uniform(1e8, 1e10)) for _ in range(demands)]
+
+
+def brute_force_loads(vertex_map, traffic):
+    """
+    Forwards every demand on its own, splitting it evenly over the
+    equal-cost next hops at each vertex.
+    """
+
+    loads = defaultdict(float)
+
+    def forward(vertex, destiny, bps):
+        if vertex == destiny:
+            return
+        hops = vertex_map[vertex].next_hops(destiny)
+        for hop in hops:
+            loads[(vertex, hop)] += bps / len(hops)
+            forward(hop, destiny, bps / len(hops))
+
+    for source, destiny, bps in traffic:
+        forward(source, destiny, bps)
+
+    return loads
+
+
+@pytest.mark.parametrize("mode", ["tree", "ecmp"])
+def test_link_loads_match_a_brute_force_count(mode):
+    graph, vertex_map = network(mode)
+    demands = traffic(graph)
+
+    report = simulate_load(demands, graph, vertex_map, max_min=False)
+
+    expected = brute_force_loads(vertex_map, demands)
+    assert {(link["source"], link["target"]): link["load"] for link in report["links"]} == pytest.approx(dict(expected))
+    assert report["unroutable"] == []
+
+
+@pytest.mark.parametrize("mode", ["tree", "ecmp"])
+def test_throughput_is_max_min_fair(mode):
+    graph, vertex_map = network(mode)
+    demands = defaultdict(float)
+    for source, destiny, bps in traffic(graph):
+        demands[(source, destiny)] += bps
+
+    report = simulate_load([(*pair, bps) for pair, bps in demands.items()], graph, vertex_map)
+
+    capacities = {(link["source"], link["target"]): link["capacity"] for link in report["links"]}
+    flows = defaultdict(list)
+    for (source, destiny), rate in report["throughput"].items():
+        assert 0 <= rate <= demands[(source, destiny)] * (1 + 1e-9)
+        vertex = source
+        while vertex != destiny:
+            hop = vertex_map[vertex].next_hop(destiny, (source, destiny))
+            flows[(vertex, hop)].append(rate)
+            vertex = hop
+
+    used = {edge: sum(rates) for edge, rates in flows.items()}
+    assert all(used[edge] <= capacity * (1 + 1e-9) for edge, capacity in capacities.items() if capacity is not None and edge in used)
+    assert report["saturated"]
+
+    # Every pair that gets less than its demand crosses a full link where no
+    # other pair gets more.
+    for (source, destiny), rate in report["throughput"].items():
+        if rate >= demands[(source, destiny)] * (1 - 1e-9):
+            continue
+        vertex, bottleneck = source, False
+        while vertex != destiny:
+            hop = vertex_map[vertex].next_hop(destiny, (source, destiny))
+            capacity = capacities[(vertex, hop)]
+            if capacity is not None and used[(vertex, hop)] >= capacity * (1 - 1e-9) and rate >= max(flows[(vertex, hop)]) * (1 - 1e-9):
+                bottleneck = True
+            vertex = hop
+        assert bottleneck
@@ -1,7 +1,12 @@
+from utils.structures.link import MEDIUM_SPEEDS
+from utils.structures.instrumentation import INSTRUMENTATION
 import heapq
 import math
 
-def dijkstra(graph, start, end):
+PACKET_SIZE_BITS = 60 * 8  # 60 bytes
+ECMP_TOLERANCE = 1e-9  # Relative difference under which two path costs are equal
+
+def dijkstra(graph, start, end, stats=None):
     """
     Finds the shortest-time path in 'graph' between 'start' and 'end'.
     Avoids comparing Vertex objects by including a tie-breaker in the heap.
@@ -9,12 +14,19 @@ def dijkstra(graph, start, end):
     Parameters:
     -----------
     graph: 
-        An object that has 'graph.links' where 'links' is a dict of the form:
-            { Vertex: [(Vertex, Link), (Vertex, Link), ...], ... }
+        An object that has 'graph.compile_weights(packet_size_bits)', returning
+        the compiled weight table of the graph (see 'Graph.compile_weights'):
+            adjacency:  { Vertex: [(Vertex, weight), (Vertex, weight), ...], ... }
+            edge_index: { (Vertex, Vertex): weight, ... }
     start: Vertex
         The starting vertex.
     end: Vertex
         The target vertex.
+    stats: dict
+        If provided, receives the counters of the search (see
+        `_record_search`): the number of vertices settled in
+        `stats["expanded"]`, `heap_pushes`, `heap_pops`, `edges_scanned` and
+        `edges_relaxed`.
 
     Returns:
     --------
@@ -25,22 +37,19 @@ def dijkstra(graph, start, end):
 
     Obs:
     ----
-    - We assume 'Link.calculate_delay(packet_size_bits)' returns the time
-      (in seconds) to traverse that link with a given packet size.
-    - We set a fixed packet size of 60 bytes = 480 bits here, but you can
-      change it if you like.
+    - The weights are 'Link.calculate_delay(packet_size_bits)', the time
+      (in seconds) to traverse that link with a given packet size. They are
+      computed once per packet size and medium by the graph, not per edge
+      relaxation.
+    - We use a fixed packet size of 60 bytes = 480 bits (PACKET_SIZE_BITS),
+      but you can change it if you like.
     """
 
-    PACKET_SIZE_BITS = 60 * 8  # 60 bytes
+    adjacency, edge_index = graph.compile_weights(PACKET_SIZE_BITS)
 
-    dist = {}
+    dist = {start: 0.0}
     prev = {}
 
-    for vertex in graph.links.keys():
-        dist[vertex] = math.inf
-
-    dist[start] = 0.0
-
     pq = []
     count = 0 
     heapq.heappush(pq, (0.0, count, start))
@@ -57,17 +66,20 @@ def dijkstra(graph, start, end):
         if u == end:
             break
 
-        for (neighbor, link) in graph.links[u]:
-            edge_time = link.calculate_delay(PACKET_SIZE_BITS)
+        for (neighbor, edge_time) in adjacency[u]:
             new_cost = current_cost + edge_time
 
-            if new_cost < dist[neighbor]:
+            if new_cost < dist.get(neighbor, math.inf):
                 dist[neighbor] = new_cost
                 prev[neighbor] = u
                 count += 1
                 heapq.heappush(pq, (new_cost, count, neighbor))
 
-    if math.isinf(dist[end]):
+    if stats is not None or INSTRUMENTATION.enabled:
+        scanned = sum(len(adjacency[u]) for u in visited) - (len(adjacency[end]) if end in visited else 0)
+        _record_search(stats, len(visited), count + 1, count + 1 - len(pq), scanned, count)
+
+    if end not in dist:
         return []
 
     path_vertices = []
@@ -78,6 +90,179 @@ def dijkstra(graph, start, end):
     path_vertices.append(start)
     path_vertices.reverse()
 
+    return _path_info(path_vertices, edge_index)
+
+
+def bidirectional_dijkstra(graph, start, end, stats=None):
+    """
+    Finds the shortest-time path between 'start' and 'end' growing one
+    search from each end at the same time, which settles far fewer vertices
+    than 'dijkstra' on large sparse graphs (two balls of half the radius).
+
+    Links are symmetric, so the search from 'end' uses the same weights. The
+    search stops when the smallest keys of both frontiers add up to at
+    least the cost of the best path seen crossing from one side to the
+    other. Among paths of equal cost it may return a different one than
+    'dijkstra'.
+
+    Parameters:
+    -----------
+    graph, start, end, stats:
+        The same as 'dijkstra'.
+
+    Returns:
+    --------
+    path_info: list of (Vertex, float)
+        The same format as 'dijkstra' (empty if no path is found).
+    """
+
+    adjacency, edge_index = graph.compile_weights(PACKET_SIZE_BITS)
+
+    dist = ({start: 0.0}, {end: 0.0})
+    prev = ({}, {})
+    pq = ([(0.0, 0, start)], [(0.0, 0, end)])
+    visited = (set(), set())
+    count = 0
+
+    best = 0.0 if start == end else math.inf
+    meeting = start if start == end else None
+
+    while pq[0] and pq[1] and pq[0][0][0] + pq[1][0][0] < best:
+        side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        other_dist = dist[1 - side]
+
+        current_cost, _, u = heapq.heappop(pq[side])
+
+        if u in visited[side]:
+            continue
+        visited[side].add(u)
+
+        for (neighbor, edge_time) in adjacency[u]:
+            new_cost = current_cost + edge_time
+
+            if new_cost < dist[side].get(neighbor, math.inf):
+                dist[side][neighbor] = new_cost
+                prev[side][neighbor] = u
+                count += 1
+                heapq.heappush(pq[side], (new_cost, count, neighbor))
+
+            if neighbor in other_dist and new_cost + other_dist[neighbor] < best:
+                best = new_cost + other_dist[neighbor]
+                meeting = neighbor
+
+    if stats is not None or INSTRUMENTATION.enabled:
+        scanned = sum(len(adjacency[u]) for side in visited for u in side)
+        _record_search(stats, len(visited[0]) + len(visited[1]), count + 2, count + 2 - len(pq[0]) - len(pq[1]), scanned, count)
+
+    if meeting is None:
+        return []
+
+    path_vertices = []
+    cur = meeting
+    while cur in prev[0]:
+        path_vertices.append(cur)
+        cur = prev[0][cur]
+    path_vertices.append(start)
+    path_vertices.reverse()
+
+    cur = meeting
+    while cur in prev[1]:
+        cur = prev[1][cur]
+        path_vertices.append(cur)
+
+    return _path_info(path_vertices, edge_index)
+
+
+def astar(graph, start, end, positions, stats=None):
+    """
+    Finds the shortest-time path between 'start' and 'end' with A*, guided by
+    a lower bound of the time left to reach 'end': the straight-line
+    distance between the vertices divided by the propagation speed of the
+    medium (transmission delays are left out of the bound).
+
+    The bound never overestimates as long as every link is at least as long
+    as the straight line between its ends (as in the topologies of
+    'generate_random_geometric'). Vertices without a position get a bound
+    of 0; vertices are re-opened when a cheaper path to them is found, so
+    the result stays optimal even when the bound is not consistent.
+
+    Parameters:
+    -----------
+    graph, start, end, stats:
+        The same as 'dijkstra'. 'graph.medium' gives the propagation speed
+        (the fastest medium when it is not set).
+    positions: dict
+        { identifier: (x, y) } in meters, for some or all the vertices.
+
+    Returns:
+    --------
+    path_info: list of (Vertex, float)
+        The same format as 'dijkstra' (empty if no path is found).
+    """
+
+    adjacency, edge_index = graph.compile_weights(PACKET_SIZE_BITS)
+    speed = MEDIUM_SPEEDS.get(graph.medium, max(MEDIUM_SPEEDS.values()))
+    target = positions.get(end.identifier)
+
+    bounds = {}
+    def bound(vertex):
+        value = bounds.get(vertex)
+        if value is None:
+            position = positions.get(vertex.identifier)
+            value = bounds[vertex] = math.dist(position, target) / speed if position is not None and target is not None else 0.0
+        return value
+
+    dist = {start: 0.0}
+    prev = {}
+
+    pq = []
+    count = 0
+    heapq.heappush(pq, (bound(start), count, 0.0, start))
+
+    expanded = 0
+
+    while pq:
+        _, _, current_cost, u = heapq.heappop(pq)
+
+        if current_cost > dist[u]:
+            continue  # Stale entry: 'u' was reached again more cheaply.
+        expanded += 1
+
+        if u == end:
+            break
+
+        for (neighbor, edge_time) in adjacency[u]:
+            new_cost = current_cost + edge_time
+
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                prev[neighbor] = u
+                count += 1
+                heapq.heappush(pq, (new_cost + bound(neighbor), count, new_cost, neighbor))
+
+    if stats is not None or INSTRUMENTATION.enabled:
+        _record_search(stats, expanded, count + 1, count + 1 - len(pq), relaxed=count)
+
+    if end not in dist:
+        return []
+
+    path_vertices = []
+    cur = end
+    while cur in prev:
+        path_vertices.append(cur)
+        cur = prev[cur]
+    path_vertices.append(start)
+    path_vertices.reverse()
+
+    return _path_info(path_vertices, edge_index)
+
+
+def _path_info(path_vertices, edge_index):
+    """
+    Returns the (identifier, accumulated_cost) list of a path given as a
+    list of vertices.
+    """
+
     path_info = []
     accumulated = 0.0
     path_info.append((path_vertices[0].identifier, accumulated))
@@ -85,21 +270,505 @@ def dijkstra(graph, start, end):
     for i in range(len(path_vertices) - 1):
         u = path_vertices[i]
         v = path_vertices[i + 1]
-        link_uv = _find_link(graph, u, v)
-        if not link_uv:
-            return []
-        delta = link_uv.calculate_delay(PACKET_SIZE_BITS)
-        accumulated += delta
+        accumulated += edge_index[(u, v)]
         path_info.append((v.identifier, accumulated))
 
     return path_info
 
 
-def _find_link(graph, u, v):
+def shortest_path_tree(graph, start):
     """
-    Helper function that returns the Link object connecting u->v (if any).
+    Runs a single Dijkstra search from 'start' over the whole 'graph' and
+    keeps the full predecessor tree, so every route from 'start' can be
+    read from one search instead of one search per destination.
+
+    The exploration order (heap tie-breaker included) is the same used by
+    'dijkstra', so the paths read from the tree are identical to the ones
+    returned by 'dijkstra(graph, start, end)'.
+
+    Parameters:
+    -----------
+    graph:
+        An object that has 'graph.compile_weights' (see 'dijkstra').
+    start: Vertex
+        The root of the shortest-path tree.
+
+    Returns:
+    --------
+    dist: dict
+        { Vertex: accumulated_cost } for every vertex reachable from 'start'.
+    prev: dict
+        { Vertex: predecessor Vertex } for every reachable vertex except 'start'.
+    order: list of Vertex
+        The vertices in the order they were settled (parents before children).
+    """
+
+    adjacency, _ = graph.compile_weights(PACKET_SIZE_BITS)
+
+    dist = {start: 0.0}
+    prev = {}
+    order = []
+
+    pq = []
+    count = 0
+    heapq.heappush(pq, (0.0, count, start))
+
+    visited = set()
+
+    while pq:
+        current_cost, _, u = heapq.heappop(pq)
+
+        if u in visited:
+            continue
+        visited.add(u)
+        order.append(u)
+
+        for (neighbor, edge_time) in adjacency[u]:
+            new_cost = current_cost + edge_time
+
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                prev[neighbor] = u
+                count += 1
+                heapq.heappush(pq, (new_cost, count, neighbor))
+
+    if INSTRUMENTATION.enabled:
+        _record_search(None, len(order), count + 1, count + 1, sum(len(adjacency[u]) for u in order), count)
+
+    return dist, prev, order
+
+
+def shortest_path_dag(graph, start):
+    """
+    Runs the same search as 'shortest_path_tree', but also keeps every
+    predecessor that reaches a vertex with the same (lowest) cost, so the
+    result describes all the equal-cost shortest paths from 'start'.
+
+    Costs are compared with a relative tolerance of 'ECMP_TOLERANCE', since
+    the same path lengths added in different orders can differ in the last
+    bits. Ties are broken by the number of hops: only the equal-cost paths
+    with the fewest hops are kept. Without it, links with no cost (inside
+    the same router) would make every vertex of a router an equal-cost
+    predecessor of the others, and the next hops of the vertices could send
+    a flow around in circles.
+
+    Parameters:
+    -----------
+    graph:
+        An object that has 'graph.compile_weights' (see 'dijkstra').
+    start: Vertex
+        The root of the search.
+
+    Returns:
+    --------
+    dist, prev, order:
+        The same as 'shortest_path_tree' ('prev' is the predecessor it picks).
+    preds: dict
+        { Vertex: [predecessor Vertex, ...] } with every equal-cost
+        predecessor (with the fewest hops) of each reachable vertex except
+        'start'.
+    """
+
+    adjacency, _ = graph.compile_weights(PACKET_SIZE_BITS)
+
+    dist = {start: 0.0}
+    hops = {start: 0}
+    prev = {}
+    preds = {}
+    order = []
+
+    pq = []
+    count = 0
+    heapq.heappush(pq, (0.0, 0, count, start))
+
+    visited = set()
+
+    while pq:
+        current_cost, current_hops, _, u = heapq.heappop(pq)
+
+        if u in visited:
+            continue
+        visited.add(u)
+        order.append(u)
+
+        for (neighbor, edge_time) in adjacency[u]:
+            if neighbor in visited:
+                continue
+
+            new_cost = current_cost + edge_time
+            new_hops = current_hops + 1
+            old_cost = dist.get(neighbor, math.inf)
+            tolerance = ECMP_TOLERANCE * max(new_cost, 1e-300)
+
+            if new_cost < old_cost - tolerance or (new_cost <= old_cost + tolerance and new_hops < hops[neighbor]):
+                preds[neighbor] = [u]
+            elif new_cost <= old_cost + tolerance and new_hops == hops[neighbor]:
+                preds[neighbor].append(u)
+                if new_cost >= old_cost:
+                    continue
+            else:
+                continue
+
+            dist[neighbor] = new_cost
+            hops[neighbor] = new_hops
+            prev[neighbor] = u
+            count += 1
+            heapq.heappush(pq, (new_cost, new_hops, count, neighbor))
+
+    if INSTRUMENTATION.enabled:
+        _record_search(None, len(order), count + 1, count + 1, sum(len(adjacency[u]) for u in order), count)
+
+    return dist, prev, preds, order
+
+
+def multipath_next_hops(start, preds, order):
     """
-    for (adj_vertex, link) in graph.links[u]:
-        if adj_vertex == v:
-            return link
-    return None
\ No newline at end of file
+    Returns the equal-cost next hops from 'start' to every vertex, read from
+    the predecessors of 'shortest_path_dag'.
+
+    Returns:
+    --------
+    next_hops: dict
+        { Vertex: [next hop Vertex, ...] } for every reachable vertex except
+        'start', sorted by identifier.
+    """
+
+    next_hops = {}
+
+    for vertex in order:
+        if vertex == start:
+            continue
+
+        hops = set()
+        for u in preds[vertex]:
+            if u == start:
+                hops.add(vertex)
+            else:
+                hops.update(next_hops[u])
+
+        next_hops[vertex] = sorted(hops, key=lambda hop: hop.identifier)
+
+    return next_hops
+
+
+def path_from_tree(start, end, dist, prev):
+    """
+    Rebuilds the route from 'start' to 'end' out of a shortest-path tree
+    produced by 'shortest_path_tree'.
+
+    Returns:
+    --------
+    path_info: list of (str, float)
+        Same format returned by 'dijkstra': a list of tuples
+        (identifier, accumulated_cost). Empty if 'end' is unreachable.
+    """
+
+    if end not in dist:
+        return []
+
+    path_vertices = []
+    cur = end
+    while cur in prev:
+        path_vertices.append(cur)
+        cur = prev[cur]
+    path_vertices.append(start)
+    path_vertices.reverse()
+
+    return [(vertex.identifier, dist[vertex]) for vertex in path_vertices]
+
+
+def paths_from_tree(start, dist, prev, order=None):
+    """
+    Rebuilds the routes from 'start' to every reachable vertex out of a
+    shortest-path tree. Each route extends the route of its parent, so the
+    tree is walked once instead of once per destination.
+
+    Parameters:
+    -----------
+    order: list of Vertex
+        The vertices with parents before children (e.g. the settle order of
+        'shortest_path_tree'). Computed from 'prev' when not provided.
+
+    Returns:
+    --------
+    paths: dict
+        { Vertex: path_info } in the format returned by 'dijkstra'.
+    """
+
+    if order is None:
+        order = tree_order(start, prev)
+
+    paths = {start: [(start.identifier, 0.0)]}
+    for vertex in order:
+        if vertex is not start:
+            paths[vertex] = paths[prev[vertex]] + [(vertex.identifier, dist[vertex])]
+
+    return paths
+
+
+def tree_order(start, prev):
+    """
+    Returns the vertices of a shortest-path tree with parents before children.
+    """
+
+    children = {}
+    for vertex, parent in prev.items():
+        children.setdefault(parent, []).append(vertex)
+
+    order = []
+    stack = [start]
+    while stack:
+        parent = stack.pop()
+        order.append(parent)
+        stack.extend(children.get(parent, ()))
+
+    return order
+
+
+def repair_tree_after_increase(graph, start, dist, prev, child):
+    """
+    Repairs in place a shortest-path tree rooted at 'start' after the tree
+    edge arriving at 'child' got more expensive (or was removed).
+
+    Only the subtree hanging from 'child' can change: its vertices are
+    detached and reconnected with a Dijkstra seeded from the rest of the
+    tree and restricted to the subtree.
+
+    Returns:
+    --------
+    changed: set of Vertex
+        The vertices whose route from 'start' may have changed.
+    """
+
+    adjacency, _ = graph.compile_weights(PACKET_SIZE_BITS)
+
+    subtree = {start: False, child: True}
+
+    def in_subtree(vertex):
+        chain = []
+        while vertex not in subtree:
+            chain.append(vertex)
+            vertex = prev[vertex]
+        inside = subtree[vertex]
+        for v in chain:
+            subtree[v] = inside
+        return inside
+
+    changed = {vertex for vertex in dist if in_subtree(vertex)}
+
+    for vertex in changed:
+        del dist[vertex]
+        prev.pop(vertex, None)
+
+    pq = []
+    count = 0
+
+    for vertex in changed:
+        for (neighbor, edge_time) in adjacency[vertex]:
+            if neighbor in dist and dist[neighbor] + edge_time < dist.get(vertex, math.inf):
+                dist[vertex] = dist[neighbor] + edge_time
+                prev[vertex] = neighbor
+
+        if vertex in dist:
+            count += 1
+            heapq.heappush(pq, (dist[vertex], count, vertex))
+
+    _propagate(adjacency, dist, prev, pq, count, restrict_to=changed)
+
+    return changed
+
+
+def repair_tree_after_decrease(graph, start, dist, prev, vertex1, vertex2, weight):
+    """
+    Repairs in place a shortest-path tree rooted at 'start' after the edge
+    between 'vertex1' and 'vertex2' got cheaper (or was added) with the new
+    'weight'. Only the vertices whose cost improves are visited.
+
+    Returns:
+    --------
+    changed: set of Vertex
+        The vertices whose route from 'start' changed.
+    """
+
+    adjacency, _ = graph.compile_weights(PACKET_SIZE_BITS)
+
+    pq = []
+    count = 0
+
+    for u, v in ((vertex1, vertex2), (vertex2, vertex1)):
+        if u in dist and dist[u] + weight < dist.get(v, math.inf):
+            dist[v] = dist[u] + weight
+            prev[v] = u
+            count += 1
+            heapq.heappush(pq, (dist[v], count, v))
+
+    return _propagate(adjacency, dist, prev, pq, count)
+
+
+def reweight_tree(graph, start, dist, prev, order=None):
+    """
+    Recomputes in place the costs of a shortest-path tree rooted at 'start'
+    with the current weights of 'graph', keeping the same tree edges.
+
+    The tree is still a shortest-path tree when no edge of the graph offers a
+    cheaper way to any vertex, which is checked over every edge without
+    running a new search.
+
+    Parameters:
+    -----------
+    order: list of Vertex
+        The vertices with parents before children (see 'tree_order').
+        Computed from 'prev' when not provided.
+
+    Returns:
+    --------
+    still_shortest: bool
+        True if the reweighted tree is still a shortest-path tree. When
+        False, 'dist' holds the costs along the old tree and the tree must be
+        recomputed.
+    """
+
+    adjacency, edge_index = graph.compile_weights(PACKET_SIZE_BITS)
+
+    if order is None:
+        order = tree_order(start, prev)
+
+    for vertex in order:
+        if vertex is start:
+            dist[vertex] = 0.0
+        else:
+            dist[vertex] = dist[prev[vertex]] + edge_index[(prev[vertex], vertex)]
+
+    for u, cost in dist.items():
+        for (neighbor, edge_time) in adjacency[u]:
+            if cost + edge_time < dist[neighbor]:
+                return False
+
+    return True
+
+
+def _propagate(adjacency, dist, prev, pq, count, restrict_to=None):
+    """
+    Runs the Dijkstra loop over an already seeded heap, relaxing only strict
+    improvements (and, if given, only vertices in 'restrict_to').
+
+    Returns:
+    --------
+    settled: set of Vertex
+        The vertices popped from the heap.
+    """
+
+    settled = set()
+
+    while pq:
+        current_cost, _, u = heapq.heappop(pq)
+
+        if u in settled or current_cost > dist[u]:
+            continue
+        settled.add(u)
+
+        for (neighbor, edge_time) in adjacency[u]:
+            if restrict_to is not None and neighbor not in restrict_to:
+                continue
+
+            new_cost = current_cost + edge_time
+
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                prev[neighbor] = u
+                count += 1
+                heapq.heappush(pq, (new_cost, count, neighbor))
+
+    return settled
+
+
+def shortest_path_tree_csr(offsets, neighbors, weights, source):
+    """
+    Integer version of 'shortest_path_tree' for graphs stored in compressed
+    sparse row (CSR) form, where vertices are identified by their index.
+
+    Ties are broken the same way (by the order of the relaxations), so over
+    the same adjacency order both searches build the same tree.
+
+    Parameters:
+    -----------
+    offsets: sequence of int
+        The edges of vertex 'u' are the positions offsets[u]:offsets[u + 1]
+        of 'neighbors' and 'weights'.
+    neighbors: sequence of int
+        The vertex at the other end of each edge.
+    weights: sequence of float
+        The cost of each edge.
+    source: int
+        The index of the root of the shortest-path tree.
+
+    Returns:
+    --------
+    dist: list of float
+        The accumulated cost to each vertex ('math.inf' if unreachable).
+    prev: list of int
+        The predecessor of each vertex in the tree (-1 for the root and for
+        unreachable vertices).
+    order: list of int
+        The vertices in the order they were settled.
+    """
+
+    dist = [math.inf] * (len(offsets) - 1)
+    prev = [-1] * (len(offsets) - 1)
+    visited = bytearray(len(offsets) - 1)
+    order = []
+
+    dist[source] = 0.0
+    pq = [(0.0, 0, source)]
+    count = 0
+
+    while pq:
+        current_cost, _, u = heapq.heappop(pq)
+
+        if visited[u]:
+            continue
+        visited[u] = 1
+        order.append(u)
+
+        for e in range(offsets[u], offsets[u + 1]):
+            neighbor = neighbors[e]
+            new_cost = current_cost + weights[e]
+
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                prev[neighbor] = u
+                count += 1
+                heapq.heappush(pq, (new_cost, count, neighbor))
+
+    if INSTRUMENTATION.enabled:
+        _record_search(None, len(order), count + 1, count + 1, sum(offsets[u + 1] - offsets[u] for u in order), count)
+
+    return dist, prev, order
+
+
+def _record_search(stats, settled, pushes=None, pops=None, scanned=None, relaxed=None):
+    """
+    Stores the counters of a search in 'stats' (if given) and adds them to
+    `INSTRUMENTATION` (if enabled). The searches derive them from their
+    final state (the tie-breaker counts the heap pushes, and every push but
+    the first follows a relaxation; what is left in the heap was never
+    popped), so they cost nothing while searching.
+
+    Parameters:
+    -----------
+    stats: dict or None
+        Receives `expanded` (the vertices settled), `heap_pushes`,
+        `heap_pops`, `edges_scanned` (the edges of the settled vertices) and
+        `edges_relaxed` (the ones that lowered a cost), when known.
+    settled, pushes, pops, scanned, relaxed: int
+        The counters (None when the search can not tell).
+    """
+
+    counters = {"heap_pushes": pushes, "heap_pops": pops, "edges_scanned": scanned, "edges_relaxed": relaxed}
+    counters = {name: value for name, value in counters.items() if value is not None}
+
+    if stats is not None:
+        stats["expanded"] = settled
+        stats.update(counters)
+
+    INSTRUMENTATION.count(searches=1, vertices_settled=settled, **counters)
@@ -0,0 +1,61 @@
+import json
+import sys
+
+def run_batch(dispatcher, terminal, lines, output=None) -> dict:
+    """
+    Runs terminal commands without interaction and writes the result of
+    each one as a line of JSON.
+
+    Commands run one after the other on the same terminal (so `changeto`
+    changes the source of the next ones) and over the same network, built
+    once by the caller. Nothing is waited or cleared: the result of each
+    command is written as soon as it is computed.
+
+    Parameters:
+    -----------
+    dispatcher (CommandDispatcher):
+        Runs the commands.
+    terminal (Terminal):
+        The terminal the commands run on.
+    lines (iterable):
+        The command lines, e.g. an open file. Empty lines and lines starting
+        with '#' are skipped.
+    output (file):
+        Where the results are written (`sys.stdout` by default).
+
+    Returns:
+    --------
+    summary (dict):
+        `commands` (the number of commands run) and `failed` (how many of
+        them gave an error, including the ones that raised an exception,
+        which are written as errors too).
+
+    Output:
+    -------
+        One object per command with its `line` number, its `input` and the
+        keys of the result of `CommandDispatcher.execute`, e.g.:
+        {"line": 1, "input": "ping 172.16.10.2", "command": "ping", "ok": true,
+         "source": "172.16.10.1", "destiny": "172.16.10.2", "replies": [0.52, ...]}
+    """
+
+    output = output if output is not None else sys.stdout
+    commands = failed = 0
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        try:
+            result = dispatcher.execute(terminal, line)
+        except Exception as error:
+            result = dispatcher.failure(line, error)
+
+        commands += 1
+        if not result["ok"]:
+            result["error"] = result["error"].strip()
+            failed += 1
+
+        output.write(json.dumps({"line": number, "input": line, **result}) + "\n")
+
+    return {"commands": commands, "failed": failed}
@@ -0,0 +1,229 @@
+import math
+import random
+
+ANY_FLOW = object()  # Cache key of the costs that do not depend on the flow.
+
+def batch_ping(pairs, vertex_map, count=4, jitter=False, rng=None) -> list:
+    """
+    Runs the simulated 'ping' for many (source, destiny) pairs at once,
+    without printing or sleeping.
+
+    The round trip time of a pair follows the same rule as `Terminal.ping`:
+    the cost of every hop going from the source to the destiny plus every
+    hop coming back, in milliseconds. Pairs are processed grouped by source
+    and the one-way costs are shared between pairs, so the routes of each
+    source are looked up once.
+
+    Parameters:
+    -----------
+    pairs (iterable):
+        The (source identifier, destiny identifier) pairs. A pair can also
+        be a (source, destiny, flow) triple: in `"ecmp"` routing mode the
+        flow is hashed to pick among equal-cost next hops (see
+        `Vertex.next_hop`), both going and coming back.
+    vertex_map (dict):
+        A dictionary mapping identifiers to `Vertex` objects.
+    count (int):
+        The number of packets sent per pair.
+    jitter (bool):
+        If True, adds the random variation of `Terminal.ping`
+        (0.1 to 0.4 ms) to each packet.
+    rng (random.Random):
+        The random generator used for the jitter (default: `random`).
+
+    Returns:
+    --------
+    results: list of dict
+        One result per pair, in the order of 'pairs', with the keys:
+        `source`, `destiny`, `reachable`, `times` (list of ms), and `min`,
+        `avg`, `max`, `mdev` (ms, None when unreachable).
+    """
+
+    rng = rng or random
+    pairs = list(pairs)
+    one_way = {}
+    results = [None] * len(pairs)
+
+    for i in _grouped_by_source(pairs):
+        source, destiny = pairs[i][:2]
+        flow = pairs[i][2] if len(pairs[i]) > 2 else None
+
+        going = _one_way_cost(vertex_map, source, destiny, one_way, flow)
+        coming = _one_way_cost(vertex_map, destiny, source, one_way, flow)
+
+        result = {"source": source, "destiny": destiny, "reachable": not math.isinf(going + coming)}
+
+        if result["reachable"]:
+            rtt = (going + coming) * 1000
+            times = [rtt + rng.uniform(0.1, 0.4) if jitter else rtt for _ in range(count)]
+            average = sum(times) / len(times)
+
+            result["times"] = times
+            result["min"] = min(times)
+            result["avg"] = average
+            result["max"] = max(times)
+            result["mdev"] = (sum((t - average) ** 2 for t in times) / len(times)) ** 0.5
+        else:
+            result["times"] = []
+            result["min"] = result["avg"] = result["max"] = result["mdev"] = None
+
+        results[i] = result
+
+    return results
+
+
+def batch_traceroute(pairs, vertex_map, max_hops=30, jitter=False, rng=None) -> list:
+    """
+    Runs the simulated 'traceroute' for many (source, destiny) pairs at
+    once, without printing or sleeping.
+
+    Hops follow the same rule as `Terminal.traceroute`: each hop adds the
+    going and coming back cost of one link, and links with no cost (inside
+    the same router) are not reported. The per-hop lookups are shared between
+    pairs that cross the same vertices towards the same destiny.
+
+    Parameters:
+    -----------
+    pairs (iterable):
+        The (source identifier, destiny identifier) pairs, or (source,
+        destiny, flow) triples (see `batch_ping`).
+    vertex_map (dict):
+        A dictionary mapping identifiers to `Vertex` objects.
+    max_hops (int):
+        The maximum number of hops reported.
+    jitter (bool):
+        If True, each hop reports three probes with the random variation of
+        `Terminal.traceroute` (0.1 to 0.4 ms) instead of one exact time.
+    rng (random.Random):
+        The random generator used for the jitter (default: `random`).
+
+    Returns:
+    --------
+    results: list of dict
+        One result per pair, in the order of 'pairs', with the keys:
+        `source`, `destiny`, `reachable`, `max_hops_reached` and `hops`, a
+        list of dicts with `hop`, `address`, `time` (ms) and `times` (the
+        probes, in ms).
+    """
+
+    rng = rng or random
+    pairs = list(pairs)
+    hop_info = {}
+    results = [None] * len(pairs)
+
+    for i in _grouped_by_source(pairs):
+        source, destiny = pairs[i][:2]
+        flow = pairs[i][2] if len(pairs[i]) > 2 else None
+        result = {"source": source, "destiny": destiny, "reachable": True, "max_hops_reached": False, "hops": []}
+
+        hop_count = 1
+        hop_time_package = 0
+        pointer = source
+
+        while pointer != destiny and hop_count <= max_hops:
+            info = hop_info.get((pointer, destiny, flow))
+            if info is None:
+                info = hop_info[(pointer, destiny, flow)] = _hop(vertex_map, pointer, destiny, flow)
+
+            next_hop, going, coming = info
+            if next_hop is None:
+                result["reachable"] = False
+                break
+
+            hop_time_package += going
+            hop_time_package += coming
+
+            if going > 0:
+                if jitter:
+                    times = [hop_time_package + rng.uniform(0.1, 0.4) for _ in range(3)]
+                else:
+                    times = [hop_time_package]
+
+                result["hops"].append({"hop": hop_count, "address": next_hop, "time": hop_time_package, "times": times})
+                hop_count += 1
+
+            pointer = next_hop
+
+        result["max_hops_reached"] = hop_count > max_hops
+        results[i] = result
+
+    return results
+
+
+def _grouped_by_source(pairs):
+    """
+    Returns the positions of 'pairs' ordered by source, so the routes of each
+    source are used together.
+    """
+
+    return sorted(range(len(pairs)), key=lambda i: pairs[i][0])
+
+
+def _one_way_cost(vertex_map, source, destiny, cache, flow=None):
+    """
+    Returns the cost (in seconds) of going hop by hop from 'source' to
+    'destiny' ('math.inf' if unreachable) with the packets of 'flow',
+    caching it in 'cache'.
+
+    Without a flow, the packets follow the route of the routing table, so
+    its total cost is returned directly. With a flow, the cost from every
+    vertex crossed to 'destiny' is cached too, and a walk stops at the first
+    vertex already known. Past the last vertex with several equal-cost next
+    hops the path no longer depends on the flow, so those costs are cached
+    for every flow (under `ANY_FLOW`).
+    """
+
+    key = (source, destiny, flow)
+    cost = cache.get(key)
+
+    if cost is None and flow is None:
+        cost = cache[key] = vertex_map[source].path_cost(destiny)
+
+    if cost is None:
+        pointer = vertex_map[source]
+
+        if math.isinf(pointer.path_cost(destiny)):
+            cost = cache[key] = math.inf
+            return cost
+
+        walked = []
+        cost = 0
+        branches = False  # Whether the path still depends on the flow.
+
+        while pointer.identifier != destiny:
+            known = cache.get((pointer.identifier, destiny, ANY_FLOW))
+            if known is None:
+                known = cache.get((pointer.identifier, destiny, flow))
+                branches = known is not None
+            if known is not None:
+                cost += known
+                break
+
+            walked.append((pointer.identifier, cost, len(pointer.multipath_table.get(destiny, ())) > 1))
+            cost += pointer.hop_cost(destiny, flow)
+            pointer = vertex_map[pointer.next_hop(destiny, flow)]
+
+        for identifier, prefix, branching in reversed(walked):
+            branches = branches or branching
+            cache[(identifier, destiny, flow if branches else ANY_FLOW)] = cost - prefix
+
+        cache[key] = cost
+
+    return cost
+
+
+def _hop(vertex_map, pointer, destiny, flow=None):
+    """
+    Returns the next hop from 'pointer' to 'destiny' (None if unreachable)
+    with the going and coming back cost of that link, in milliseconds.
+    """
+
+    vertex = vertex_map[pointer]
+    if math.isinf(vertex.path_cost(destiny)):
+        return None, 0, 0
+
+    next_hop = vertex.next_hop(destiny, flow)
+    going = vertex.hop_cost(destiny, flow) * 1000
+    coming = vertex_map[next_hop].hop_cost(pointer, flow) * 1000
+
+    return next_hop, going, coming
@@ -1,8 +1,11 @@
 from utils.functions.defineLinkProperties import define_link_properties
 from utils.structures.vertex import Vertex
 from utils.structures.graph import Graph
+from utils.structures.csrGraph import CSRGraph
+from utils.structures.instrumentation import INSTRUMENTATION
 
-def construct_graph(major_subnets, conections_in_same_router, host_subnets, SPEED) -> tuple[Graph, dict]:
+@INSTRUMENTATION.timed("construct_graph")
+def construct_graph(major_subnets, conections_in_same_router, host_subnets, SPEED, backend="dict", routing="tree") -> tuple[Graph, dict]:
     """
     Constructs a graph from multiple adjacency structures.
 
@@ -25,21 +28,42 @@ def construct_graph(major_subnets, conections_in_same_router, host_subnets, SPEE
         - Keys (str): Switches of edge layer (E1, E2, etc.).
         - Values (tuple of str): Hosts directly connected to the switch.
 
+    SPEED (str):
+        The type of network of the links (`"fiber"` or `"coaxial"`).
+
+    backend (str):
+        - `"dict"`: Builds a `Graph` (adjacency lists of `Vertex` objects).
+        - `"csr"`: Builds a `CSRGraph` (compact array-backed storage for
+          large topologies).
+
+    routing (str):
+        The routing engine used by `construct_routings_tables` (see
+        `Graph.construct_routings_tables`): `"tree"`, `"pairwise"`,
+        `"floyd-warshall"`, `"lazy"`, `"compact"`, `"parallel"` or `"ecmp"`.
+
     Returns:
     --------
     graph:
-        A `Graph` object representing the network topology.
+        A `Graph` (or `CSRGraph`) object representing the network topology.
     vertex_map:
         A dictionary containing all the `Vertex` objects.
     """
 
-    graph = Graph()
+    if backend == "dict":
+        graph = Graph()
+    elif backend == "csr":
+        graph = CSRGraph()
+    else:
+        raise ValueError(f"Graph backend not recognized: {backend}")
+
+    graph.medium = SPEED
+    graph.routing_mode = routing
     vertex_map = {}
 
     def get_or_create_vertex(vertex_id):
         if vertex_id not in vertex_map:
             vertex_map[vertex_id] = Vertex(vertex_id)
-            graph.vertices.append(vertex_id)
+            graph.add_vertex(vertex_id)
         return vertex_map[vertex_id]
 
     for main_vertex, adj_vertices in major_subnets.items():
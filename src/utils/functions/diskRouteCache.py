@@ -0,0 +1,202 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS
+from utils.functions.defineLinkProperties import define_link_properties
+from utils.structures.routingTable import CompactRouteStore
+from utils.structures.instrumentation import INSTRUMENTATION
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"RCRT"
+FORMAT_VERSION = 1
+LINK_TYPES = ("major subnet", "same router", "host subnet")
+
+# magic, version, number of vertices, size of the identifiers blob
+_HEADER = struct.Struct("<4sIII")
+
+def default_cache_dir() -> str:
+    """
+    Returns the folder where the routing tables are cached: the
+    `RC_ROUTE_CACHE_DIR` environment variable, or `~/.cache/network-simulator`.
+    """
+
+    return os.environ.get("RC_ROUTE_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "network-simulator")
+
+
+def topology_hash(major_subnets, conections_in_same_router, host_subnets, SPEED) -> str:
+    """
+    Returns a hash identifying the routing tables produced by a topology.
+
+    It covers the three adjacency dictionaries (including their order, which
+    defines the order of the vertices), the link properties returned by
+    `define_link_properties` for each type of connection, the type of
+    network, the packet size and the version of the file format.
+
+    Parameters:
+    -----------
+    major_subnets, conections_in_same_router, host_subnets (dict):
+        The adjacency structures given to `construct_graph`.
+    SPEED (str):
+        The type of network (`"fiber"` or `"coaxial"`).
+
+    Returns:
+    --------
+    str: The hexadecimal SHA-256 of the topology.
+    """
+
+    links = {}
+    for type in LINK_TYPES:
+        link = define_link_properties(type, SPEED)
+        links[type] = [link.distance, link.transmissionRate, link.SPEED]
+
+    description = [
+        FORMAT_VERSION,
+        PACKET_SIZE_BITS,
+        SPEED,
+        links,
+        major_subnets,
+        conections_in_same_router,
+        host_subnets,
+    ]
+
+    return hashlib.sha256(json.dumps(description).encode()).hexdigest()
+
+
+@INSTRUMENTATION.timed("construct_routings_tables_cached")
+def construct_routings_tables_cached(graph, vertex_map, topology_key, cache_dir=None, mode="compact") -> bool:
+    """
+    Installs the routing tables of 'graph' from the on-disk cache when there
+    is an entry for 'topology_key', or builds them (in 'mode') and saves them
+    for the next run. The tables loaded from the cache are always in
+    `"compact"` mode.
+
+    Parameters:
+    -----------
+    graph (Graph):
+        The graph built from the topology.
+    vertex_map (dict):
+        A dictionary mapping identifiers to `Vertex` objects.
+    topology_key (str):
+        The hash of the topology (see `topology_hash`).
+    cache_dir (str):
+        The cache folder (default: `default_cache_dir()`).
+    mode (str):
+        The mode of `Graph.construct_routings_tables` used on a miss; in
+        `"tree"` mode the tables can be reweighted by `Graph.set_medium`.
+
+    Returns:
+    --------
+    bool: True if the tables were loaded from the cache.
+    """
+
+    path = os.path.join(cache_dir or default_cache_dir(), f"{topology_key}.routes")
+
+    store = load_route_store(path, graph.vertices)
+    if store is not None:
+        graph.install_route_store(store, vertex_map)
+        return True
+
+    if mode == "compact":
+        store = graph.route_store(vertex_map)
+        graph.install_route_store(store, vertex_map)
+    else:
+        graph.construct_routings_tables(vertex_map, mode)
+        store = graph.route_store(vertex_map)
+
+    try:
+        save_route_store(path, store)
+    except OSError:
+        pass  # The cache is an optimization: a read-only disk is not an error.
+
+    return False
+
+
+def save_route_store(path, store):
+    """
+    Writes a `CompactRouteStore` to 'path' in the binary cache format.
+
+    Layout (little endian): the header, the identifiers separated by new
+    lines, then the next hop (int32), first hop cost (float64) and total cost
+    (float64) matrices, one row per source. Every section starts at a
+    multiple of 8 bytes so it can be mapped directly.
+    """
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    identifiers = "\n".join(store.identifiers).encode()
+    temporary = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(store.identifiers), len(identifiers)))
+        file.write(identifiers)
+        pad(file)
+
+        for rows in (store.next_hops, store.hop_costs, store.path_costs):
+            for row in rows:
+                file.write(row)
+            pad(file)
+
+    os.replace(temporary, path)
+
+
+def load_route_store(path, identifiers):
+    """
+    Maps a cached `CompactRouteStore` from 'path' without copying it.
+
+    Returns:
+    --------
+    CompactRouteStore, or None if the file is missing, invalid or was built
+    for other vertices.
+    """
+
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, n, identifiers_size = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or n != len(identifiers):
+            return None
+
+        offset = _HEADER.size
+        stored = mapped[offset:offset + identifiers_size].decode().split("\n") if n else []
+        if stored != list(identifiers):
+            return None
+
+        offset = aligned(offset + identifiers_size)
+        sections = []
+        for typecode, itemsize in (("i", 4), ("d", 8), ("d", 8)):
+            size = n * n * itemsize
+            if offset + size > len(mapped):
+                return None
+
+            view = memoryview(mapped)[offset:offset + size].cast(typecode)
+            sections.append([view[i * n:(i + 1) * n] for i in range(n)])
+            offset = aligned(offset + size)
+    except (struct.error, UnicodeDecodeError):
+        return None
+
+    store = CompactRouteStore(identifiers)
+    store.next_hops, store.hop_costs, store.path_costs = sections
+    store.mapped = mapped
+
+    return store
+
+
+def aligned(offset):
+    """
+    Rounds 'offset' up to a multiple of 8.
+    """
+
+    return (offset + 7) // 8 * 8
+
+
+def pad(file):
+    """
+    Pads 'file' with zeros up to a multiple of 8 bytes.
+    """
+
+    file.write(b"\0" * (aligned(file.tell()) - file.tell()))
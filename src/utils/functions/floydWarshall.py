@@ -0,0 +1,109 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS
+import math
+
+def floyd_warshall(graph):
+    """
+    Computes every shortest path of 'graph' at once with the Floyd–Warshall
+    algorithm (min-plus relaxation through every intermediate vertex),
+    keeping a next-hop matrix to rebuild the routes.
+
+    When NumPy is installed, each relaxation step is a vectorized matrix
+    operation; otherwise a pure Python version is used.
+
+    Parameters:
+    -----------
+    graph:
+        An object that has 'graph.vertices' and 'graph.compile_weights'
+        (see 'Graph.compile_weights').
+
+    Returns:
+    --------
+    dist: N x N matrix of float
+        dist[i][j] is the cost of the shortest path from vertex i to j
+        ('math.inf' if unreachable). Vertices are indexed by their position
+        in 'graph.vertices'.
+    next_hop: N x N matrix of int
+        next_hop[i][j] is the vertex after i on the path to j (-1 if
+        unreachable, i itself when i == j).
+    edge_weights: dict
+        { (i, j): weight } for every edge of the graph.
+    """
+
+    index = {identifier: i for i, identifier in enumerate(graph.vertices)}
+    _, edge_index = graph.compile_weights(PACKET_SIZE_BITS)
+
+    edge_weights = {}
+    for (u, v), weight in edge_index.items():
+        edge_weights[(index[u.identifier], index[v.identifier])] = weight
+
+    try:
+        import numpy
+    except ImportError:
+        dist, next_hop = _floyd_warshall_python(len(index), edge_weights)
+    else:
+        dist, next_hop = _floyd_warshall_numpy(numpy, len(index), edge_weights)
+
+    return dist, next_hop, edge_weights
+
+
+def _floyd_warshall_numpy(numpy, n, edge_weights):
+    """
+    Vectorized Floyd–Warshall: for each intermediate vertex k, relaxes the
+    whole matrix with dist[i, k] + dist[k, j] in one operation.
+    """
+
+    dist = numpy.full((n, n), math.inf)
+    next_hop = numpy.full((n, n), -1, dtype=numpy.int32)
+
+    for (i, j), weight in edge_weights.items():
+        dist[i, j] = weight
+        next_hop[i, j] = j
+
+    diagonal = numpy.arange(n)
+    dist[diagonal, diagonal] = 0.0
+    next_hop[diagonal, diagonal] = diagonal
+
+    for k in range(n):
+        through_k = dist[:, k, None] + dist[None, k, :]
+        better = through_k < dist
+        dist = numpy.where(better, through_k, dist)
+        next_hop = numpy.where(better, next_hop[:, k, None], next_hop)
+
+    return dist, next_hop
+
+
+def _floyd_warshall_python(n, edge_weights):
+    """
+    Pure Python Floyd–Warshall, used when NumPy is not installed.
+    """
+
+    dist = [[math.inf] * n for _ in range(n)]
+    next_hop = [[-1] * n for _ in range(n)]
+
+    for (i, j), weight in edge_weights.items():
+        dist[i][j] = weight
+        next_hop[i][j] = j
+
+    for i in range(n):
+        dist[i][i] = 0.0
+        next_hop[i][i] = i
+
+    for k in range(n):
+        dist_k = dist[k]
+
+        for i in range(n):
+            dist_i = dist[i]
+            dist_ik = dist_i[k]
+            if dist_ik == math.inf:
+                continue
+
+            next_i = next_hop[i]
+            next_ik = next_i[k]
+
+            for j in range(n):
+                through_k = dist_ik + dist_k[j]
+                if through_k < dist_i[j]:
+                    dist_i[j] = through_k
+                    next_i[j] = next_ik
+
+    return dist, next_hop
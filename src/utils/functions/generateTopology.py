@@ -0,0 +1,322 @@
+import csv
+import json
+import math
+import random
+
+TOPOLOGY_KINDS = ("tree", "fat-tree", "geometric", "isp")
+
+def generate_tree(cores, aggregations_per_core, edges_per_aggregation, hosts_per_edge):
+    """
+    Yields the edges of a core/aggregation/edge tree, the layout of the
+    network in `adjascentVertices.py` scaled up.
+
+    The core routers are fully meshed; every aggregation router hangs from
+    one core router, every edge switch from one aggregation router, and
+    every host from one edge switch.
+
+    Parameters:
+    -----------
+    cores (int):
+        The number of core routers.
+    aggregations_per_core (int):
+        The number of aggregation routers under each core router.
+    edges_per_aggregation (int):
+        The number of edge switches under each aggregation router.
+    hosts_per_edge (int):
+        The number of hosts of each edge switch (at most 253).
+
+    Yields:
+    -------
+    (source, target, type, distance, rate):
+        Edge records for `build_graph` (see `loadTopology.py`). Routers are
+        addressed in `10.0.0.0/8`; each edge switch owns a `/24` inside
+        `172.16.0.0/12`, where it is `.254` and its hosts are `.1`, `.2`, ...
+    """
+
+    core = [_router_address(i) for i in range(cores)]
+    for i in range(cores):
+        for j in range(i + 1, cores):
+            yield core[i], core[j], "major subnet", None, None
+
+    router = cores
+    switch = 0
+    for core_address in core:
+        for _ in range(aggregations_per_core):
+            aggregation = _router_address(router)
+            router += 1
+            yield core_address, aggregation, "major subnet", None, None
+
+            for _ in range(edges_per_aggregation):
+                yield aggregation, _host_address(switch, 254), "major subnet", None, None
+                yield from _hosts(switch, hosts_per_edge)
+                switch += 1
+
+
+def generate_fat_tree(k):
+    """
+    Yields the edges of a k-ary fat-tree: (k/2)² core switches and k pods,
+    each with k/2 aggregation and k/2 edge switches fully connected to each
+    other, and k/2 hosts per edge switch.
+
+    Parameters:
+    -----------
+    k (int):
+        The (even) number of ports of each switch.
+
+    Yields:
+    -------
+    (source, target, type, distance, rate):
+        Edge records (see `generate_tree` for the addressing).
+    """
+
+    if k < 2 or k % 2:
+        raise ValueError(f"The number of ports of a fat-tree must be even: {k}")
+
+    half = k // 2
+    core = [_router_address(i) for i in range(half * half)]
+
+    router = len(core)
+    switch = 0
+    for _ in range(k):
+        aggregations = [_router_address(router + i) for i in range(half)]
+        router += half
+
+        for i, aggregation in enumerate(aggregations):
+            for core_address in core[i * half:(i + 1) * half]:
+                yield aggregation, core_address, "major subnet", None, None
+
+        for _ in range(half):
+            edge = _host_address(switch, 254)
+            for aggregation in aggregations:
+                yield edge, aggregation, "major subnet", None, None
+            yield from _hosts(switch, half)
+            switch += 1
+
+
+def random_geometric_positions(n, seed=0, side=1000000.0) -> dict:
+    """
+    Places 'n' routers uniformly at random in a square.
+
+    Parameters:
+    -----------
+    n (int):
+        The number of routers.
+    seed (int):
+        The seed of the random generator.
+    side (float):
+        The side of the square, in meters (1000 km by default).
+
+    Returns:
+    --------
+    positions (dict):
+        { identifier: (x, y) } for every router, in meters.
+    """
+
+    rng = random.Random(seed)
+
+    return {_router_address(i): (rng.uniform(0, side), rng.uniform(0, side)) for i in range(n)}
+
+
+def generate_random_geometric(positions, radius):
+    """
+    Yields the edges of a random geometric graph: every pair of routers
+    closer than 'radius' is linked by a `"major subnet"` link whose distance
+    is the euclidean distance between them.
+
+    The routers are bucketed in a grid of cells of side 'radius', so only
+    neighbouring cells are compared. The graph is not guaranteed to be
+    connected.
+
+    Parameters:
+    -----------
+    positions (dict):
+        { identifier: (x, y) } (see `random_geometric_positions`).
+    radius (float):
+        The maximum length of a link, in meters.
+
+    Yields:
+    -------
+    (source, target, type, distance, rate):
+        Edge records (see `generate_tree`).
+    """
+
+    cells = {}
+    for identifier, (x, y) in positions.items():
+        cells.setdefault((int(x // radius), int(y // radius)), []).append(identifier)
+
+    for (cx, cy), members in cells.items():
+        for identifier in members:
+            x, y = positions[identifier]
+
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for other in cells.get((cx + dx, cy + dy), ()):
+                        if other <= identifier:
+                            continue
+
+                        distance = math.dist((x, y), positions[other])
+                        if distance <= radius:
+                            yield identifier, other, "major subnet", distance, None
+
+
+def generate_isp_mesh(pops, routers_per_pop, hosts_per_router, extra_links=None, seed=0):
+    """
+    Yields the edges of an ISP-like network: points of presence (PoPs) on a
+    backbone ring with random chords, each PoP with a border router, access
+    routers attached to it and hosts attached to the access routers.
+
+    Parameters:
+    -----------
+    pops (int):
+        The number of points of presence.
+    routers_per_pop (int):
+        The number of access routers of each PoP.
+    hosts_per_router (int):
+        The number of hosts of each access router (at most 253).
+    extra_links (int):
+        The number of random backbone chords (default: one per PoP).
+    seed (int):
+        The seed of the random generator.
+
+    Yields:
+    -------
+    (source, target, type, distance, rate):
+        Edge records (see `generate_tree`). Backbone links are
+        `"major subnet"`, links inside a PoP and to the hosts are
+        `"host subnet"`.
+    """
+
+    rng = random.Random(seed)
+    border = [_router_address(i) for i in range(pops)]
+
+    backbone = set()
+    if pops > 1:
+        for i in range(pops):
+            backbone.add((min(i, (i + 1) % pops), max(i, (i + 1) % pops)))
+
+    chords = pops if extra_links is None else extra_links
+    if pops > 3:
+        for _ in range(chords):
+            i, j = rng.sample(range(pops), 2)
+            backbone.add((min(i, j), max(i, j)))
+
+    for i, j in sorted(backbone):
+        yield border[i], border[j], "major subnet", None, None
+
+    switch = 0
+    for border_address in border:
+        for _ in range(routers_per_pop):
+            access = _host_address(switch, 254)
+            yield border_address, access, "host subnet", None, None
+            yield from _hosts(switch, hosts_per_router)
+            switch += 1
+
+
+def generate_topology(kind, vertices, seed=0):
+    """
+    Yields the edges of a topology of the given kind with roughly 'vertices'
+    vertices (at least that many for `"tree"` and `"fat-tree"`).
+
+    Parameters:
+    -----------
+    kind (str):
+        One of `TOPOLOGY_KINDS`: `"tree"`, `"fat-tree"`, `"geometric"` or
+        `"isp"`.
+    vertices (int):
+        The target number of vertices.
+    seed (int):
+        The seed of the random generator (used by `"geometric"` and `"isp"`).
+
+    Yields:
+    -------
+    (source, target, type, distance, rate):
+        Edge records for `build_graph`.
+    """
+
+    if kind == "tree":
+        # Two cores with 'b' aggregations each, 'b' edges per aggregation and 'b' hosts per edge.
+        b = 1
+        while 2 * (1 + b + b * b + b * b * b) < vertices:
+            b += 1
+        return generate_tree(2, b, b, min(b, 253))
+
+    elif kind == "fat-tree":
+        k = 2
+        while 5 * k * k // 4 + k ** 3 // 4 < vertices:
+            k += 2
+        return generate_fat_tree(k)
+
+    elif kind == "geometric":
+        # Radius giving an average of about 8 neighbours per router.
+        side = 1000000.0
+        radius = side * math.sqrt(8 / (math.pi * max(vertices, 1)))
+        return generate_random_geometric(random_geometric_positions(vertices, seed, side), radius)
+
+    elif kind == "isp":
+        pops = max(2, round(math.sqrt(vertices / 25)))
+        routers = math.ceil(vertices / (pops * 64))
+        hosts = max(1, min(253, round(vertices / (pops * routers)) - 1))
+        return generate_isp_mesh(pops, routers, hosts, seed=seed)
+
+    raise ValueError(f"Topology kind not recognized: {kind}")
+
+
+def write_topology(path, records):
+    """
+    Writes edge records to a file readable by `load_topology`, in CSV or
+    JSONL according to the extension of 'path'.
+    """
+
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("source", "target", "type", "distance", "rate"))
+            for source, target, type, distance, rate in records:
+                writer.writerow((source, target, type, "" if distance is None else distance, "" if rate is None else rate))
+
+    elif path.endswith(".jsonl") or path.endswith(".ndjson"):
+        with open(path, "w") as file:
+            for source, target, type, distance, rate in records:
+                edge = {"source": source, "target": target, "type": type}
+                if distance is not None:
+                    edge["distance"] = distance
+                if rate is not None:
+                    edge["rate"] = rate
+                file.write(json.dumps(edge) + "\n")
+
+    else:
+        raise ValueError(f"Topology file format not recognized: {path}")
+
+
+def _router_address(i):
+    """
+    Returns the address of the i-th router, inside `10.0.0.0/8`.
+    """
+
+    i += 1
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def _host_address(switch, host):
+    """
+    Returns the address 'host' of the `/24` of the given edge switch, inside
+    `172.16.0.0/12`.
+    """
+
+    if switch >= 16 * 256:
+        raise ValueError("Too many edge switches for 172.16.0.0/12")
+
+    return f"172.{16 + switch // 256}.{switch % 256}.{host}"
+
+
+def _hosts(switch, count):
+    """
+    Yields the host links of an edge switch.
+    """
+
+    if count > 253:
+        raise ValueError(f"Too many hosts for a /24: {count}")
+
+    edge = _host_address(switch, 254)
+    for host in range(1, count + 1):
+        yield edge, _host_address(switch, host), "host subnet", None, None
@@ -0,0 +1,146 @@
+from utils.functions.defineLinkProperties import define_link_properties
+from utils.structures.link import Link
+from utils.structures.vertex import Vertex
+from utils.structures.graph import Graph
+from utils.structures.csrGraph import CSRGraph
+from utils.structures.instrumentation import INSTRUMENTATION
+import csv
+import json
+
+def load_topology(path, SPEED, backend="csr", routing="tree") -> tuple:
+    """
+    Builds a graph from an external edge list file, streaming it line by
+    line in a single pass.
+
+    Accepted formats (chosen by the file extension):
+    - `.csv`: columns `source,target,type[,distance,rate]`, with an
+      optional header line starting with `source`.
+    - `.jsonl` / `.ndjson`: one object per line with the keys `source`,
+      `target`, `type` and, optionally, `distance` and `rate`.
+
+    `type` is one of the connection types of `define_link_properties`
+    (`"major subnet"`, `"same router"` or `"host subnet"`). When `distance`
+    (meters) and `rate` (bps) are given, they override the properties of the
+    type.
+
+    Parameters:
+    -----------
+    path (str):
+        The edge list file.
+    SPEED (str):
+        The type of network of the links (`"fiber"` or `"coaxial"`).
+    backend (str):
+        The graph backend (see `construct_graph`). `"csr"` by default, since
+        it keeps large topologies compact.
+    routing (str):
+        The routing engine used by `construct_routings_tables`.
+
+    Returns:
+    --------
+    graph:
+        A `Graph` (or `CSRGraph`) object representing the network topology.
+    vertex_map:
+        A dictionary containing all the `Vertex` objects.
+    """
+
+    return build_graph(iter_topology_records(path), SPEED, backend, routing)
+
+
+def iter_topology_records(path):
+    """
+    Yields the edges of a topology file (see `load_topology`) one at a time
+    as (source, target, type, distance, rate) tuples, with None for the
+    missing properties.
+    """
+
+    if path.endswith(".csv"):
+        with open(path, newline="") as file:
+            for row in csv.reader(file):
+                if not row or row[0].startswith("#") or row[0] == "source":
+                    continue
+
+                distance = float(row[3]) if len(row) > 3 and row[3] != "" else None
+                rate = float(row[4]) if len(row) > 4 and row[4] != "" else None
+                yield row[0], row[1], row[2], distance, rate
+
+    elif path.endswith(".jsonl") or path.endswith(".ndjson"):
+        with open(path) as file:
+            for line in file:
+                if not line.strip():
+                    continue
+
+                edge = json.loads(line)
+                yield edge["source"], edge["target"], edge["type"], edge.get("distance"), edge.get("rate")
+
+    else:
+        raise ValueError(f"Topology file format not recognized: {path}")
+
+
+@INSTRUMENTATION.timed("construct_graph")
+def build_graph(records, SPEED, backend="csr", routing="tree") -> tuple:
+    """
+    Builds a graph in a single pass over an iterable of edges, without
+    materializing intermediate dictionaries.
+
+    With the `"csr"` backend no `Link` object is kept: the distance, rate
+    and propagation speed of every edge are stored in the buffers of the
+    graph. With the `"dict"` backend, edges with the same type and
+    properties share one `Link`, but edges with their own distance or rate
+    (e.g. the `"geometric"` topologies) get one `Link` each.
+
+    Parameters:
+    -----------
+    records (iterable):
+        (source, target, type, distance, rate) tuples (see
+        `iter_topology_records`).
+    SPEED, backend, routing:
+        See `load_topology`.
+
+    Returns:
+    --------
+    graph, vertex_map:
+        See `load_topology`.
+    """
+
+    if backend == "dict":
+        graph = Graph()
+    elif backend == "csr":
+        graph = CSRGraph()
+    else:
+        raise ValueError(f"Graph backend not recognized: {backend}")
+
+    graph.medium = SPEED
+    graph.routing_mode = routing
+    vertex_map = {}
+    links = {}
+
+    def get_or_create_vertex(vertex_id):
+        if vertex_id not in vertex_map:
+            vertex_map[vertex_id] = Vertex(vertex_id)
+            graph.add_vertex(vertex_id)
+        return vertex_map[vertex_id]
+
+    for source, target, type, distance, rate in records:
+        type = type.replace("_", " ")
+        key = (type, distance, rate)
+
+        link = links.get(key)
+        if link is None:
+            link = define_link_properties(type, SPEED)
+            if distance is not None or rate is not None:
+                link = Link(
+                    distance = link.distance if distance is None else distance,
+                    transmissionRate = link.transmissionRate if rate is None else rate,
+                    SPEED = SPEED
+                )
+            if backend == "dict" or (distance is None and rate is None):
+                links[key] = link  # Edges with their own properties are not kept in the CSR backend.
+
+        if backend == "csr":
+            get_or_create_vertex(source)
+            get_or_create_vertex(target)
+            graph.add_link(source, target, link.distance, link.transmissionRate, link.SPEED)
+        else:
+            graph.link_vertices(get_or_create_vertex(source), get_or_create_vertex(target), link)
+
+    return graph, vertex_map
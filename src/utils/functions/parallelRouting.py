@@ -0,0 +1,161 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS, shortest_path_tree_csr
+from utils.structures.routingTable import CompactRouteStore, CompactRoutingTable
+from array import array
+import math
+import os
+
+# CSR buffers of the graph, set once in every worker process by `_init_worker`.
+_worker_graph = None
+
+def construct_routings_tables_parallel(graph, vertex_map, workers=None):
+    """
+    Builds the routing tables of every vertex sharding the sources across a
+    pool of processes.
+
+    The workers receive the graph once, in a compact serialized form (the
+    CSR buffers as bytes), instead of the pickled `Vertex`/`Link` objects.
+    Each worker runs one Dijkstra per source of its shards and sends back
+    only the next hop, first hop cost and total cost arrays of each source,
+    which are merged into a `CompactRouteStore`.
+
+    Parameters:
+    -----------
+    graph:
+        A `Graph` or `CSRGraph`.
+    vertex_map (dict):
+        A dictionary mapping identifiers to `Vertex` objects.
+    workers (int):
+        The number of processes (default: the number of CPUs).
+
+    Returns:
+    --------
+    store: CompactRouteStore
+        The routes of every vertex. Each vertex receives a
+        `CompactRoutingTable` view into it.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    serialized = _serialize(graph)
+
+    n = len(graph.vertices)
+    chunk_size = max(1, math.ceil(n / (workers * 4)))
+    shards = [range(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+    store = CompactRouteStore(graph.vertices)
+
+    # Imported here: it pulls in multiprocessing, which slows down the
+    # start of every program that imports `graph.py`.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(serialized,)) as executor:
+        for results in executor.map(_route_shard, shards):
+            for source, next_hops, hop_costs, path_costs in results:
+                store.next_hops[source] = _from_bytes('i', next_hops)
+                store.hop_costs[source] = _from_bytes('d', hop_costs)
+                store.path_costs[source] = _from_bytes('d', path_costs)
+
+    for i, identifier in enumerate(graph.vertices):
+        vertex_map[identifier].routing_table = CompactRoutingTable(store, i)
+
+    return store
+
+
+def _serialize(graph):
+    """
+    Returns the CSR buffers of 'graph' (offsets, neighbors, weights) as bytes.
+    """
+
+    if hasattr(graph, "csr"):
+        offsets, neighbors, _ = graph.csr()
+        weights = graph.edge_weights(PACKET_SIZE_BITS)
+    else:
+        adjacency, _ = graph.compile_weights(PACKET_SIZE_BITS)
+        index = {identifier: i for i, identifier in enumerate(graph.vertices)}
+
+        rows = [[] for _ in graph.vertices]
+        for vertex, connections in adjacency.items():
+            rows[index[vertex.identifier]] = connections
+
+        offsets = array('q', [0])
+        neighbors = array('i')
+        weights = array('d')
+        for row in rows:
+            for adj_vertex, weight in row:
+                neighbors.append(index[adj_vertex.identifier])
+                weights.append(weight)
+            offsets.append(len(neighbors))
+
+    return offsets.tobytes(), neighbors.tobytes(), weights.tobytes()
+
+
+def _from_bytes(typecode, data):
+    """
+    Rebuilds a typed array from its bytes.
+    """
+
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+def _init_worker(serialized):
+    """
+    Decodes the CSR buffers once per worker process.
+    """
+
+    global _worker_graph
+
+    offsets, neighbors, weights = serialized
+    _worker_graph = (_from_bytes('q', offsets), _from_bytes('i', neighbors), _from_bytes('d', weights))
+
+
+def _route_shard(sources):
+    """
+    Computes the compact routes of a shard of sources inside a worker.
+
+    Returns:
+    --------
+    results: list of (source, next_hops, hop_costs, path_costs)
+        The arrays of each source, as bytes.
+    """
+
+    offsets, neighbors, weights = _worker_graph
+    results = []
+
+    for source in sources:
+        next_hops, hop_costs, path_costs = compact_routes(offsets, neighbors, weights, source)
+        results.append((source, next_hops.tobytes(), hop_costs.tobytes(), path_costs.tobytes()))
+
+    return results
+
+
+def compact_routes(offsets, neighbors, weights, source):
+    """
+    Computes the routes of a source over CSR buffers in the format of
+    `CompactRouteStore`.
+
+    Returns:
+    --------
+    next_hops, hop_costs, path_costs: array
+        The rows of 'source' in the store.
+    """
+
+    n = len(offsets) - 1
+    dist, prev, order = shortest_path_tree_csr(offsets, neighbors, weights, source)
+
+    next_hops = array('i', [-1]) * n
+    hop_costs = array('d', [math.inf]) * n
+
+    for vertex in order:
+        parent = prev[vertex]
+        if vertex == source:
+            next_hops[vertex] = source
+            hop_costs[vertex] = 0.0
+        elif parent == source:
+            next_hops[vertex] = vertex
+            hop_costs[vertex] = dist[vertex]
+        else:
+            next_hops[vertex] = next_hops[parent]
+            hop_costs[vertex] = hop_costs[parent]
+
+    return next_hops, hop_costs, array('d', dist)
@@ -0,0 +1,130 @@
+from utils.structures.prefixTrie import PrefixTrie, ip_to_int
+from utils.structures.forwardingEngine import ForwardingEngine
+from collections import Counter
+import math
+
+# Next hop values of the prefix tables besides the identifier of a gateway.
+CONNECTED = "connected"  # The destiny is the vertex itself or a directly linked one.
+UNREACHABLE = "unreachable"
+
+def aggregate_routes(vertex, identifiers, prefix_length=24) -> list:
+    """
+    Compresses the routing table of a vertex into IPv4 prefixes.
+
+    Each destiny is reduced to the action of the vertex towards it: forward
+    to a gateway (the next hop), deliver on a link (`CONNECTED`, when the
+    next hop is the destiny itself) or drop (`UNREACHABLE`). Destinies are
+    then grouped by subnet (their first 'prefix_length' bits):
+
+    - each subnet gets one entry with the action of most of its addresses,
+    - addresses with another action get their own /32 entry,
+    - the action of most subnets becomes the default route (0.0.0.0/0), and
+      the subnets with that action need no entry.
+
+    Longest-prefix match on the result gives the same action as the routing
+    table for every destiny, with a number of entries that grows with the
+    number of subnets, not of hosts.
+
+    Parameters:
+    -----------
+    vertex (Vertex):
+        The vertex whose routing table is compressed.
+    identifiers (list):
+        The identifiers (dotted IPv4 addresses) of every vertex.
+    prefix_length (int):
+        The length of the subnets (24 by default).
+
+    Returns:
+    --------
+    entries: list of (prefix, length, next hop)
+        The prefixes as ints, the default route first.
+    """
+
+    shift = 32 - prefix_length
+    subnets = {}
+
+    for destiny in identifiers:
+        if destiny == vertex.identifier:
+            action = CONNECTED
+        elif math.isinf(vertex.path_cost(destiny)):
+            action = UNREACHABLE
+        else:
+            hop = vertex.next_hop(destiny)
+            action = CONNECTED if hop == destiny else hop
+
+        address = ip_to_int(destiny)
+        subnets.setdefault(address >> shift, []).append((address, action))
+
+    majorities = {subnet: Counter(action for _, action in members).most_common(1)[0][0] for subnet, members in subnets.items()}
+    default = Counter(majorities.values()).most_common(1)[0][0] if majorities else UNREACHABLE
+
+    entries = [(0, 0, default)]
+
+    for subnet, members in subnets.items():
+        majority = majorities[subnet]
+        if majority != default:
+            entries.append((subnet << shift, prefix_length, majority))
+
+        for address, action in members:
+            if action != majority:
+                entries.append((address, 32, action))
+
+    return entries
+
+
+def construct_prefix_tables(graph, vertex_map, prefix_length=24) -> int:
+    """
+    Builds the prefix-aggregated table of every vertex (see
+    `aggregate_routes`) into a `PrefixTrie` stored in `Vertex.prefix_table`,
+    used by `Vertex.route`. The routing tables must be built first, and the
+    identifiers must be IPv4 addresses.
+
+    Returns:
+    --------
+        int: The total number of entries of the prefix tables.
+    """
+
+    total = 0
+
+    for identifier in graph.vertices:
+        vertex = vertex_map[identifier]
+        trie = PrefixTrie()
+
+        for prefix, length, next_hop in aggregate_routes(vertex, graph.vertices, prefix_length):
+            trie.insert(prefix, length, next_hop)
+
+        vertex.prefix_table = trie
+        total += len(trie)
+
+    return total
+
+
+def construct_forwarding_engines(graph, vertex_map, strides=(16, 8, 8)) -> int:
+    """
+    Compiles the prefix table of every vertex into a `ForwardingEngine`
+    stored in `Vertex.forwarding_engine`. The prefix tables must be built
+    first (see `construct_prefix_tables`).
+
+    Parameters:
+    -----------
+    strides (tuple):
+        The strides of the multibit tries. The first level takes
+        4 * 2 ** strides[0] bytes per vertex (256 KiB with the default 16).
+
+    Returns:
+    --------
+        int: The total size of the tables of the engines, in bytes.
+    """
+
+    total = 0
+
+    for identifier in graph.vertices:
+        vertex = vertex_map[identifier]
+
+        if vertex.prefix_table is None:
+            raise ValueError(f"Prefix table of {identifier} not built")
+
+        vertex.forwarding_engine = ForwardingEngine(vertex.prefix_table.entries(), strides)
+        total += vertex.forwarding_engine.nbytes
+
+    return total
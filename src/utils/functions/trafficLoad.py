@@ -0,0 +1,309 @@
+from collections import defaultdict
+from heapq import heappush, heappop
+from array import array
+import math
+
+def simulate_load(traffic, graph, vertex_map, max_min=True) -> dict:
+    """
+    Routes a traffic matrix over the routing tables and reports the load of
+    every link.
+
+    Packets are forwarded hop by hop with `Vertex.next_hop`, so the routes
+    towards one destiny form a tree rooted at it (a DAG in `"ecmp"` routing
+    mode). Flows are grouped by destiny: the next hops of each tree are
+    looked up once, and the demand is pushed from the leaves to the root in
+    a single pass over the vertices of the tree, adding to each link the
+    total demand that crosses it. The cost is proportional to the size of
+    the trees, not to the number of pairs times their length.
+
+    With equal-cost next hops, the load of a vertex is split evenly among
+    them (the average of many hashed flows). The max-min fair allocation
+    uses the single path each pair takes with its flow hashed as (source,
+    destiny), as packets of one flow are never split.
+
+    Parameters:
+    -----------
+    traffic (iterable):
+        (source identifier, destiny identifier, bits per second) demands.
+        Demands of the same pair are added together.
+    graph:
+        A `Graph` or `CSRGraph` with its routing tables built.
+    vertex_map (dict):
+        A dictionary mapping identifiers to `Vertex` objects.
+    max_min (bool):
+        If True, also computes the max-min fair throughput of every pair
+        (see `max_min_fair`).
+
+    Returns:
+    --------
+    report (dict):
+        - `links`: list of dicts `source`, `target`, `load` (bps),
+          `capacity` (bps, None for links without a transmission rate, like
+          the ones inside a router) and `utilisation` (load / capacity, None
+          without capacity), sorted by decreasing utilisation.
+        - `bottlenecks`: the links with utilisation of at least 1.
+        - `unroutable`: the (source, destiny) pairs without a route.
+        - `throughput` (with 'max_min'): { (source, destiny): bps }.
+        - `saturated` (with 'max_min'): the links that limit the fair
+          allocation, as (source, target) pairs.
+    """
+
+    demands = defaultdict(dict)
+    for source, destiny, bps in traffic:
+        sources = demands[destiny]
+        sources[source] = sources.get(source, 0) + bps
+
+    edge_ids = {}
+    edges = []
+    loads = array('d')
+    unroutable = []
+
+    pairs = []
+    pair_demands = array('d')
+    pair_paths = []
+
+    for destiny, sources in demands.items():
+        successors, order = _routes_to(vertex_map, destiny, sources)
+
+        pending = defaultdict(float)
+        for source, bps in sources.items():
+            if source not in successors:
+                unroutable.append((source, destiny))
+            elif source != destiny:
+                pending[source] += bps
+
+        for vertex in order:
+            if vertex not in pending:
+                continue
+
+            nexts = successors[vertex]
+            amount = pending.pop(vertex) / len(nexts)
+
+            for nxt in nexts:
+                edge = edge_ids.get((vertex, nxt))
+                if edge is None:
+                    edge = edge_ids[(vertex, nxt)] = len(edges)
+                    edges.append((vertex, nxt))
+                    loads.append(0.0)
+
+                loads[edge] += amount
+                if nxt != destiny:
+                    pending[nxt] += amount
+
+        if max_min:
+            for source, bps in sources.items():
+                if source not in successors or source == destiny:
+                    continue
+
+                path = array('i')
+                vertex = source
+                while vertex != destiny:
+                    nexts = successors[vertex]
+                    nxt = nexts[0] if len(nexts) == 1 else vertex_map[vertex].next_hop(destiny, (source, destiny))
+                    path.append(edge_ids[(vertex, nxt)])
+                    vertex = nxt
+
+                pairs.append((source, destiny))
+                pair_demands.append(bps)
+                pair_paths.append(path)
+
+    capacities = _capacities(graph, vertex_map, edges)
+
+    links = []
+    for edge, (source, target) in enumerate(edges):
+        capacity = capacities[edge]
+        utilisation = loads[edge] / capacity if capacity is not None else None
+        links.append({"source": source, "target": target, "load": loads[edge], "capacity": capacity, "utilisation": utilisation})
+
+    links.sort(key=lambda link: -1 if link["utilisation"] is None else link["utilisation"], reverse=True)
+
+    report = {
+        "links": links,
+        "bottlenecks": [link for link in links if link["utilisation"] is not None and link["utilisation"] >= 1],
+        "unroutable": unroutable,
+    }
+
+    if max_min:
+        rates, saturated = max_min_fair(pair_paths, pair_demands, capacities)
+        report["throughput"] = dict(zip(pairs, rates))
+        report["saturated"] = [edges[edge] for edge in saturated]
+
+    return report
+
+
+def max_min_fair(paths, demands, capacities):
+    """
+    Computes the max-min fair rates of flows with fixed paths (progressive
+    filling): the rates of all flows grow together until a flow reaches its
+    demand or a link fills up, which freezes the flows that cross it, and so
+    on until every flow is frozen.
+
+    The links are kept in a heap by the rate at which they would fill up
+    (their free capacity divided by their number of growing flows); entries
+    are refreshed lazily when a flow is frozen.
+
+    Parameters:
+    -----------
+    paths (list):
+        The links (ids) crossed by each flow.
+    demands (list):
+        The demand of each flow (bps).
+    capacities (list):
+        The capacity of each link (bps, None for unlimited).
+
+    Returns:
+    --------
+    rates (list):
+        The rate of each flow (bps).
+    saturated (list):
+        The ids of the links that froze flows, in the order they filled up.
+    """
+
+    flows_on = defaultdict(list)
+    growing = [0] * len(capacities)
+    for flow, path in enumerate(paths):
+        for edge in path:
+            if capacities[edge] is not None:
+                flows_on[edge].append(flow)
+                growing[edge] += 1
+
+    free = [capacity if capacity is not None else math.inf for capacity in capacities]
+    rates = [None] * len(paths)
+    saturated = []
+
+    heap = [(free[edge] / growing[edge], edge) for edge in flows_on]
+    heap.sort()
+
+    by_demand = sorted(range(len(paths)), key=demands.__getitem__)
+    next_demand = 0
+
+    def freeze(flow, rate, touched):
+        rates[flow] = rate
+        for edge in paths[flow]:
+            if capacities[edge] is not None:
+                free[edge] -= rate
+                growing[edge] -= 1
+                touched.add(edge)
+
+    while True:
+        while heap and (not growing[heap[0][1]] or heap[0][0] != max(free[heap[0][1]], 0) / growing[heap[0][1]]):
+            heappop(heap)  # Stale entry.
+
+        level = heap[0][0] if heap else math.inf
+        touched = set()
+
+        # Freezing a flow below the level never lowers the level of a link,
+        # so every flow whose demand is reached is frozen at once.
+        while next_demand < len(by_demand) and demands[by_demand[next_demand]] <= level:
+            flow = by_demand[next_demand]
+            if rates[flow] is None:
+                freeze(flow, demands[flow], touched)
+            next_demand += 1
+
+        if not touched:
+            if not heap:
+                break
+
+            _, edge = heappop(heap)
+            saturated.append(edge)
+            for flow in flows_on[edge]:
+                if rates[flow] is None:
+                    freeze(flow, level, touched)
+
+        for edge in touched:
+            if growing[edge]:
+                heappush(heap, (max(free[edge], 0) / growing[edge], edge))
+
+    return rates, saturated
+
+
+def print_load_report(report, top=10):
+    """
+    Prints the most used links of a `simulate_load` report.
+    """
+
+    print(f"\nLink load (top {top}):")
+
+    for link in report["links"][:top]:
+        if link["utilisation"] is None:
+            print(f"    - {link['source']} -> {link['target']}: {link['load'] / 1e6:.2f} Mbps (no capacity limit)")
+        else:
+            print(f"    - {link['source']} -> {link['target']}: {link['load'] / 1e6:.2f} / {link['capacity'] / 1e6:.2f} Mbps ({link['utilisation'] * 100:.1f}%)")
+
+    print(f"\nBottlenecks: {len(report['bottlenecks'])}")
+    for link in report["bottlenecks"][:top]:
+        print(f"    - {link['source']} -> {link['target']} ({link['utilisation'] * 100:.1f}%)")
+
+    if "throughput" in report:
+        print(f"\nMax-min fair throughput: {sum(report['throughput'].values()) / 1e6:.2f} Mbps over {len(report['throughput'])} flows")
+
+    if report["unroutable"]:
+        print(f"\nUnroutable pairs: {len(report['unroutable'])}")
+
+    print()
+
+
+def _routes_to(vertex_map, destiny, sources):
+    """
+    Follows the next hops from every source towards 'destiny'.
+
+    Returns:
+    --------
+    successors (dict):
+        { identifier: [next hop, ...] } for every vertex reached from a
+        source with a route (an empty list for the destiny).
+    order (list):
+        The vertices reached, each one before its next hops.
+    """
+
+    successors = {destiny: []}
+    postorder = []
+
+    for source in sources:
+        if source in successors or math.isinf(vertex_map[source].path_cost(destiny)):
+            continue
+
+        successors[source] = vertex_map[source].next_hops(destiny)
+        stack = [(source, 0)]
+
+        while stack:
+            vertex, i = stack[-1]
+            nexts = successors[vertex]
+
+            if i < len(nexts):
+                stack[-1] = (vertex, i + 1)
+                nxt = nexts[i]
+                if nxt not in successors:
+                    successors[nxt] = vertex_map[nxt].next_hops(destiny)
+                    stack.append((nxt, 0))
+            else:
+                stack.pop()
+                postorder.append(vertex)
+
+    postorder.reverse()
+
+    return successors, postorder
+
+
+def _capacities(graph, vertex_map, edges):
+    """
+    Returns the transmission rate of the link of each directed edge (None
+    for links without one, like the ones inside a router).
+    """
+
+    links_of = {}
+    capacities = []
+
+    for source, target in edges:
+        links = links_of.get(source)
+        if links is None:
+            if hasattr(graph, "neighbors"):
+                connections = graph.neighbors(source)
+            else:
+                connections = [(adj_vertex.identifier, link) for adj_vertex, link in graph.links.get(vertex_map[source], [])]
+            links = links_of[source] = dict(connections)
+
+        rate = links[target].transmissionRate
+        capacities.append(rate if rate else None)
+
+    return capacities
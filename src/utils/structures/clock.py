@@ -0,0 +1,57 @@
+import time
+
+class RealClock:
+    """
+    The wall clock: waits really take their time.
+
+    Methods:
+    --------
+        now() -> float:
+            Returns the current time, in seconds.
+        sleep(seconds: float):
+            Waits for some time.
+        async_sleep(seconds: float):
+            Waits for some time without blocking the event loop.
+    """
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def async_sleep(self, seconds):
+        import asyncio  # Already loaded by the running event loop.
+        await asyncio.sleep(max(seconds, 0))
+
+
+class VirtualClock:
+    """
+    A simulated clock: waits return at once and only move the clock forward,
+    so scripted sessions run at CPU speed while the times shown by the
+    commands stay the same.
+
+    Attributes:
+    -----------
+        time (float):
+            The current simulated time, in seconds.
+    """
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.time += seconds
+
+    async def async_sleep(self, seconds):
+        import asyncio
+        self.sleep(seconds)
+        await asyncio.sleep(0)  # Still lets the other tasks run.
+
+
+REAL_CLOCK = RealClock()
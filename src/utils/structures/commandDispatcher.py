@@ -0,0 +1,340 @@
+from utils.structures.terminal import ping_lines, traceroute_lines
+from utils.structures.instrumentation import INSTRUMENTATION, routing_table_bytes
+import os
+
+UNKNOWN_COMMAND = "The provided comand is not recognized."
+USAGE = 'Try: "ping <destiny>", "traceroute <destiny>", "clear", "changenetwork <fiber or coaxial>", "changeto <new host>", "flow <destiny> <rate>" or "stats"\n'
+STATS_USAGE = 'Try: "stats", "stats on", "stats off", "stats reset", "stats profile <command>" or "stats memory <command>"\n'
+PROFILE_ROWS = 15  # Lines of the reports of "stats profile" and "stats memory".
+CLEAR_SCREEN = "\033[2J\033[H"  # ANSI sequence that clears the screen and moves the cursor home.
+
+class CommandDispatcher:
+    """
+    Parses and runs the terminal commands (`ping`, `traceroute`, `clear`,
+    `changeto`, `changenetwork`, `flow` and `stats`) of any number of
+    terminals over one network.
+
+    Running a command (`execute`) only computes its result; showing it
+    (`render`) is left to the caller, so the same commands serve the
+    interactive loop and the sessions of `TerminalServer`. The dispatcher
+    never changes the graph or the routing tables by itself: `changenetwork`
+    is only available with a `change_network` callback.
+
+    Attributes:
+    -----------
+        graph (Graph):
+            The network.
+        vertex_map (dict):
+            A dictionary mapping identifiers to `Vertex` objects.
+        routers (set):
+            The identifiers of the routers, which can not be traced to.
+        change_network (callable):
+            Called with the name of the medium by `changenetwork` (optional).
+        simulator (EventSimulator):
+            The simulation pings are sent through (optional, see `Terminal.ping`).
+            `flow` adds background traffic to it.
+        profile_dir (str):
+            Where `stats profile` and `stats memory` save their cProfile and
+            tracemalloc snapshots (optional; without it they only show them).
+        control_instrumentation (bool):
+            Whether `stats on`, `stats off` and `stats reset` are available.
+            The instrumentation is shared by the whole process, so a server
+            turns them off for its sessions.
+
+    The `stats` command shows the counters and phase timers of
+    `INSTRUMENTATION` and the memory of the routing tables. `stats on`,
+    `stats off` and `stats reset` control the instrumentation, and
+    `stats profile <command>` and `stats memory <command>` run a command
+    under cProfile or tracemalloc.
+    """
+
+    def __init__(self, graph, vertex_map, routers=(), change_network=None, simulator=None, profile_dir=None):
+        self.graph = graph
+        self.vertex_map = vertex_map
+        self.routers = set(routers)
+        self.change_network = change_network
+        self.simulator = simulator
+        self.profile_dir = profile_dir
+        self.control_instrumentation = True
+        self._snapshots = 0
+
+        self._handlers = {
+            "ping": self._ping,
+            "traceroute": self._traceroute,
+            "clear": self._clear,
+            "changeto": self._changeto,
+            "changenetwork": self._changenetwork,
+            "flow": self._flow,
+            "stats": self._stats,
+        }
+
+    def execute(self, terminal, line) -> dict:
+        """
+        Runs one command line on a terminal.
+
+        Parameters:
+        -----------
+            terminal (Terminal):
+                The terminal (session) that runs the command; `changeto`
+                changes its current vertex.
+            line (str):
+                The command line, e.g. "ping 172.16.10.2".
+
+        Returns:
+        --------
+        result (dict):
+            `command` (the first word, None for an empty line), `ok` and, on
+            failure, `error` (the message to show). On success, `ping` adds
+            the keys of `Terminal.ping_result`, `traceroute` the ones of
+            `Terminal.traceroute_result`, `changeto` the `host` and
+            `changenetwork` the `medium` and `flow` the `source`, `destiny`
+            and `rate`.
+        """
+
+        words = line.split()
+
+        if not words:
+            return {"command": None, "ok": True}
+
+        command, arguments = words[0], words[1:]
+        handler = self._handlers.get(command)
+
+        if handler is None or (command not in ("clear", "stats") and not arguments):
+            return {"command": command, "ok": False, "error": f"{UNKNOWN_COMMAND}\n{USAGE}"}
+
+        if INSTRUMENTATION.enabled and command != "stats":
+            with INSTRUMENTATION.phase(f"command {command}"):
+                return {"command": command, **handler(terminal, arguments)}
+
+        return {"command": command, **handler(terminal, arguments)}
+
+    def _ping(self, terminal, arguments):
+        if arguments[0] not in self.vertex_map:
+            return {"ok": False, "error": "The provided destiny dont exists in the network.\n"}
+
+        return {"ok": True, **terminal.ping_result(arguments[0], self.vertex_map, self.simulator)}
+
+    def _traceroute(self, terminal, arguments):
+        if arguments[0] not in self.vertex_map:
+            return {"ok": False, "error": "The provided destiny dont exists in the network.\n"}
+        if arguments[0] in self.routers:
+            return {"ok": False, "error": "\nIt is not possible to trace the route to a router.\n"}
+
+        return {"ok": True, **terminal.traceroute_result(arguments[0], self.vertex_map)}
+
+    def _clear(self, terminal, arguments):
+        return {"ok": True}
+
+    def _changeto(self, terminal, arguments):
+        if arguments[0] not in self.vertex_map:
+            return {"ok": False, "error": "The provided new host dont exists in the network.\n"}
+
+        terminal.navigate_to(new_vertex=arguments[0])
+        return {"ok": True, "host": arguments[0]}
+
+    def _changenetwork(self, terminal, arguments):
+        if arguments[0] not in ("fiber", "coaxial"):
+            return {"ok": False, "error": "The provided type of network is not available.\n"}
+        if self.change_network is None:
+            return {"ok": False, "error": "The type of network can not be changed in this terminal.\n"}
+
+        self.change_network(arguments[0])
+        if self.simulator is not None:
+            self.simulator.reset_routes()  # The routing tables were rebuilt.
+
+        return {"ok": True, "medium": arguments[0]}
+
+    def _flow(self, terminal, arguments):
+        if self.simulator is None:
+            return {"ok": False, "error": "Background traffic is only available in the simulation (--simulate).\n"}
+        if len(arguments) != 2:
+            return {"ok": False, "error": f"{UNKNOWN_COMMAND}\n{USAGE}"}
+        if arguments[0] not in self.vertex_map:
+            return {"ok": False, "error": "The provided destiny dont exists in the network.\n"}
+
+        try:
+            rate = float(arguments[1])
+        except ValueError:
+            rate = 0
+        if not 0 < rate < float("inf"):
+            return {"ok": False, "error": "The rate of a flow must be a positive number of bits per second.\n"}
+
+        self.simulator.add_flow(terminal.current_vertex, arguments[0], rate)
+        return {"ok": True, "source": terminal.current_vertex, "destiny": arguments[0], "rate": rate}
+
+    def _stats(self, terminal, arguments):
+        if not arguments:
+            return {"ok": True, **INSTRUMENTATION.report(), "routing_table_bytes": routing_table_bytes(self.graph, self.vertex_map)}
+
+        action = arguments[0]
+
+        if action in ("on", "off", "reset") and len(arguments) == 1:
+            if not self.control_instrumentation:
+                return {"ok": False, "error": "The instrumentation can not be changed in this terminal.\n"}
+
+            {"on": INSTRUMENTATION.enable, "off": INSTRUMENTATION.disable, "reset": INSTRUMENTATION.reset}[action]()
+            return {"ok": True, "action": action}
+
+        if action in ("profile", "memory") and len(arguments) > 1:
+            run = self._profile if action == "profile" else self._trace_memory
+            return run(terminal, " ".join(arguments[1:]))
+
+        return {"ok": False, "error": f"The provided stats option is not recognized.\n{STATS_USAGE}"}
+
+    def _profile(self, terminal, line):
+        """
+        Runs a command under cProfile; returns its result and the functions
+        with the largest cumulative time.
+        """
+
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = self.execute(terminal, line)
+        finally:
+            profiler.disable()
+
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_ROWS]
+        profile = [
+            {"function": pstats.func_std_string(function), "calls": calls, "total": total, "cumulative": cumulative}
+            for function, (_, calls, total, cumulative, _) in rows
+        ]
+
+        return {"ok": True, "action": "profile", "result": result, "profile": profile, "file": self._snapshot_path("prof", stats.dump_stats)}
+
+    def _trace_memory(self, terminal, line):
+        """
+        Runs a command under tracemalloc; returns its result, the peak of
+        memory allocated while it ran and the lines that allocated the most.
+        """
+
+        import tracemalloc
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+
+        try:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+
+            result = self.execute(terminal, line)
+
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        exclude = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        before, after = before.filter_traces(exclude), after.filter_traces(exclude)
+
+        allocations = [
+            {"line": str(stat.traceback[0]), "bytes": stat.size_diff, "blocks": stat.count_diff}
+            for stat in after.compare_to(before, "lineno")[:PROFILE_ROWS]
+        ]
+
+        return {"ok": True, "action": "memory", "result": result, "peak_bytes": peak - start, "allocations": allocations, "file": self._snapshot_path("snapshot", after.dump)}
+
+    def _snapshot_path(self, extension, dump):
+        """
+        Saves a snapshot with 'dump' in `profile_dir` and returns its path
+        (None without `profile_dir`).
+        """
+
+        if self.profile_dir is None:
+            return None
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self._snapshots += 1
+        path = os.path.join(self.profile_dir, f"stats-{os.getpid()}-{self._snapshots}.{extension}")
+        dump(path)
+
+        return path
+
+    def failure(self, line, error) -> dict:
+        """
+        The result of a command line whose command raised 'error', in the
+        format of `execute` (`ok` is False), so the caller reports it like
+        any other failed command and goes on with the next one.
+        """
+
+        words = line.split()
+
+        return {"command": words[0] if words else None, "ok": False, "error": f"{str(error) or type(error).__name__}\n"}
+
+    def render(self, result) -> list:
+        """
+        Formats the result of `execute` as the terminal shows it.
+
+        Returns:
+        --------
+            list: (delay, line) pairs (see `ping_lines`). `clear` and
+            `changeto` give the `CLEAR_SCREEN` sequence as their line, which
+            is written without a line break.
+        """
+
+        if not result["ok"]:
+            return [(0, result["error"])]
+
+        command = result["command"]
+
+        if command == "ping":
+            return ping_lines(result)
+        if command == "traceroute":
+            return traceroute_lines(result)
+        if command in ("clear", "changeto"):
+            return [(0, CLEAR_SCREEN)]
+        if command == "changenetwork":
+            return [(0, CLEAR_SCREEN), (0, "New type of network defined!"), (2, CLEAR_SCREEN)]
+        if command == "flow":
+            return [(0, f"Sending {result['rate']:,.0f} bps from {result['source']} to {result['destiny']} in the background.\n")]
+        if command == "stats":
+            return self._render_stats(result)
+
+        return []
+
+    def _render_stats(self, result):
+        """
+        Formats the results of `stats`.
+        """
+
+        if "action" not in result:
+            lines = [f"\nInstrumentation: {'on' if result['enabled'] else 'off'}"]
+
+            if result["counters"]:
+                lines.append("Counters:")
+                lines.extend(f"    {name:<34}{value:>14,}" for name, value in sorted(result["counters"].items()))
+
+            if result["phases"]:
+                lines.append("Phases:")
+                lines.extend(
+                    f"    {name:<34}{phase['calls']:>8} calls {phase['seconds'] * 1000:>12.2f} ms"
+                    for name, phase in sorted(result["phases"].items(), key=lambda item: -item[1]["seconds"])
+                )
+
+            lines.append(f"Routing tables: {result['routing_table_bytes'] / 1024:,.1f} KiB ({len(self.vertex_map)} vertices)\n")
+            return [(0, line) for line in lines]
+
+        if result["action"] in ("on", "off", "reset"):
+            return [(0, f"Instrumentation {'reset' if result['action'] == 'reset' else 'turned ' + result['action']}.\n")]
+
+        lines = self.render(result["result"])
+
+        if result["action"] == "profile":
+            lines.append((0, f"{'calls':>10}{'total (ms)':>12}{'cum. (ms)':>12}  function"))
+            lines.extend((0, f"{row['calls']:>10}{row['total'] * 1000:>12.2f}{row['cumulative'] * 1000:>12.2f}  {row['function']}") for row in result["profile"])
+        else:
+            lines.append((0, f"Peak: {result['peak_bytes'] / 1024:,.1f} KiB"))
+            lines.extend((0, f"{row['bytes'] / 1024:>10.1f} KiB {row['blocks']:>8} blocks  {row['line']}") for row in result["allocations"])
+
+        if result["file"] is not None:
+            lines.append((0, f"Saved to {result['file']}"))
+        lines.append((0, ""))
+
+        return lines
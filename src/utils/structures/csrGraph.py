@@ -0,0 +1,398 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS, shortest_path_tree_csr
+from utils.functions.parallelRouting import compact_routes, construct_routings_tables_parallel
+from utils.structures.routingTable import CompactRouteStore
+from utils.structures.instrumentation import INSTRUMENTATION
+from utils.structures.link import MEDIUM_SPEEDS, Link
+from array import array
+from bisect import bisect_left
+
+class CSRGraph:
+    """
+    Compact, array-backed alternative to `Graph` using a compressed sparse
+    row (CSR) layout.
+
+    Every vertex receives an integer id (its position in `vertices`). The
+    edges of vertex `u` are stored in the positions `offsets[u]:offsets[u + 1]`
+    of the `neighbors` buffer, sorted by neighbour id, so `is_linked` is a
+    binary search instead of a scan of the adjacency list. The distance,
+    transmission rate and propagation speed of every edge are kept in
+    parallel buffers, with no `Link` object per edge: `neighbors` rebuilds
+    the links when they are asked for.
+
+    New links are appended to pending buffers and merged into the CSR
+    buffers the next time the graph is read, so building a topology link by
+    link stays linear.
+
+    Attributes:
+    -----------
+        vertices (list):
+            The identifiers of the vertices; the position is the vertex id.
+        medium (str):
+            The type of network of the links (`"fiber"` or `"coaxial"`).
+        routing_mode (str):
+            The default mode of `construct_routings_tables`.
+        routing_workers (int):
+            The number of processes used in `"parallel"` mode.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty CSR graph.
+        """
+
+        self.vertices = []
+        self.medium = None
+        self.routing_mode = "tree"
+        self.routing_workers = None
+
+        self._index = {}
+
+        self._offsets = array('q', [0])
+        self._neighbors = array('i')
+        self._distances = array('d')
+        self._rates = array('d')
+        self._speeds = array('d')
+
+        self._pending_sources = array('i')
+        self._pending_targets = array('i')
+        self._pending_distances = array('d')
+        self._pending_rates = array('d')
+        self._pending_speeds = array('d')
+
+        self._compiled_weights = {}
+
+    def add_vertex(self, identifier):
+        """
+        Registers a vertex identifier and returns its integer id.
+        """
+
+        vertex_id = self._index.get(identifier)
+        if vertex_id is None:
+            vertex_id = self._index[identifier] = len(self.vertices)
+            self.vertices.append(identifier)
+        return vertex_id
+
+    def vertex_id(self, identifier):
+        """
+        Returns the integer id of a vertex identifier.
+        """
+
+        return self._index[identifier]
+
+    def link_vertices(self, vertex1, vertex2, link):
+        """
+        Links two vertices together through a shared link.
+        OBS: The connections are bidirectional. Linking two vertices that
+        are already linked replaces their link. Only the properties of the
+        link are stored, not the `Link` object.
+
+        Parameters:
+        -----------
+            vertex1:
+                The first vertex to be linked.
+            vertex2:
+                The second vertex to be linked.
+            link:
+                The link that connects the two vertices.
+        """
+
+        self.add_link(vertex1.identifier, vertex2.identifier, link.distance, link.transmissionRate, link.SPEED)
+
+    def add_link(self, identifier1, identifier2, distance, transmissionRate, SPEED):
+        """
+        Links two vertices, given by their identifiers, with a link of the
+        given properties, without creating a `Link` (see `link_vertices`).
+
+        Parameters:
+        -----------
+            identifier1, identifier2:
+                The identifiers of the vertices to be linked.
+            distance (float):
+                The length of the link in meters.
+            transmissionRate (float):
+                The transmission rate of the link in bits per second.
+            SPEED (float):
+                The propagation speed of the link in meters per second (see
+                `MEDIUM_SPEEDS`).
+        """
+
+        self._pending_sources.append(self.add_vertex(identifier1))
+        self._pending_targets.append(self.add_vertex(identifier2))
+        self._pending_distances.append(distance)
+        self._pending_rates.append(transmissionRate)
+        self._pending_speeds.append(SPEED)
+        self._compiled_weights.clear()
+
+    def is_linked(self, vertex1, vertex2) -> bool:
+        """
+        Checks if two vertices are already linked.
+
+        Returns:
+            bool: True if vertices are already linked, False if not.
+        """
+
+        if vertex1.identifier not in self._index or vertex2.identifier not in self._index:
+            return False
+
+        return self._find_edge(self._index[vertex1.identifier], self._index[vertex2.identifier]) >= 0
+
+    def neighbors(self, identifier):
+        """
+        Returns the (linked vertex identifier, link) pairs of a vertex.
+        """
+
+        self._build()
+        u = self._index[identifier]
+
+        return [(self.vertices[self._neighbors[e]], self._link(e)) for e in range(self._offsets[u], self._offsets[u + 1])]
+
+    def csr(self):
+        """
+        Returns the CSR buffers of the graph.
+
+        Returns:
+        --------
+            offsets (array): Start of the edges of each vertex (length N + 1).
+            neighbors (array): The vertex at the other end of each edge.
+            edge_links (range): The index of the link properties of each edge
+                (every edge keeps its own properties).
+        """
+
+        self._build()
+        return self._offsets, self._neighbors, range(len(self._neighbors))
+
+    def set_medium(self, SPEED):
+        """
+        Changes the type of network of every link of the graph in place.
+        The routing tables must be constructed again afterwards.
+
+        Parameters:
+        -----------
+            SPEED (str):
+                The new type of network (`"fiber"` or `"coaxial"`).
+        """
+
+        if SPEED not in MEDIUM_SPEEDS:
+            raise ValueError(f"Type of network not recognized: {SPEED}")
+
+        self._build()
+        self._speeds = array('d', [MEDIUM_SPEEDS[SPEED]]) * len(self._neighbors)
+
+        self.medium = SPEED
+        self._compiled_weights.clear()
+
+    def edge_weights(self, packet_size_bits):
+        """
+        Returns the delay of every edge, aligned with the `neighbors` buffer,
+        computed once per packet size and medium (and once per distinct link).
+        """
+
+        key = (packet_size_bits, self.medium)
+        weights = self._compiled_weights.get(key)
+
+        if weights is None:
+            self._build()
+            delays = {}
+            weights = array('d')
+
+            for e in range(len(self._neighbors)):
+                parameters = (self._distances[e], self._rates[e], self._speeds[e])
+                delay = delays.get(parameters)
+                if delay is None:
+                    delay = delays[parameters] = self._link(e).calculate_delay(packet_size_bits)
+                weights.append(delay)
+
+            self._compiled_weights[key] = weights
+
+        return weights
+
+    @INSTRUMENTATION.timed("construct_routings_tables")
+    def construct_routings_tables(self, vertex_map, mode=None):
+        """
+        Builds the routing table for each vertex in the graph, running one
+        Dijkstra per source over the CSR buffers.
+
+        The routing tables have the same format of `Graph`. Between paths of
+        equal cost, the first one found is kept, as in `Graph` (here the
+        neighbours of each vertex are scanned by id).
+
+        Parameters:
+        -----------
+            vertex_map (dict):
+                A dictionary mapping identifiers to `Vertex` objects.
+            mode (str):
+                `"tree"`, or `"parallel"` to shard the sources across
+                `routing_workers` processes and store compact tables (see
+                `construct_routings_tables_parallel`). When not provided,
+                `routing_mode` is used.
+
+        Returns:
+        --------
+            None
+        """
+
+        if mode is None:
+            mode = self.routing_mode
+
+        if mode == "parallel":
+            construct_routings_tables_parallel(self, vertex_map, self.routing_workers)
+            return
+
+        if mode != "tree":
+            raise ValueError(f"Routing mode not supported by the CSR backend: {mode}")
+
+        offsets, neighbors, _ = self.csr()
+        weights = self.edge_weights(PACKET_SIZE_BITS)
+
+        for source, identifier in enumerate(self.vertices):
+            dist, prev, _ = shortest_path_tree_csr(offsets, neighbors, weights, source)
+            routing_table = vertex_map[identifier].routing_table = {}  # The parallel mode tables are read-only.
+
+            for destiny, destiny_identifier in enumerate(self.vertices):
+                routing_table[destiny_identifier] = self._path_from_tree(source, destiny, dist, prev)
+
+    def route_store(self, vertex_map=None):
+        """
+        Computes the routes of every vertex in a new `CompactRouteStore`
+        (the tables of the `"parallel"` mode, in this process), without
+        changing the routing tables of the vertices.
+
+        Returns:
+        --------
+            CompactRouteStore: The routes, in the order of `vertices`.
+        """
+
+        offsets, neighbors, _ = self.csr()
+        weights = self.edge_weights(PACKET_SIZE_BITS)
+        store = CompactRouteStore(self.vertices)
+
+        for source in range(len(self.vertices)):
+            store.next_hops[source], store.hop_costs[source], store.path_costs[source] = compact_routes(offsets, neighbors, weights, source)
+
+        return store
+
+    def print_graph(self):
+        """
+        Prints the graph structure in a readable format.
+        """
+
+        print("\nGraph Structure:")
+
+        for identifier in self.vertices:
+            connections = self.neighbors(identifier)
+            if not connections:
+                continue
+
+            print(f"{identifier} ->")
+
+            for adj_identifier, link in connections:
+                distance = link.distance
+                rate = link.transmissionRate
+                print(f"    - Connected to: {adj_identifier}, Distance: {distance}m, Rate: {rate}bps")
+
+        print()
+
+    def _link(self, e):
+        """
+        Rebuilds the `Link` of an edge from its properties.
+        """
+
+        link = Link(distance=self._distances[e], transmissionRate=self._rates[e])
+        link.SPEED = self._speeds[e]
+        return link
+
+    def _path_from_tree(self, source, destiny, dist, prev):
+        """
+        Rebuilds the route from 'source' to 'destiny' in the routing table format.
+        """
+
+        if prev[destiny] == -1 and destiny != source:
+            return []
+
+        path = []
+        cur = destiny
+        while cur != -1:
+            path.append((self.vertices[cur], dist[cur]))
+            cur = prev[cur]
+        path.reverse()
+
+        return path
+
+    def _find_edge(self, u, v):
+        """
+        Returns the position of the edge u->v in the CSR buffers, or -1.
+        """
+
+        self._build()
+        start, end = self._offsets[u], self._offsets[u + 1]
+        e = bisect_left(self._neighbors, v, start, end)
+
+        if e < end and self._neighbors[e] == v:
+            return e
+        return -1
+
+    def _build(self):
+        """
+        Merges the pending links into the CSR buffers.
+
+        The existing and the pending edges are ordered by (source, neighbour)
+        with a stable sort, so when the same pair was linked more than once
+        only the latest link is kept.
+        """
+
+        if not self._pending_sources and len(self._offsets) == len(self.vertices) + 1:
+            return
+
+        existing = len(self._neighbors)
+        pending = len(self._pending_sources)
+
+        sources = array('i')
+        for u in range(len(self._offsets) - 1):
+            sources.extend([u] * (self._offsets[u + 1] - self._offsets[u]))
+        targets = self._neighbors
+        properties = (self._distances, self._rates, self._speeds)
+
+        sources.extend(self._pending_sources)
+        sources.extend(self._pending_targets)
+        targets.extend(self._pending_targets)
+        targets.extend(self._pending_sources)
+        for buffer, added in zip(properties, (self._pending_distances, self._pending_rates, self._pending_speeds)):
+            buffer.extend(added)
+            buffer.extend(added)
+
+        # Edges already in the CSR buffers rank first, pending ones by the
+        # order `link_vertices` was called (in both directions).
+        def rank(e):
+            if e < existing:
+                return 0
+            return (e - existing) % pending + 1
+
+        n = len(self.vertices)
+        order = sorted(range(len(sources)), key=lambda e: ((sources[e] * n + targets[e]), rank(e)))
+
+        offsets = array('q', [0]) * (n + 1)
+        neighbors = array('i')
+        distances, rates, speeds = array('d'), array('d'), array('d')
+
+        for position, e in enumerate(order):
+            if position + 1 < len(order):
+                following = order[position + 1]
+                if sources[following] == sources[e] and targets[following] == targets[e]:
+                    continue
+
+            neighbors.append(targets[e])
+            distances.append(properties[0][e])
+            rates.append(properties[1][e])
+            speeds.append(properties[2][e])
+            offsets[sources[e] + 1] += 1
+
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+
+        self._offsets, self._neighbors = offsets, neighbors
+        self._distances, self._rates, self._speeds = distances, rates, speeds
+        self._pending_sources = array('i')
+        self._pending_targets = array('i')
+        self._pending_distances = array('d')
+        self._pending_rates = array('d')
+        self._pending_speeds = array('d')
@@ -0,0 +1,283 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS
+from heapq import heappush, heappop
+from itertools import count as counter
+import math
+import random
+
+# Kinds of event.
+_ARRIVAL = 0   # A packet reaches a vertex.
+_GENERATE = 1  # A background flow emits its next packet.
+
+# Kinds of packet.
+_DATA = 0
+_ECHO_REQUEST = 1
+_ECHO_REPLY = 2
+
+class EventSimulator:
+    """
+    Discrete-event, packet-level simulation of the network.
+
+    Packets are forwarded hop by hop with the routing tables of the vertices.
+    Every directed link is a FIFO queue: a packet starts its transmission
+    when the link finishes the previous one, takes
+    `Link.calculate_transmission_delay(size)` to be serialized and
+    `Link.calculate_propagation_delay()` to reach the other end. The queue of
+    a link is represented only by the time at which it becomes idle, so
+    each hop costs a single event.
+
+    Attributes:
+    -----------
+        now (float):
+            The current simulation time, in seconds.
+        events (int):
+            The number of events processed so far.
+        delivered (int):
+            The number of data packets that reached their destiny.
+        dropped (int):
+            The number of packets lost (full buffers or no route).
+        buffer_bits (float):
+            The capacity of the queue of each link, in bits (None for
+            unbounded queues). A packet that does not fit is dropped.
+    """
+
+    def __init__(self, graph, vertex_map, buffer_bits=None, rng=None):
+        """
+        Initializes the simulator over a graph whose routing tables are built.
+
+        Parameters:
+        -----------
+            graph (Graph):
+                A `Graph` or `CSRGraph`.
+            vertex_map (dict):
+                A dictionary mapping identifiers to `Vertex` objects.
+            buffer_bits (float):
+                The capacity of the queue of each link (default: unbounded).
+            rng (random.Random):
+                The random generator of Poisson flows (default: `random`).
+        """
+
+        self.graph = graph
+        self.vertex_map = vertex_map
+        self.buffer_bits = buffer_bits
+        self.rng = rng or random
+
+        self.now = 0.0
+        self.events = 0
+        self.delivered = 0
+        self.dropped = 0
+
+        self._queue = []
+        self._sequence = counter()
+        self._next_hops = {}
+        self._link_states = {}
+        self._medium = graph.medium
+
+    def add_flow(self, source, destiny, rate, packet_size_bits=12000, start=None, stop=None, poisson=False):
+        """
+        Adds background traffic: 'source' sends packets to 'destiny' at
+        'rate' bits per second.
+
+        Parameters:
+        -----------
+            source, destiny (str):
+                The identifiers of the ends of the flow.
+            rate (float):
+                The average rate of the flow, in bits per second.
+            packet_size_bits (int):
+                The size of each packet (default: 1500 bytes).
+            start (float):
+                When the first packet is sent (default: now).
+            stop (float):
+                When the flow stops (default: never).
+            poisson (bool):
+                If True, packets are sent as a Poisson process instead of at
+                a constant interval.
+        """
+
+        if rate <= 0:
+            raise ValueError("The rate of a flow must be positive")
+
+        flow = (source, destiny, packet_size_bits / rate, packet_size_bits, stop, poisson)
+        self._schedule(self.now if start is None else start, _GENERATE, flow)
+
+    def ping(self, source, destiny, count=4, interval=1.0, timeout=2.0, packet_size_bits=PACKET_SIZE_BITS) -> dict:
+        """
+        Sends 'count' echo requests from 'source' to 'destiny', one every
+        'interval' seconds starting now, and runs the simulation until every
+        reply arrives or times out.
+
+        Returns:
+        --------
+        result (dict):
+            The same keys as a `batch_ping` result (`source`, `destiny`,
+            `reachable`, `times`, `min`, `avg`, `max`, `mdev`, in ms), plus
+            `replies`, the time of each request (None if it got no reply).
+        """
+
+        start = self.now
+        echoes = []
+
+        for sequence in range(count):
+            echo = [None]
+            echoes.append(echo)
+            packet = [source, destiny, packet_size_bits, start + sequence * interval, _ECHO_REQUEST, echo]
+            self._schedule(start + sequence * interval, _ARRIVAL, (source, packet))
+
+        self.run(until=start + (count - 1) * interval + timeout)
+
+        replies = [None if echo[0] is None else echo[0] * 1000 for echo in echoes]
+        times = [t for t in replies if t is not None]
+        result = {"source": source, "destiny": destiny, "reachable": bool(times), "times": times, "replies": replies}
+
+        if times:
+            average = sum(times) / len(times)
+            result["min"] = min(times)
+            result["avg"] = average
+            result["max"] = max(times)
+            result["mdev"] = (sum((t - average) ** 2 for t in times) / len(times)) ** 0.5
+        else:
+            result["min"] = result["avg"] = result["max"] = result["mdev"] = None
+
+        return result
+
+    def run(self, until=None) -> int:
+        """
+        Processes the events in time order until there are none left or the
+        next one happens after 'until' (seconds). The clock is then advanced
+        to 'until'.
+
+        Returns:
+        --------
+            int: The number of events processed.
+        """
+
+        if self.graph.medium != self._medium:
+            # Propagation delays (and maybe the routes) changed.
+            self._medium = self.graph.medium
+            self.reset_routes()
+
+        queue = self._queue
+        sequence = self._sequence
+        next_hops = self._next_hops
+        buffer_bits = self.buffer_bits
+        processed = 0
+
+        while queue and (until is None or queue[0][0] <= until):
+            now, _, kind, payload = heappop(queue)
+            processed += 1
+
+            if kind == _GENERATE:
+                source, destiny, period, size, stop, poisson = payload
+                if stop is not None and now >= stop:
+                    continue
+
+                heappush(queue, (now, next(sequence), _ARRIVAL, (source, [source, destiny, size, now, _DATA, None])))
+
+                gap = self.rng.expovariate(1 / period) if poisson else period
+                heappush(queue, (now + gap, next(sequence), _GENERATE, payload))
+                continue
+
+            vertex, packet = payload
+            destiny = packet[1]
+
+            if vertex == destiny:
+                self._deliver(now, packet)
+                continue
+
+            key = (vertex, destiny)
+            nxt = next_hops.get(key)
+            if nxt is None:
+                nxt = next_hops[key] = self._route(vertex, destiny)
+            if nxt is False:
+                self.dropped += 1
+                continue
+
+            state = self._link_states.get((vertex, nxt))
+            if state is None:
+                state = self._link_state(vertex, nxt)
+
+            size = packet[2]
+            transmission = state[2].get(size)
+            if transmission is None:
+                transmission = state[2][size] = state[3].calculate_transmission_delay(size)
+
+            busy_until = state[0]
+            if busy_until < now:
+                busy_until = now
+            if buffer_bits is not None and (busy_until - now) * state[3].transmissionRate + size > buffer_bits:
+                self.dropped += 1
+                continue
+
+            state[0] = busy_until + transmission
+
+            heappush(queue, (state[0] + state[1], next(sequence), _ARRIVAL, (nxt, packet)))
+
+        self.events += processed
+        if until is not None and until > self.now:
+            self.now = until
+        elif processed:
+            self.now = max(self.now, now)
+
+        return processed
+
+    def reset_routes(self):
+        """
+        Forgets the cached next hops and link parameters. Call it after
+        changing the topology or rebuilding the routing tables.
+        """
+
+        self._next_hops.clear()
+        self._link_states.clear()
+
+    def _schedule(self, time, kind, payload):
+        """
+        Pushes an event to the queue.
+        """
+
+        heappush(self._queue, (time, next(self._sequence), kind, payload))
+
+    def _deliver(self, now, packet):
+        """
+        Handles a packet that reached its destiny: echo requests are answered
+        and echo replies record their round trip time.
+        """
+
+        source, destiny, size, sent, kind, echo = packet
+
+        if kind == _ECHO_REQUEST:
+            reply = [destiny, source, size, sent, _ECHO_REPLY, echo]
+            self._schedule(now, _ARRIVAL, (destiny, reply))
+        elif kind == _ECHO_REPLY:
+            echo[0] = now - sent
+        else:
+            self.delivered += 1
+
+    def _route(self, vertex, destiny):
+        """
+        Returns the next hop from 'vertex' to 'destiny', or False if there is
+        no route.
+        """
+
+        table_owner = self.vertex_map[vertex]
+        if math.isinf(table_owner.path_cost(destiny)):
+            return False
+
+        return table_owner.next_hop(destiny)
+
+    def _link_state(self, vertex, adj_identifier):
+        """
+        Creates the state of the directed link 'vertex' -> 'adj_identifier':
+        [idle at (s), propagation delay (s), {size: transmission delay}, link].
+        """
+
+        if hasattr(self.graph, "neighbors"):
+            connections = self.graph.neighbors(vertex)
+        else:
+            connections = [(adj_vertex.identifier, link) for adj_vertex, link in self.graph.links.get(self.vertex_map[vertex], [])]
+
+        for identifier, link in connections:
+            if identifier == adj_identifier:
+                state = self._link_states[(vertex, adj_identifier)] = [0.0, link.calculate_propagation_delay(), {}, link]
+                return state
+
+        raise ValueError(f"{vertex} and {adj_identifier} are not linked")
@@ -0,0 +1,160 @@
+from array import array
+
+class ForwardingEngine:
+    """
+    Multibit trie of IPv4 prefixes for fast longest-prefix-match lookups on
+    addresses given as ints.
+
+    The 32 bits of an address are split in strides (16, 8, 8 by default);
+    each level of the trie is a table indexed by the bits of its stride. The
+    prefixes are expanded to the end of their stride when the engine is
+    built (a /20 fills 16 entries of a level-2 table), so a lookup is one
+    table access per level and stops at the first leaf, without comparing
+    prefix lengths.
+
+    Every table lives in one flat `array('i')`: a non-negative entry is the
+    index of a next hop in `next_hops`, and a negative one is the offset
+    (negated) of the table of the next level. Index 0 means "no route".
+
+    Attributes:
+    -----------
+        strides (tuple):
+            The number of bits of each level (they add up to 32).
+        next_hops (list):
+            The distinct next hops, `None` first.
+    """
+
+    def __init__(self, entries, strides=(16, 8, 8)):
+        """
+        Builds the engine.
+
+        Parameters:
+        -----------
+            entries (iterable):
+                (prefix as int, length, next hop) entries, as yielded by
+                `PrefixTrie.entries` or returned by `aggregate_routes`.
+                A prefix of length 0 is the default route.
+            strides (tuple):
+                The number of bits of each level of the trie.
+        """
+
+        if sum(strides) != 32 or any(stride <= 0 for stride in strides):
+            raise ValueError(f"Strides must be positive and add up to 32: {strides}")
+
+        self.strides = tuple(strides)
+        self.next_hops = [None]
+        self._indexes = {}
+
+        ends = []
+        end = 0
+        for stride in self.strides:
+            end += stride
+            ends.append(end)
+
+        self._levels = tuple((32 - end, (1 << stride) - 1) for end, stride in zip(ends, self.strides))
+        self._table = array('i', bytes(4 << self.strides[0]))
+
+        # Shorter prefixes first: a longer prefix only ever overwrites the
+        # expansion of a shorter one.
+        for prefix, length, next_hop in sorted(entries, key=lambda entry: entry[1]):
+            self._insert(prefix, length, self._index(next_hop), ends)
+
+    def _index(self, next_hop):
+        """
+        Returns the index of a next hop in `next_hops`, adding it if needed.
+        """
+
+        if next_hop is None:
+            return 0
+
+        index = self._indexes.get(next_hop)
+        if index is None:
+            index = self._indexes[next_hop] = len(self.next_hops)
+            self.next_hops.append(next_hop)
+
+        return index
+
+    def _insert(self, prefix, length, index, ends):
+        """
+        Writes a prefix in the tables, creating the tables of the levels it
+        reaches.
+        """
+
+        if not 0 <= length <= 32:
+            raise ValueError(f"Invalid prefix length: {length}")
+
+        table = self._table
+        offset = 0
+
+        for level, (shift, mask) in enumerate(self._levels):
+            slot = (prefix >> shift) & mask
+
+            if length <= ends[level]:
+                span = 1 << (ends[level] - length)
+                start = offset + (slot & ~(span - 1))
+                table[start:start + span] = array('i', [index]) * span
+                return
+
+            entry = table[offset + slot]
+            if entry >= 0:
+                child = len(table)
+                table.extend(array('i', [entry]) * (1 << self.strides[level + 1]))
+                table[offset + slot] = -child
+                entry = -child
+
+            offset = -entry
+
+    def lookup(self, address):
+        """
+        Returns the next hop of the longest prefix that contains 'address'
+        (an int), or None if no prefix does.
+        """
+
+        table = self._table
+        levels = self._levels
+
+        shift, _ = levels[0]
+        entry = table[address >> shift]
+        level = 1
+
+        while entry < 0:
+            shift, mask = levels[level]
+            entry = table[((address >> shift) & mask) - entry]
+            level += 1
+
+        return self.next_hops[entry]
+
+    def lookup_batch(self, addresses) -> list:
+        """
+        Returns the next hop of each address (ints) of 'addresses', like
+        `lookup`, without the cost of a method call per address.
+        """
+
+        table = self._table
+        next_hops = self.next_hops
+        first = self._levels[0][0]
+        deeper = self._levels[1:]
+
+        result = []
+        append = result.append
+
+        for address in addresses:
+            entry = table[address >> first]
+
+            if entry < 0:
+                for shift, mask in deeper:
+                    entry = table[((address >> shift) & mask) - entry]
+                    if entry >= 0:
+                        break
+
+            append(next_hops[entry])
+
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the tables, in bytes.
+        """
+
+        return len(self._table) * self._table.itemsize
@@ -1,5 +1,13 @@
-from utils.functions.adaptedDijkstra import dijkstra
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS, dijkstra, shortest_path_tree, path_from_tree, paths_from_tree
+from utils.functions.adaptedDijkstra import repair_tree_after_increase, repair_tree_after_decrease, reweight_tree, tree_order
+from utils.functions.adaptedDijkstra import shortest_path_dag, multipath_next_hops
+from utils.functions.floydWarshall import floyd_warshall
+from utils.functions.parallelRouting import construct_routings_tables_parallel
+from utils.structures.routingTable import MatrixRoutingTable, RouteCache, LazyRoutingTable
+from utils.structures.routingTable import CompactRouteStore, CompactRoutingTable
+from utils.structures.instrumentation import INSTRUMENTATION
 from collections import defaultdict
+import math
 
 class Graph:
     def __init__(self):
@@ -11,15 +19,50 @@ class Graph:
             links (dict): 
                 A dictionary storing vertices as keys and a list of tuples 
                 (linked vertex, link) as values.
+            vertices (list):
+                The identifiers of the vertices of the graph.
+            medium (str):
+                The type of network of the links (`"fiber"` or `"coaxial"`).
+            routing_mode (str):
+                The default mode of `construct_routings_tables`.
+            route_cache_size (int):
+                The number of sources whose routes are kept in `"lazy"` mode.
+            routing_workers (int):
+                The number of processes used in `"parallel"` mode (default:
+                the number of CPUs).
         """
 
         self.links = defaultdict(list)
         self.vertices = []
+        self.medium = None
+        self.routing_mode = "tree"
+        self.route_cache_size = 128
+        self.routing_workers = None
+        self._compiled_weights = {}
+        self._route_cache = None
+
+        # State of the last `construct_routings_tables`, used to repair the
+        # routes when the topology changes.
+        self._routed_map = None
+        self._routed_mode = None
+        self._routed_count = 0
+        self._trees = {}
+
+    def add_vertex(self, identifier):
+        """
+        Registers a vertex identifier in the graph.
+        """
+
+        self.vertices.append(identifier)
 
     def link_vertices(self, vertex1, vertex2, link):
         """
         Links two vertices together through a shared link.
-        OBS: The connections are bidirectional. 
+        OBS: The connections are bidirectional. Linking two vertices that
+        are already linked replaces their link.
+
+        If the routing tables were already built, only the routes affected
+        by the new link are recomputed (see `_repair_routes`).
 
         Parameters:
         -----------
@@ -31,13 +74,54 @@ class Graph:
                 The link that connects the two vertices.
         """
 
-        if self.is_linked(vertex1=vertex1, vertex2=vertex2):
-            self.links[vertex1].remove(vertex2) 
-            self.links[vertex2].remove(vertex1)
-        
+        old_link = self._remove_connection(vertex1, vertex2)
+
         self.links[vertex1].append((vertex2, link)) 
         self.links[vertex2].append((vertex1, link))            
 
+        self._update_compiled_weights(vertex1, vertex2, link)
+        self._repair_routes(vertex1, vertex2, old_link, link)
+
+    def unlink_vertices(self, vertex1, vertex2):
+        """
+        Removes the link between two vertices, recomputing only the routes
+        that used it.
+
+        Parameters:
+        -----------
+            vertex1: 
+                The first vertex of the link.
+            vertex2:
+                The second vertex of the link.
+        """
+
+        old_link = self._remove_connection(vertex1, vertex2)
+        if old_link is None:
+            raise ValueError(f"Vertices {vertex1.identifier} and {vertex2.identifier} are not linked")
+
+        self._update_compiled_weights(vertex1, vertex2, None)
+        self._repair_routes(vertex1, vertex2, old_link, None)
+
+    def update_link(self, vertex1, vertex2, link):
+        """
+        Replaces the link (and so the weight) between two linked vertices,
+        recomputing only the routes affected by the change.
+
+        Parameters:
+        -----------
+            vertex1: 
+                The first vertex of the link.
+            vertex2:
+                The second vertex of the link.
+            link: 
+                The new link that connects the two vertices.
+        """
+
+        if not self.is_linked(vertex1=vertex1, vertex2=vertex2):
+            raise ValueError(f"Vertices {vertex1.identifier} and {vertex2.identifier} are not linked")
+
+        self.link_vertices(vertex1, vertex2, link)
+
     def is_linked(self, vertex1, vertex2) -> bool:
         """
         Checks if two vertices are already linked.
@@ -53,7 +137,181 @@ class Graph:
         
         return False
     
-    def construct_routings_tables(self, vertex_map):
+    def install_route_store(self, store, vertex_map):
+        """
+        Uses an already computed `CompactRouteStore` (e.g. loaded from the
+        on-disk cache) as the routing tables of the graph, as if they had
+        been built in `"compact"` mode.
+
+        Parameters:
+        -----------
+            store (CompactRouteStore):
+                The routes of every vertex, in the order of `vertices`.
+            vertex_map (dict):
+                A dictionary mapping identifiers to `Vertex` objects.
+        """
+
+        self._routed_map = vertex_map
+        self._routed_mode = "compact"
+        self._routed_count = len(self.vertices)
+        self._trees = {}
+        self._route_cache = None
+
+        for i, identifier in enumerate(self.vertices):
+            vertex = vertex_map[identifier]
+            vertex.routing_table = CompactRoutingTable(store, i)
+            vertex.multipath_table = {}
+
+    @property
+    def routed_mode(self):
+        """
+        The mode of the routing tables the graph keeps up to date (None if
+        they were not built, or `set_medium` was told not to reroute). Only
+        in `"tree"` mode are the routes reused when the medium changes.
+        """
+
+        return self._routed_mode
+
+    def route_store(self, vertex_map):
+        """
+        Computes the routes of every vertex in a new `CompactRouteStore`
+        (the tables of the `"compact"` mode), without changing the routing
+        tables of the vertices. In `"tree"` mode the kept shortest-path
+        trees are used instead of searching again.
+
+        Parameters:
+        -----------
+            vertex_map (dict):
+                A dictionary mapping identifiers to `Vertex` objects.
+
+        Returns:
+        --------
+            CompactRouteStore: The routes, in the order of `vertices`.
+        """
+
+        _, edge_index = self.compile_weights(PACKET_SIZE_BITS)
+        store = CompactRouteStore(self.vertices)
+        trees = self._trees if self._routed_map is vertex_map else {}
+
+        for identifier in self.vertices:
+            vertex = vertex_map[identifier]
+
+            if vertex in trees:
+                dist, prev = trees[vertex]
+                order = tree_order(vertex, prev)
+            else:
+                dist, prev, order = shortest_path_tree(graph=self, start=vertex)
+
+            store.add_source(vertex, dist, prev, order, edge_index)
+
+        return store
+
+    def set_medium(self, SPEED, reroute=True):
+        """
+        Changes the type of network of every link of the graph in place,
+        without rebuilding the graph.
+
+        The routing trees built in `"tree"` mode are reused: their costs are
+        recomputed along the same tree edges, and a tree is only searched
+        again when the new weights make another path cheaper. Routing tables
+        built in other modes are rebuilt.
+
+        Parameters:
+        -----------
+            SPEED (str):
+                The new type of network (`"fiber"` or `"coaxial"`).
+            reroute (bool):
+                If False, only the links are changed and the caller is
+                responsible for the routing tables (e.g. loading them from
+                the on-disk cache): the graph forgets how they were built,
+                so they are no longer repaired.
+        """
+
+        links = {}
+        for connections in self.links.values():
+            for _, link in connections:
+                links[id(link)] = link
+
+        for link in links.values():
+            link.set_medium(SPEED)
+
+        self.medium = SPEED
+        self._compiled_weights.clear()
+
+        if not reroute:
+            self._routed_map = None
+            self._routed_mode = None
+            self._trees = {}
+
+        if self._routed_map is None:
+            return
+
+        if self._routed_mode == "lazy":
+            self._route_cache.clear()
+            return
+
+        if self._routed_mode != "tree":
+            self.construct_routings_tables(self._routed_map, self._routed_mode)
+            return
+
+        for source, (dist, prev) in list(self._trees.items()):
+            order = tree_order(source, prev)
+
+            if reweight_tree(self, source, dist, prev, order):
+                self._fill_routing_table(source, paths_from_tree(source, dist, prev, order))
+            else:
+                self._route_source(source)
+
+    def compile_weights(self, packet_size_bits):
+        """
+        Returns the compiled weight table of the graph for a packet size.
+
+        The delay of every link is computed once per packet size and medium
+        and cached until the topology changes, so the routing searches only
+        do dict/list lookups instead of calling `Link.calculate_delay` for
+        every relaxed edge.
+
+        Parameters:
+        -----------
+            packet_size_bits (float):
+                The size of the packet in bits.
+
+        Returns:
+        --------
+            adjacency (dict):
+                { Vertex: [(linked vertex, weight), ...] }, in the same order
+                as `links`.
+            edge_index (dict):
+                { (Vertex, Vertex): weight }, parallel to `adjacency`, used to
+                read the cost of a hop without scanning the adjacency list.
+        """
+
+        key = (packet_size_bits, self.medium)
+        compiled = self._compiled_weights.get(key)
+
+        if compiled is None:
+            adjacency = defaultdict(list)
+            edge_index = {}
+            delays = {}
+
+            for vertex, connections in self.links.items():
+                row = adjacency[vertex]
+
+                for adj_vertex, link in connections:
+                    weight = delays.get(id(link))
+                    if weight is None:
+                        weight = delays[id(link)] = link.calculate_delay(packet_size_bits)
+
+                    row.append((adj_vertex, weight))
+                    if weight < edge_index.get((vertex, adj_vertex), math.inf):
+                        edge_index[(vertex, adj_vertex)] = weight
+
+            compiled = self._compiled_weights[key] = (adjacency, edge_index)
+
+        return compiled
+
+    @INSTRUMENTATION.timed("construct_routings_tables")
+    def construct_routings_tables(self, vertex_map, mode=None):
         """
         Builds the routing table for each vertex in the graph.
 
@@ -66,18 +324,108 @@ class Graph:
 
         Parameters:
         -----------
-            None
+            vertex_map (dict):
+                A dictionary mapping identifiers to `Vertex` objects.
+            mode (str):
+                - `"tree"`: Runs one Dijkstra per source and fills the whole
+                  routing table of that source from its shortest-path tree
+                  (N searches). The trees are kept so later topology changes
+                  only recompute the affected sources.
+                - `"pairwise"`: Runs one Dijkstra per (source, destiny) pair
+                  (N² searches).
+                - `"floyd-warshall"`: Computes all pairs at once with
+                  Floyd–Warshall (vectorized with NumPy when available). The
+                  routing tables become `MatrixRoutingTable` views into the
+                  shared matrices. Suited to dense, small-diameter topologies.
+                - `"lazy"`: Computes nothing upfront. The tree of a source is
+                  computed on the first lookup in its routing table and kept
+                  in a LRU cache of `route_cache_size` sources shared by all
+                  the vertices.
+                - `"compact"`: Runs one Dijkstra per source but only stores
+                  the next hop, the first hop cost and the total cost of each
+                  route in typed arrays (`CompactRouteStore`). Paths are
+                  rebuilt from the next hops when read.
+                - `"parallel"`: Same tables as `"compact"` (the searches
+                  break ties alike), with the sources sharded across
+                  `routing_workers` processes.
+                - `"ecmp"`: Routing tables with the costs of `"tree"` (on
+                  ties, the route with the fewest hops), plus the
+                  `multipath_table` of each vertex with every equal-cost
+                  next hop of each destiny (see `Vertex.next_hop`).
+                `"tree"` and `"pairwise"` produce identical routing tables.
+                When not provided, `routing_mode` is used.
 
         Returns:
         --------
             None
         """
 
-        for i in range(len(self.vertices)):
-            vertex = vertex_map[self.vertices[i]]
+        if mode is None:
+            mode = self.routing_mode
+
+        # The modes that fill the routing tables entry by entry start from
+        # new dicts: the tables of the other modes (matrix, lazy and compact
+        # views) are read-only.
+        for identifier in self.vertices:
+            vertex = vertex_map[identifier]
+            vertex.multipath_table = {}
+            if mode in ("tree", "pairwise", "ecmp"):
+                vertex.routing_table = {}
+
+        self._routed_map = vertex_map
+        self._routed_mode = mode
+        self._routed_count = len(self.vertices)
+        self._trees = {}
+        self._route_cache = None  # Only the lazy tables use it (created below).
+
+        if mode == "pairwise":
+            for i in range(len(self.vertices)):
+                vertex = vertex_map[self.vertices[i]]
+
+                for j in range(len(self.vertices)):
+                    vertex.routing_table[self.vertices[j]] = dijkstra(graph=self, start=vertex, end=vertex_map[self.vertices[j]])
 
-            for j in range(len(self.vertices)):
-                vertex.routing_table[self.vertices[j]] = dijkstra(graph=self, start=vertex, end=vertex_map[self.vertices[j]])
+        elif mode == "tree":
+            for identifier in self.vertices:
+                self._route_source(vertex_map[identifier])
+
+        elif mode == "floyd-warshall":
+            _, next_hop, edge_weights = floyd_warshall(graph=self)
+            index = {identifier: i for i, identifier in enumerate(self.vertices)}
+
+            for i, identifier in enumerate(self.vertices):
+                vertex_map[identifier].routing_table = MatrixRoutingTable(self.vertices, index, next_hop, edge_weights, i)
+
+        elif mode == "lazy":
+            self._route_cache = RouteCache(self._lazy_routes, self.route_cache_size)
+
+            for identifier in self.vertices:
+                self._install_lazy_table(vertex_map[identifier])
+
+        elif mode == "compact":
+            store = self.route_store(vertex_map)
+
+            for i, identifier in enumerate(self.vertices):
+                vertex_map[identifier].routing_table = CompactRoutingTable(store, i)
+
+        elif mode == "parallel":
+            construct_routings_tables_parallel(self, vertex_map, self.routing_workers)
+
+        elif mode == "ecmp":
+            _, edge_index = self.compile_weights(PACKET_SIZE_BITS)
+
+            for identifier in self.vertices:
+                vertex = vertex_map[identifier]
+                dist, prev, preds, order = shortest_path_dag(graph=self, start=vertex)
+                self._fill_routing_table(vertex, paths_from_tree(vertex, dist, prev, order))
+
+                vertex.multipath_table = {
+                    destiny.identifier: tuple((hop.identifier, edge_index[(vertex, hop)]) for hop in hops)
+                    for destiny, hops in multipath_next_hops(vertex, preds, order).items()
+                }
+
+        else:
+            raise ValueError(f"Routing mode not recognized: {mode}")
 
     def print_graph(self):
         """
@@ -94,4 +442,136 @@ class Graph:
                 rate = link.transmissionRate
                 print(f"    - Connected to: {adj_vertex.identifier}, Distance: {distance}m, Rate: {rate}bps")
 
-        print()
\ No newline at end of file
+        print()
+
+    def _route_source(self, vertex):
+        """
+        Computes the shortest-path tree of a vertex and fills its routing table.
+        """
+
+        dist, prev, order = shortest_path_tree(graph=self, start=vertex)
+        self._trees[vertex] = (dist, prev)
+        self._fill_routing_table(vertex, paths_from_tree(vertex, dist, prev, order))
+
+    def _lazy_routes(self, vertex):
+        """
+        Computes the routes of a vertex for the `"lazy"` mode cache.
+        """
+
+        dist, prev, order = shortest_path_tree(graph=self, start=vertex)
+        paths = paths_from_tree(vertex, dist, prev, order)
+
+        return {destiny.identifier: path for destiny, path in paths.items()}
+
+    def _install_lazy_table(self, vertex):
+        """
+        Replaces the routing table of a vertex by a lazy one (`"lazy"` mode).
+        """
+
+        vertex.routing_table = LazyRoutingTable(self._route_cache, vertex, self._routed_map, self.vertices)
+
+    def _fill_routing_table(self, vertex, paths):
+        """
+        Writes the routes of a vertex (as returned by `paths_from_tree`) in its
+        routing table, with an empty route for unreachable vertices.
+        """
+
+        vertex_map = self._routed_map
+        for destiny in self.vertices:
+            vertex.routing_table[destiny] = paths.get(vertex_map[destiny], [])
+
+    def _remove_connection(self, vertex1, vertex2):
+        """
+        Removes the connection between two vertices (if any) and returns its link.
+        """
+
+        old_link = None
+
+        for u, v in ((vertex1, vertex2), (vertex2, vertex1)):
+            connections = self.links[u]
+            for i, (adj_vertex, link) in enumerate(connections):
+                if adj_vertex == v:
+                    old_link = link
+                    del connections[i]
+                    break
+
+        return old_link
+
+    def _update_compiled_weights(self, vertex1, vertex2, link):
+        """
+        Updates the cached weight tables in place after the connection
+        between two vertices changed ('link' is None when it was removed).
+        """
+
+        for (packet_size_bits, _), (adjacency, edge_index) in self._compiled_weights.items():
+            weight = None if link is None else link.calculate_delay(packet_size_bits)
+
+            for u, v in ((vertex1, vertex2), (vertex2, vertex1)):
+                adjacency[u] = [(adj_vertex, w) for adj_vertex, w in adjacency[u] if adj_vertex != v]
+                edge_index.pop((u, v), None)
+
+                if link is not None:
+                    adjacency[u].append((v, weight))
+                    edge_index[(u, v)] = weight
+
+    def _repair_routes(self, vertex1, vertex2, old_link, new_link):
+        """
+        Repairs the routing tables after the connection between two vertices
+        changed from 'old_link' to 'new_link' (None means no connection).
+
+        For every stored shortest-path tree:
+            - If the connection is a tree edge that got more expensive (or
+              was removed), only the subtree below it is recomputed.
+            - If the connection got cheaper (or was added), only the vertices
+              whose cost improves are visited.
+        Only the routing table entries of the vertices whose route changed
+        are rewritten. In `"lazy"` mode the cached routes are dropped, and in
+        the other modes all the routing tables are rebuilt.
+        """
+
+        if self._routed_map is None:
+            return
+
+        if self._routed_mode == "lazy":
+            self._route_cache.clear()
+
+            for identifier in self.vertices[self._routed_count:]:
+                self._install_lazy_table(self._routed_map[identifier])
+            self._routed_count = len(self.vertices)
+            return
+
+        if self._routed_mode != "tree":
+            self.construct_routings_tables(self._routed_map, self._routed_mode)
+            return
+
+        old_weight = math.inf if old_link is None else old_link.calculate_delay(PACKET_SIZE_BITS)
+        new_weight = math.inf if new_link is None else new_link.calculate_delay(PACKET_SIZE_BITS)
+
+        for source, (dist, prev) in self._trees.items():
+            changed = set()
+
+            if new_weight > old_weight:
+                if prev.get(vertex2) is vertex1:
+                    changed = repair_tree_after_increase(self, source, dist, prev, vertex2)
+                elif prev.get(vertex1) is vertex2:
+                    changed = repair_tree_after_increase(self, source, dist, prev, vertex1)
+
+            elif new_weight < old_weight:
+                changed = repair_tree_after_decrease(self, source, dist, prev, vertex1, vertex2, new_weight)
+
+            for vertex in changed:
+                source.routing_table[vertex.identifier] = path_from_tree(source, vertex, dist, prev)
+
+        # Vertices added since the last build get their own tree and must
+        # appear in every table.
+        if self._routed_count != len(self.vertices):
+            new_vertices = self.vertices[self._routed_count:]
+            self._routed_count = len(self.vertices)
+
+            for source, (dist, prev) in self._trees.items():
+                for destiny in new_vertices:
+                    if destiny not in source.routing_table:
+                        source.routing_table[destiny] = path_from_tree(source, self._routed_map[destiny], dist, prev)
+
+            for identifier in new_vertices:
+                self._route_source(self._routed_map[identifier])
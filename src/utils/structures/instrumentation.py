@@ -0,0 +1,146 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+import functools
+import sys
+
+class Instrumentation:
+    """
+    Counters and phase timers of the hot paths (searches, routing table
+    construction, terminal commands), off by default.
+
+    Disabled, it costs one attribute check per instrumented call: the
+    searches of `adaptedDijkstra.py` derive their counters from their final
+    state (the heap tie-breaker, the settled vertices) instead of counting
+    inside their loops, and only do it when `enabled` is set.
+
+    Attributes:
+    -----------
+        enabled (bool):
+            Whether counters and timers are recorded.
+        counters (dict):
+            { name: total }, e.g. `heap_pushes`, `edges_relaxed`,
+            `vertices_settled`.
+        phases (dict):
+            { name: [calls, seconds] } of the timed phases.
+
+    Methods:
+    --------
+        count(**amounts):
+            Adds to counters (if enabled).
+        phase(name):
+            Context manager that times a phase (if enabled).
+        timed(name):
+            Decorator that times every call of a function as a phase.
+        report() -> dict:
+            Returns a copy of the counters and phases.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = defaultdict(int)
+        self.phases = defaultdict(lambda: [0, 0.0])
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.counters.clear()
+        self.phases.clear()
+
+    def count(self, **amounts):
+        if self.enabled:
+            for name, amount in amounts.items():
+                self.counters[name] += amount
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.phases[name]
+            entry[0] += 1
+            entry[1] += perf_counter() - start
+
+    def timed(self, name):
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self.phase(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def report(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "counters": dict(self.counters),
+            "phases": {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in self.phases.items()},
+        }
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+def routing_table_bytes(graph, vertex_map) -> int:
+    """
+    Returns the memory used by the routing tables (and, in `"ecmp"` mode,
+    the multipath tables) of every vertex, in bytes.
+
+    The size is the one of every object reachable from the tables, each
+    counted once (tables that share a store, like the compact ones, count
+    it once), without the graph, the vertices and their identifiers.
+    """
+
+    seen = {id(graph), id(vertex_map)}
+    for identifier, vertex in vertex_map.items():
+        seen.add(id(identifier))
+        seen.add(id(vertex))
+        seen.add(id(vertex.identifier))
+
+    total = 0
+    for vertex in vertex_map.values():
+        total += _deep_sizeof(vertex.routing_table, seen)
+        total += _deep_sizeof(vertex.multipath_table, seen)
+
+    return total
+
+
+def _deep_sizeof(obj, seen):
+    """
+    Returns the size of 'obj' and of every object reachable from it that is
+    not in 'seen' (ids), adding them to 'seen'.
+    """
+
+    total = 0
+    stack = [obj]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, bytearray, int, float, memoryview)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__") and not callable(obj):
+            stack.append(vars(obj))
+
+    return total
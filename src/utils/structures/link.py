@@ -1,3 +1,8 @@
+MEDIUM_SPEEDS = {
+    'fiber': 3e8,  #(300,000,000 m/s)
+    'coaxial': 2e8,  #(200,000,000 m/s)
+}
+
 class Link():
     """
     Represents a link in a graph, containing information about the distance 
@@ -18,6 +23,8 @@ class Link():
                 Computes the propagation delay based on the distance in fiber optics.
         4 - calculate_delay(packet_size: float) -> float:
                 Computes the total delay (transmission + propagation).
+        5 - set_medium(SPEED: str):
+                Changes the type of network (propagation speed) of the link.
     """
 
     def __init__(self, distance=None, transmissionRate=None, SPEED=None):
@@ -30,15 +37,15 @@ class Link():
                 The lenght of the link in meters.
             transmissionRate (float): 
                 The transmission rate of the associated link in bits per second.
+            SPEED (str):
+                The type of network of the link (`"fiber"` or `"coaxial"`).
         """
 
         if (distance == None) or (transmissionRate == None):
             raise ValueError("Both distance and transmissionRate must be provided")
         
-        if SPEED == 'fiber':
-            self.SPEED = 3e8 #(300,000,000 m/s)
-        if SPEED == 'coaxial':
-            self.SPEED = 2e8 #(200,000,000 m/s)
+        if SPEED is not None:
+            self.set_medium(SPEED)
 
         self.distance = distance
         self.transmissionRate = transmissionRate
@@ -89,4 +96,20 @@ class Link():
             float: The total delay in seconds.
         """
         
-        return self.calculate_transmission_delay(packet_size) + self.calculate_propagation_delay()
\ No newline at end of file
+        return self.calculate_transmission_delay(packet_size) + self.calculate_propagation_delay()
+
+    def set_medium(self, SPEED: str):
+        """
+        Changes the type of network of the link, which defines the speed used
+        by the propagation delay.
+
+        Parameters:
+        -----------
+            SPEED (str): 
+                The type of network (`"fiber"` or `"coaxial"`).
+        """
+
+        if SPEED not in MEDIUM_SPEEDS:
+            raise ValueError(f"Type of network not recognized: {SPEED}")
+
+        self.SPEED = MEDIUM_SPEEDS[SPEED]
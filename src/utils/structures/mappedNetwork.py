@@ -0,0 +1,310 @@
+from utils.functions.adaptedDijkstra import PACKET_SIZE_BITS
+from utils.functions.diskRouteCache import aligned, pad
+from utils.structures.routingTable import CompactRouteStore, CompactRoutingTable
+from utils.structures.link import Link
+from utils.structures.vertex import Vertex
+from collections.abc import Mapping
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import struct
+
+MAGIC = b"RCNT"
+FORMAT_VERSION = 1
+
+# magic, version, vertices, directed edges, identifiers blob size, medium size
+_HEADER = struct.Struct("<4sIQQQI")
+
+def save_network(path, graph, vertex_map):
+    """
+    Writes a graph and its routing tables to 'path' in a read-only format
+    meant to be memory-mapped by `open_network`.
+
+    The file holds the vertex identifiers, the CSR adjacency (rows sorted by
+    neighbour), the distance, transmission rate and propagation speed of
+    every edge, and the next hop, first hop cost and total cost matrices of
+    the routes. Every section starts at a multiple of 8 bytes.
+
+    Parameters:
+    -----------
+    path (str):
+        The file to write.
+    graph:
+        A `Graph` or `CSRGraph`.
+    vertex_map (dict):
+        A dictionary mapping identifiers to `Vertex` objects. When the
+        routing tables are not in the compact format, the routes are
+        computed again into a temporary store (see `Graph.route_store`),
+        without changing the tables.
+    """
+
+    identifiers = graph.vertices
+    index = {identifier: i for i, identifier in enumerate(identifiers)}
+
+    first_table = vertex_map[identifiers[0]].routing_table if identifiers else None
+    if isinstance(first_table, CompactRoutingTable):
+        store = first_table.store
+    else:
+        store = graph.route_store(vertex_map)
+
+    offsets = array('q', [0])
+    neighbors = array('i')
+    distances = array('d')
+    rates = array('d')
+    speeds = array('d')
+
+    for identifier in identifiers:
+        for adj_identifier, link in sorted(_connections(graph, vertex_map, identifier), key=lambda c: index[c[0]]):
+            neighbors.append(index[adj_identifier])
+            distances.append(link.distance)
+            rates.append(link.transmissionRate)
+            speeds.append(link.SPEED)
+        offsets.append(len(neighbors))
+
+    encoded_identifiers = "\n".join(identifiers).encode()
+    encoded_medium = (graph.medium or "").encode()
+    temporary = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(identifiers), len(neighbors), len(encoded_identifiers), len(encoded_medium)))
+        file.write(encoded_identifiers)
+        file.write(encoded_medium)
+        pad(file)
+
+        for section in (offsets, neighbors, distances, rates, speeds):
+            file.write(section)
+            pad(file)
+
+        for rows in (store.next_hops, store.hop_costs, store.path_costs):
+            for row in rows:
+                file.write(row)
+            pad(file)
+
+    os.replace(temporary, path)
+
+
+def open_network(path):
+    """
+    Opens a file written by `save_network` without copying its contents.
+
+    The file is memory-mapped read-only, so every process that opens it
+    shares the same physical pages; the adjacency and the routes are read
+    through `memoryview`s of the mapping.
+
+    Returns:
+    --------
+    graph: MappedGraph
+        A read-only view with the API of `Graph` for queries.
+    vertex_map: MappedVertexMap
+        A mapping from identifiers to `Vertex` objects (created on first
+        access) whose routing tables are `CompactRoutingTable` views.
+    """
+
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, n, m, identifiers_size, medium_size = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Not a network file (or unsupported version): {path}")
+
+    offset = _HEADER.size
+    identifiers = mapped[offset:offset + identifiers_size].decode().split("\n") if n else []
+    offset += identifiers_size
+    medium = mapped[offset:offset + medium_size].decode() or None
+    offset = aligned(offset + medium_size)
+
+    view = memoryview(mapped)
+    sections = []
+    for typecode, count in (("q", n + 1), ("i", m), ("d", m), ("d", m), ("d", m), ("i", n * n), ("d", n * n), ("d", n * n)):
+        size = count * struct.calcsize(typecode)
+        sections.append(view[offset:offset + size].cast(typecode))
+        offset = aligned(offset + size)
+
+    offsets, neighbors, distances, rates, speeds, next_hops, hop_costs, path_costs = sections
+
+    store = CompactRouteStore(identifiers)
+    store.next_hops = [next_hops[i * n:(i + 1) * n] for i in range(n)]
+    store.hop_costs = [hop_costs[i * n:(i + 1) * n] for i in range(n)]
+    store.path_costs = [path_costs[i * n:(i + 1) * n] for i in range(n)]
+    store.mapped = mapped
+
+    graph = MappedGraph(identifiers, store.index, medium, offsets, neighbors, distances, rates, speeds)
+
+    return graph, MappedVertexMap(store)
+
+
+class MappedGraph:
+    """
+    Read-only graph backed by the CSR buffers of a file opened with
+    `open_network`.
+
+    Attributes:
+    -----------
+        vertices (list):
+            The identifiers of the vertices; the position is the vertex id.
+        medium (str):
+            The type of network of the links (`"fiber"` or `"coaxial"`).
+    """
+
+    def __init__(self, identifiers, index, medium, offsets, neighbors, distances, rates, speeds):
+        """
+        Initializes the view over the mapped buffers (see `open_network`).
+        """
+
+        self.vertices = identifiers
+        self.medium = medium
+        self._index = index
+        self._offsets = offsets
+        self._neighbors = neighbors
+        self._distances = distances
+        self._rates = rates
+        self._speeds = speeds
+        self._compiled_weights = {}
+
+    def link_vertices(self, vertex1, vertex2, link):
+        """
+        Mapped networks are read-only: save a new file to change the topology.
+        """
+
+        raise TypeError("A mapped network is read-only")
+
+    def is_linked(self, vertex1, vertex2) -> bool:
+        """
+        Checks if two vertices are linked (binary search in the CSR row).
+        """
+
+        if vertex1.identifier not in self._index or vertex2.identifier not in self._index:
+            return False
+
+        u, v = self._index[vertex1.identifier], self._index[vertex2.identifier]
+        start, end = self._offsets[u], self._offsets[u + 1]
+        e = bisect_left(self._neighbors, v, start, end)
+
+        return e < end and self._neighbors[e] == v
+
+    def neighbors(self, identifier):
+        """
+        Returns the (linked vertex identifier, link) pairs of a vertex. The
+        `Link` objects are rebuilt from the mapped link parameters.
+        """
+
+        u = self._index[identifier]
+
+        return [(self.vertices[self._neighbors[e]], self._link(e)) for e in range(self._offsets[u], self._offsets[u + 1])]
+
+    def csr(self):
+        """
+        Returns the mapped CSR buffers.
+
+        Returns:
+        --------
+            offsets (memoryview): Start of the edges of each vertex (length N + 1).
+            neighbors (memoryview): The vertex at the other end of each edge.
+            edge_links (range): The index of the link parameters of each edge
+                (every edge keeps its own parameters in the file).
+        """
+
+        return self._offsets, self._neighbors, range(len(self._neighbors))
+
+    def edge_weights(self, packet_size_bits=PACKET_SIZE_BITS):
+        """
+        Returns the delay of every edge, aligned with the `neighbors` buffer,
+        computed once per packet size from the mapped link parameters.
+        """
+
+        weights = self._compiled_weights.get(packet_size_bits)
+
+        if weights is None:
+            delays = {}
+            weights = array('d')
+
+            for e in range(len(self._neighbors)):
+                key = (self._distances[e], self._rates[e], self._speeds[e])
+                delay = delays.get(key)
+                if delay is None:
+                    delay = delays[key] = self._link(e).calculate_delay(packet_size_bits)
+                weights.append(delay)
+
+            self._compiled_weights[packet_size_bits] = weights
+
+        return weights
+
+    def print_graph(self):
+        """
+        Prints the graph structure in a readable format.
+        """
+
+        print("\nGraph Structure:")
+
+        for identifier in self.vertices:
+            connections = self.neighbors(identifier)
+            if not connections:
+                continue
+
+            print(f"{identifier} ->")
+
+            for adj_identifier, link in connections:
+                distance = link.distance
+                rate = link.transmissionRate
+                print(f"    - Connected to: {adj_identifier}, Distance: {distance}m, Rate: {rate}bps")
+
+        print()
+
+    def _link(self, e):
+        """
+        Rebuilds the `Link` of an edge from the mapped link parameters.
+        """
+
+        link = Link(distance=self._distances[e], transmissionRate=self._rates[e])
+        link.SPEED = self._speeds[e]
+        return link
+
+
+class MappedVertexMap(Mapping):
+    """
+    Mapping from identifiers to `Vertex` objects of a mapped network.
+
+    Vertices are only created on first access, and their routing tables are
+    `CompactRoutingTable` views into the mapped route matrices.
+    """
+
+    def __init__(self, store):
+        """
+        Initializes the mapping over a mapped `CompactRouteStore`.
+        """
+
+        self.store = store
+        self._vertices = {}
+
+    def __getitem__(self, identifier):
+        vertex = self._vertices.get(identifier)
+
+        if vertex is None:
+            source = self.store.index[identifier]
+            vertex = self._vertices[identifier] = Vertex(identifier)
+            vertex.routing_table = CompactRoutingTable(self.store, source)
+
+        return vertex
+
+    def __contains__(self, identifier):
+        return identifier in self.store.index
+
+    def __iter__(self):
+        return iter(self.store.identifiers)
+
+    def __len__(self):
+        return len(self.store.identifiers)
+
+
+def _connections(graph, vertex_map, identifier):
+    """
+    Returns the (linked vertex identifier, link) pairs of a vertex of a
+    `Graph` or `CSRGraph`.
+    """
+
+    if hasattr(graph, "neighbors"):
+        return graph.neighbors(identifier)
+
+    return [(adj_vertex.identifier, link) for adj_vertex, link in graph.links.get(vertex_map[identifier], [])]
+
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from time import perf_counter
+import threading
+
+class NetworkBuilder:
+    """
+    Builds the network (graph, vertex map and routing tables) in a
+    background thread, so a program can show its prompt before the network
+    is ready and only wait for it when a command needs it.
+
+    The build function gets the builder as argument and may time its steps
+    with `phase`; the durations are kept in `timings`.
+
+    Attributes:
+    -----------
+        timings (dict):
+            { phase name: duration in seconds }, in the order the phases ran.
+        ready (threading.Event):
+            Set when the build finished (successfully or not).
+    """
+
+    def __init__(self, build):
+        """
+        Parameters:
+        -----------
+            build (callable):
+                Called as `build(builder)`; returns what `result` gives back,
+                e.g. `(graph, vertex_map)`.
+        """
+
+        self.timings = {}
+        self.ready = threading.Event()
+
+        self._build = build
+        self._result = None
+        self._error = None
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the build in a background (daemon) thread.
+        """
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="network-builder", daemon=True)
+            self._thread.start()
+
+        return self
+
+    def result(self):
+        """
+        Returns the result of the build, waiting for it (and running it in
+        the calling thread if it was never started). Errors of the build are
+        raised here.
+        """
+
+        if self._thread is None and not self.ready.is_set():
+            self._run()
+        self.ready.wait()
+
+        if self._error is not None:
+            raise self._error
+
+        return self._result
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times a step of the build as `timings[name]`.
+        """
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + perf_counter() - start
+
+    def _run(self):
+        try:
+            self._result = self._build(self)
+        except BaseException as error:
+            self._error = error
+        finally:
+            self.ready.set()
@@ -0,0 +1,126 @@
+def ip_to_int(address) -> int:
+    """
+    Converts a dotted IPv4 address ("10.1.2.3") to an int.
+    """
+
+    parts = address.split(".")
+    if len(parts) != 4:
+        raise ValueError(f"Not an IPv4 address: {address}")
+
+    value = 0
+    for part in parts:
+        byte = int(part)
+        if not 0 <= byte <= 255:
+            raise ValueError(f"Not an IPv4 address: {address}")
+        value = (value << 8) | byte
+
+    return value
+
+
+def int_to_ip(value) -> str:
+    """
+    Converts an int to a dotted IPv4 address.
+    """
+
+    return f"{(value >> 24) & 255}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+
+def format_prefix(prefix, length) -> str:
+    """
+    Formats a prefix as "a.b.c.d/length".
+    """
+
+    return f"{int_to_ip(prefix)}/{length}"
+
+
+class PrefixTrie:
+    """
+    Binary radix trie of IPv4 prefixes with longest-prefix-match lookup.
+
+    Each node branches on one bit of the address, from the most significant
+    one; a prefix of length L is stored in the node reached by its first L
+    bits. A lookup walks the bits of the address and keeps the value of the
+    last (longest) prefix found on the way.
+
+    Attributes:
+    -----------
+        root (list):
+            The root node, `[child for bit 0, child for bit 1, value, has value]`.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty trie.
+        """
+
+        self.root = [None, None, None, False]
+        self._size = 0
+
+    def insert(self, prefix, length, value):
+        """
+        Adds (or replaces) a prefix.
+
+        Parameters:
+        -----------
+            prefix (int):
+                The address of the prefix (bits after 'length' are ignored).
+            length (int):
+                The length of the prefix, from 0 (default route) to 32.
+            value:
+                The value returned by `lookup` for addresses in the prefix.
+        """
+
+        if not 0 <= length <= 32:
+            raise ValueError(f"Invalid prefix length: {length}")
+
+        node = self.root
+        for shift in range(31, 31 - length, -1):
+            bit = (prefix >> shift) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None, False]
+            node = node[bit]
+
+        if not node[3]:
+            self._size += 1
+
+        node[2] = value
+        node[3] = True
+
+    def lookup(self, address, default=None):
+        """
+        Returns the value of the longest prefix that contains 'address' (an
+        int), or 'default' if no prefix does.
+        """
+
+        node = self.root
+        value = node[2] if node[3] else default
+
+        for shift in range(31, -1, -1):
+            node = node[(address >> shift) & 1]
+            if node is None:
+                break
+            if node[3]:
+                value = node[2]
+
+        return value
+
+    def entries(self):
+        """
+        Yields every (prefix, length, value) of the trie, shortest prefixes
+        first along each branch.
+        """
+
+        stack = [(self.root, 0, 0)]
+
+        while stack:
+            node, prefix, length = stack.pop()
+
+            if node[3]:
+                yield prefix, length, node[2]
+
+            for bit in (1, 0):
+                if node[bit] is not None:
+                    stack.append((node[bit], prefix | (bit << (31 - length)), length + 1))
+
+    def __len__(self):
+        return self._size
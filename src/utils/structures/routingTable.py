@@ -0,0 +1,357 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from array import array
+import math
+
+class MatrixRoutingTable(Mapping):
+    """
+    Read-only routing table of one vertex backed by the shared all-pairs
+    matrices produced by `floyd_warshall`.
+
+    Every vertex holds a view into the same `dist`/`next_hop` matrices
+    instead of its own copy of every path. Each lookup rebuilds the route in
+    the usual routing table format by walking the next-hop matrix.
+
+    Attributes:
+    -----------
+        identifiers (list):
+            The identifiers of the vertices, in matrix order.
+        index (dict):
+            A dictionary mapping identifiers to matrix positions.
+        source (int):
+            The matrix position of the vertex that owns this table.
+    """
+
+    def __init__(self, identifiers, index, next_hop, edge_weights, source):
+        """
+        Initializes the view of the routing table of a vertex.
+
+        Parameters:
+        -----------
+            identifiers (list):
+                The identifiers of the vertices, in matrix order.
+            index (dict):
+                A dictionary mapping identifiers to matrix positions.
+            next_hop (matrix of int):
+                The shared next-hop matrix.
+            edge_weights (dict):
+                { (i, j): weight } for every edge of the graph.
+            source (int):
+                The matrix position of the vertex that owns this table.
+        """
+
+        self.identifiers = identifiers
+        self.index = index
+        self.source = source
+        self._next_hop = next_hop
+        self._edge_weights = edge_weights
+
+    def __getitem__(self, destiny):
+        """
+        Returns the path to 'destiny' as a list of (identifier, accumulated_cost).
+        """
+
+        target = self.index[destiny]
+        cur = self.source
+        accumulated = 0.0
+        path = [(self.identifiers[cur], accumulated)]
+
+        while cur != target:
+            nxt = int(self._next_hop[cur][target])
+            if nxt == -1:
+                return []
+
+            accumulated += self._edge_weights[(cur, nxt)]
+            path.append((self.identifiers[nxt], accumulated))
+            cur = nxt
+
+        return path
+
+    def __contains__(self, destiny):
+        return destiny in self.index
+
+    def __iter__(self):
+        return iter(self.identifiers)
+
+    def __len__(self):
+        return len(self.identifiers)
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of the routes of the most recently used sources,
+    shared by all the `LazyRoutingTable` of a graph.
+
+    Attributes:
+    -----------
+        capacity (int):
+            The maximum number of sources kept in the cache.
+    """
+
+    def __init__(self, compute_routes, capacity=128):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+        -----------
+            compute_routes (callable):
+                Receives a source `Vertex` and returns { destiny identifier: path }.
+            capacity (int):
+                The maximum number of sources kept in the cache.
+        """
+
+        if capacity < 1:
+            raise ValueError("The capacity of the route cache must be at least 1")
+
+        self.capacity = capacity
+        self._compute_routes = compute_routes
+        self._routes = OrderedDict()
+
+    def routes(self, source):
+        """
+        Returns the routes of 'source', computing them on the first access and
+        evicting the least recently used source when the cache is full.
+        """
+
+        routes = self._routes.get(source)
+
+        if routes is None:
+            routes = self._routes[source] = self._compute_routes(source)
+            if len(self._routes) > self.capacity:
+                self._routes.popitem(last=False)
+        else:
+            self._routes.move_to_end(source)
+
+        return routes
+
+    def clear(self):
+        """
+        Drops every cached route (e.g. after the topology changed).
+        """
+
+        self._routes.clear()
+
+    def __len__(self):
+        return len(self._routes)
+
+
+class LazyRoutingTable(Mapping):
+    """
+    Routing table of one vertex computed on demand.
+
+    The shortest-path tree of the vertex is only computed on the first
+    lookup and kept in a `RouteCache` shared across vertices, so building the
+    tables is instant and the memory used by routes is bounded by the
+    capacity of the cache.
+    """
+
+    def __init__(self, cache, vertex, vertex_map, identifiers):
+        """
+        Initializes the lazy routing table of a vertex.
+
+        Parameters:
+        -----------
+            cache (RouteCache):
+                The cache shared by the vertices of the graph.
+            vertex (Vertex):
+                The vertex that owns this table.
+            vertex_map (dict):
+                A dictionary mapping identifiers to `Vertex` objects.
+            identifiers (list):
+                The identifiers of the vertices of the graph.
+        """
+
+        self._cache = cache
+        self._vertex = vertex
+        self._vertex_map = vertex_map
+        self._identifiers = identifiers
+
+    def __getitem__(self, destiny):
+        """
+        Returns the path to 'destiny' as a list of (identifier, accumulated_cost).
+        """
+
+        if destiny not in self._vertex_map:
+            raise KeyError(destiny)
+
+        return self._cache.routes(self._vertex).get(destiny, [])
+
+    def __contains__(self, destiny):
+        return destiny in self._vertex_map
+
+    def __iter__(self):
+        return iter(self._identifiers)
+
+    def __len__(self):
+        return len(self._identifiers)
+
+
+class CompactRouteStore:
+    """
+    Next-hop-only storage of the routes of every vertex of a graph.
+
+    Instead of the full path to every destiny, each vertex keeps three typed
+    arrays indexed by destiny: the index of the next hop, the cost of that
+    first hop and the total cost of the route. Paths are only rebuilt, by
+    walking the next hops, when they are requested.
+
+    Attributes:
+    -----------
+        identifiers (list):
+            The identifiers of the vertices; the position is the index used
+            in the arrays.
+        index (dict):
+            A dictionary mapping identifiers to positions.
+        next_hops (list of array):
+            next_hops[s][t] is the index of the next hop from s to t (-1 if
+            unreachable, s itself when s == t).
+        hop_costs (list of array):
+            hop_costs[s][t] is the cost of the link from s to its next hop to t.
+        path_costs (list of array):
+            path_costs[s][t] is the total cost from s to t ('math.inf' if
+            unreachable).
+        mapped (mmap):
+            The memory-mapped file backing the arrays, when the store was
+            loaded from disk (None otherwise).
+    """
+
+    def __init__(self, identifiers):
+        """
+        Initializes an empty store for the given vertices.
+        """
+
+        self.identifiers = identifiers
+        self.index = {identifier: i for i, identifier in enumerate(identifiers)}
+        self.next_hops = [None] * len(identifiers)
+        self.hop_costs = [None] * len(identifiers)
+        self.path_costs = [None] * len(identifiers)
+        self.mapped = None
+
+    def add_source(self, source, dist, prev, order, edge_index):
+        """
+        Stores the routes of 'source' from its shortest-path tree (see
+        `shortest_path_tree`).
+
+        Parameters:
+        -----------
+            source (Vertex):
+                The root of the tree.
+            dist, prev, order:
+                The tree returned by `shortest_path_tree`.
+            edge_index (dict):
+                { (Vertex, Vertex): weight } (see `Graph.compile_weights`).
+        """
+
+        n = len(self.identifiers)
+        s = self.index[source.identifier]
+
+        next_hops = array('i', [-1]) * n
+        hop_costs = array('d', [math.inf]) * n
+        path_costs = array('d', [math.inf]) * n
+
+        first_hop = {source: source}
+        for vertex in order:
+            if vertex is not source:
+                parent = prev[vertex]
+                first_hop[vertex] = vertex if parent is source else first_hop[parent]
+
+            t = self.index[vertex.identifier]
+            hop = first_hop[vertex]
+            next_hops[t] = self.index[hop.identifier]
+            hop_costs[t] = 0.0 if hop is source else edge_index[(source, hop)]
+            path_costs[t] = dist[vertex]
+
+        self.next_hops[s] = next_hops
+        self.hop_costs[s] = hop_costs
+        self.path_costs[s] = path_costs
+
+    def nbytes(self):
+        """
+        Returns the number of bytes used by the route arrays.
+        """
+
+        return sum(
+            a.itemsize * len(a)
+            for arrays in (self.next_hops, self.hop_costs, self.path_costs)
+            for a in arrays if a is not None
+        )
+
+
+class CompactRoutingTable(Mapping):
+    """
+    Routing table of one vertex backed by a `CompactRouteStore`.
+
+    `next_hop`, `hop_cost` and `path_cost` are direct array lookups; reading
+    the table as a mapping rebuilds the path in the usual routing table
+    format by walking the next hops of the vertices along the way.
+    """
+
+    def __init__(self, store, source):
+        """
+        Initializes the view of the routing table of a vertex.
+
+        Parameters:
+        -----------
+            store (CompactRouteStore):
+                The store shared by the vertices of the graph.
+            source (int):
+                The position of the vertex that owns this table.
+        """
+
+        self.store = store
+        self.source = source
+
+    def next_hop(self, destiny):
+        """
+        Returns the identifier of the next hop to 'destiny' (None if unreachable).
+        """
+
+        hop = self.store.next_hops[self.source][self.store.index[destiny]]
+        return None if hop == -1 else self.store.identifiers[hop]
+
+    def hop_cost(self, destiny):
+        """
+        Returns the cost of the first link of the route to 'destiny'.
+        """
+
+        return self.store.hop_costs[self.source][self.store.index[destiny]]
+
+    def path_cost(self, destiny):
+        """
+        Returns the total cost of the route to 'destiny'.
+        """
+
+        return self.store.path_costs[self.source][self.store.index[destiny]]
+
+    def __getitem__(self, destiny):
+        """
+        Returns the path to 'destiny' as a list of (identifier, accumulated_cost).
+        """
+
+        store = self.store
+        target = store.index[destiny]
+        cur = self.source
+        accumulated = 0.0
+        path = [(store.identifiers[cur], accumulated)]
+
+        while cur != target:
+            nxt = store.next_hops[cur][target]
+            if nxt == -1:
+                return []
+            if len(path) > len(store.identifiers):
+                raise ValueError(f"Routing loop on the way to {destiny}")
+
+            accumulated += store.hop_costs[cur][target]
+            path.append((store.identifiers[nxt], accumulated))
+            cur = nxt
+
+        return path
+
+    def __contains__(self, destiny):
+        return destiny in self.store.index
+
+    def __iter__(self):
+        return iter(self.store.identifiers)
+
+    def __len__(self):
+        return len(self.store.identifiers)
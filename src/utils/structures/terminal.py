@@ -1,6 +1,5 @@
-from utils.functions.adaptedDijkstra import dijkstra
-from time import sleep
-import random
+from utils.functions.batchProbes import batch_ping, batch_traceroute
+from utils.structures.clock import REAL_CLOCK
 
 class Terminal():
     """
@@ -10,9 +9,11 @@ class Terminal():
     -----------
         current_vertex (Vertex):
             The current vertex (or host) from which network operations will be performed.
+        clock (RealClock or VirtualClock):
+            The clock that waits the delays of the output of the commands.
     """
 
-    def __init__(self, initial_vertex=None):
+    def __init__(self, initial_vertex=None, clock=None):
         """
         Initializes the Terminal with a given starting vertex.
 
@@ -20,12 +21,15 @@ class Terminal():
         -----------
             initial_vertex (Vertex):
                 The vertex from which network operations (ping, traceroute) will originate.
+            clock (RealClock or VirtualClock):
+                The clock of the terminal (the wall clock by default; see `clock.py`).
         """
 
         if (initial_vertex == None):
             raise ValueError("Initial vertex or vertex map not provided")
         
         self.current_vertex = initial_vertex
+        self.clock = clock if clock is not None else REAL_CLOCK
 
     def navigate_to(self, new_vertex=None):
         """
@@ -43,11 +47,16 @@ class Terminal():
         
         self.current_vertex = new_vertex
 
-    def ping(self, destiny=None, graph=None, vertex_map=None) -> list:
+    def ping(self, destiny=None, graph=None, vertex_map=None, simulator=None) -> list:
         """
         Simulates the 'ping' command from the current_vertex to a destination vertex.
-        This method calculates the total travel time (using Dijkstra), adds small random
-        variations, and prints a simplified output similar to the 'ping' command.
+        This method calculates the total travel time (using the routing tables, see
+        `batch_ping`), adds small random variations, and prints a simplified output
+        similar to the 'ping' command.
+
+        With a `simulator`, the echo requests and replies are sent through the
+        discrete-event simulation instead, so the times include the queues of
+        the links under the background traffic of the simulator.
 
         Parameters:
         -----------
@@ -57,54 +66,40 @@ class Terminal():
                 The graph object that contains vertices and links.
             vertex_map (list):
                 The list of vertices and their memory adress.
+            simulator (EventSimulator):
+                The simulation the packets are sent through (optional).
         """
 
         if (self.current_vertex is None) or (destiny is None) or (graph is None) or (vertex_map is None):
             raise ValueError("New host, graph, destiny and vertex map need to be provided")
-        
-        times = []
-        for i in range(4):
-            trace_time = 0
-
-            # Going
-            pointer = vertex_map[self.current_vertex]
-            while pointer.identifier != destiny:
-                trace_time += pointer.routing_table[destiny][1][1]
-                pointer = vertex_map[pointer.next_hop(destiny)]
-
-            # Coming back
-            pointer = vertex_map[destiny]
-            while pointer.identifier != self.current_vertex:
-                trace_time += pointer.routing_table[self.current_vertex][1][1]
-                pointer = vertex_map[pointer.next_hop(self.current_vertex)]
-
-            times.append(float((trace_time * 1000) + random.uniform(0.1, 0.4)))
-
-        variance = sum((t - sum(times) / len(times))**2 for t in times) / len(times)
-        minimal = round(min(times), 2)
-        avarage = round((sum(times)/len(times)), 2)
-        maximal = round((max(times)), 2)
-        mdev = round((variance ** 0.5), 2)
-
-        print(f'\nPING {destiny} 60 data bytes\n')
-
-        output = [f'60 bytes from {destiny}: icmp_seq=1 ttl=64 time={times[0]:.2f} ms',
-            f'60 bytes from {destiny}: icmp_seq=2 ttl=64 time={times[1]:.2f} ms',
-            f'60 bytes from {destiny}: icmp_seq=3 ttl=64 time={times[2]:.2f} ms',
-            f'60 bytes from {destiny}: icmp_seq=4 ttl=64 time={times[3]:.2f} ms\n',
-            ]   
-        
-        for i in range(len(output)):
-            sleep(times[i] / 10)
-            print(output[i])
 
-        print(f'4 packets transmitted, 4 received, 0% packet loss, time {sum(times):.2f}ms')
-        print(f'rtt min/avg/max/mdev = {minimal}/{avarage}/{maximal}/{mdev} ms\n')
+        for delay, line in ping_lines(self.ping_result(destiny, vertex_map, simulator)):
+            self.clock.sleep(delay)
+            print(line)
+
+    def ping_result(self, destiny, vertex_map, simulator=None) -> dict:
+        """
+        Sends the 4 echo requests of `ping` and returns their result, without
+        printing it (see `ping_lines`).
+
+        Returns:
+        --------
+        result (dict):
+            `source`, `destiny` and `replies` (the round trip time of each
+            request in ms, None when it was lost).
+        """
+
+        if simulator is not None:
+            replies = simulator.ping(self.current_vertex, destiny, count=4)["replies"]
+        else:
+            replies = batch_ping([(self.current_vertex, destiny)], vertex_map, count=4, jitter=True)[0]["times"]
+
+        return {"source": self.current_vertex, "destiny": destiny, "replies": replies}
 
     def traceroute(self, destiny=None, graph=None, vertex_map=None):
         """
         Simulates a 'traceroute' from the current_vertex to the destiny vertex, 
-        showing each hop along the path.
+        showing each hop along the path (see `batch_traceroute`).
 
         Parameters:
         -----------
@@ -118,29 +113,70 @@ class Terminal():
 
         if (destiny is None) or (graph is None) or (vertex_map is None):
             raise ValueError("Need a destiny, graph and vertex map to run traceroute")
-        
-        print(f"\nTracing route to {destiny} over a maximum of 30 hops:\n")
 
-        hop_count = 1
-        hop_time_package = 0
-        pointer = vertex_map[self.current_vertex]
-        while pointer.identifier != destiny and hop_count <= 30:
-            
-            actual_hope_time_going = pointer.routing_table[destiny][1][1] * 1000
-            hop_time_package += actual_hope_time_going
+        for delay, line in traceroute_lines(self.traceroute_result(destiny, vertex_map)):
+            self.clock.sleep(delay)
+            print(line)
+
+    def traceroute_result(self, destiny, vertex_map) -> dict:
+        """
+        Traces the route of `traceroute` and returns it, without printing it
+        (see `traceroute_lines` and `batch_traceroute` for its format).
+        """
+
+        return batch_traceroute([(self.current_vertex, destiny)], vertex_map, max_hops=30, jitter=True)[0]
+
 
-            actual_hope_time_comeback = vertex_map[pointer.next_hop(destiny)].routing_table[pointer.identifier][1][1] * 1000
-            hop_time_package += actual_hope_time_comeback
+def ping_lines(result) -> list:
+    """
+    Formats the result of `Terminal.ping_result` like the 'ping' command.
+
+    Returns:
+    --------
+        list: (delay, line) pairs, where delay is the time (in seconds) to
+        wait before showing the line: each reply is shown after a tenth of
+        its round trip time (in ms).
+    """
+
+    replies = result["replies"]
+    times = [t for t in replies if t is not None]
+
+    lines = [(0, f'\nPING {result["destiny"]} 60 data bytes\n')]
+
+    if not times:
+        lines.append((0, '4 packets transmitted, 0 received, 100% packet loss\n'))
+        return lines
+
+    variance = sum((t - sum(times) / len(times))**2 for t in times) / len(times)
+    minimal = round(min(times), 2)
+    avarage = round((sum(times)/len(times)), 2)
+    maximal = round((max(times)), 2)
+    mdev = round((variance ** 0.5), 2)
+
+    output = [f'60 bytes from {result["destiny"]}: icmp_seq={i + 1} ttl=64 time={t:.2f} ms' for i, t in enumerate(replies) if t is not None]
+    output[-1] += '\n'
+
+    lines.extend((times[i] / 10, output[i]) for i in range(len(output)))
+    lines.append((0, f'4 packets transmitted, {len(times)} received, {100 - len(times) * 25}% packet loss, time {sum(times):.2f}ms'))
+    lines.append((0, f'rtt min/avg/max/mdev = {minimal}/{avarage}/{maximal}/{mdev} ms\n'))
+
+    return lines
+
+
+def traceroute_lines(result) -> list:
+    """
+    Formats the result of `Terminal.traceroute_result` like the 'traceroute'
+    command, as (delay, line) pairs (see `ping_lines`).
+    """
 
-            if actual_hope_time_going > 0:
+    lines = [(0, f"\nTracing route to {result['destiny']} over a maximum of 30 hops:\n")]
 
-                sleep(hop_time_package / 10)
-                print((f'{hop_count}     {round(hop_time_package + random.uniform(0.1, 0.4), 2)} ms     {round(hop_time_package + random.uniform(0.1, 0.4), 2)} ms    {round(hop_time_package + random.uniform(0.1, 0.4), 2)} ms    {pointer.routing_table[destiny][1][0]}'))
-                hop_count += 1
+    for hop in result["hops"]:
+        lines.append((hop["time"] / 10, f'{hop["hop"]}     {round(hop["times"][0], 2)} ms     {round(hop["times"][1], 2)} ms    {round(hop["times"][2], 2)} ms    {hop["address"]}'))
 
-            pointer = vertex_map[pointer.next_hop(destiny)]
+    if result["max_hops_reached"]:
+        lines.append((0, '\nMax hops reached'))
 
-            if hop_count > 30:
-                print('\nMax hops reached')
+    lines.append((0, '\nTrace complete.\n'))
 
-        print('\nTrace complete.\n')
\ No newline at end of file
+    return lines
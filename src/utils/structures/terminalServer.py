@@ -0,0 +1,116 @@
+from utils.structures.terminal import Terminal
+from utils.structures.commandDispatcher import CLEAR_SCREEN
+from utils.structures.clock import REAL_CLOCK
+import asyncio
+
+class TerminalServer:
+    """
+    Serves many terminal sessions at once over TCP, in a single thread.
+
+    Every connection is a session with its own `Terminal` (and so its own
+    current vertex), but all of them share one `CommandDispatcher`, and so
+    one graph and one set of routing tables, which no session can change
+    (the dispatcher of a server has no `change_network` callback and does
+    not `control_instrumentation`, which is shared by the process). The delays
+    of the output of `ping` and `traceroute` are waited with the
+    `async_sleep` of the clock of the server, so a slow command of one
+    session never holds the others (and, with a `VirtualClock`, no session
+    waits at all).
+
+    A session is a line based text protocol: the server sends a prompt, the
+    client sends a command line, and the server answers with the lines of
+    the command and a new prompt. `exit` (or the end of the input) closes it.
+    A command that fails is answered with its error, and the session goes on.
+    Any line client works, e.g. `nc 127.0.0.1 8023`.
+
+    Attributes:
+    -----------
+        dispatcher (CommandDispatcher):
+            Runs the commands of every session.
+        initial_vertex (str):
+            The current vertex of new sessions.
+        clock (RealClock or VirtualClock):
+            The clock shared by every session.
+        sessions (int):
+            The number of open sessions.
+        commands (int):
+            The number of commands run since the server started.
+    """
+
+    def __init__(self, dispatcher, initial_vertex, clock=None):
+        if initial_vertex not in dispatcher.vertex_map:
+            raise ValueError(f"Initial vertex {initial_vertex} not in the network")
+
+        self.dispatcher = dispatcher
+        self.initial_vertex = initial_vertex
+        self.clock = clock if clock is not None else REAL_CLOCK
+        self.sessions = 0
+        self.commands = 0
+
+    async def handle(self, reader, writer):
+        """
+        Runs one session until the client leaves (`asyncio.start_server`
+        callback).
+        """
+
+        terminal = Terminal(initial_vertex=self.initial_vertex, clock=self.clock)
+        self.sessions += 1
+
+        try:
+            while True:
+                writer.write(f"root@{terminal.current_vertex}:~$ ".encode())
+                await writer.drain()
+
+                line = await reader.readline()
+                if not line or line.strip() in (b"exit", b"quit"):
+                    break
+
+                await self.run_command(terminal, line.decode(errors="replace"), writer)
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def run_command(self, terminal, line, writer):
+        """
+        Runs a command line of a session and writes its output, waiting the
+        delay of each line.
+        """
+
+        self.commands += 1
+
+        try:
+            result = self.dispatcher.execute(terminal, line)
+        except Exception as error:
+            result = self.dispatcher.failure(line, error)
+
+        for delay, text in self.dispatcher.render(result):
+            if delay:
+                await writer.drain()
+                await self.clock.async_sleep(delay)
+            writer.write(text.encode() if text == CLEAR_SCREEN else f"{text}\n".encode())
+
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8023, ready=None):
+        """
+        Accepts sessions until cancelled.
+
+        Parameters:
+        -----------
+            host (str), port (int):
+                The address to listen on (port 0 picks a free one).
+            ready (asyncio.Future):
+                Set to the (host, port) listened on once the server accepts
+                connections (optional).
+        """
+
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+
+        async with server:
+            if ready is not None:
+                ready.set_result(server.sockets[0].getsockname()[:2])
+            await server.serve_forever()
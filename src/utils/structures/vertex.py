@@ -1,3 +1,9 @@
+from utils.structures.routingTable import CompactRoutingTable
+from utils.structures.prefixTrie import ip_to_int, int_to_ip
+from utils.functions.prefixRouting import CONNECTED, UNREACHABLE
+import math
+import zlib
+
 class Vertex:
     """
     Represents an vertex in a graph, identified by a unique identifier.
@@ -9,11 +15,36 @@ class Vertex:
         routing_table : dict
             A dictionary that stores the shortest paths to other vertices.
             ex: {vertex1: [(next_hop, cost), (next_hop, cost), ...], ...}
+            Depending on the routing mode of the graph, it can also be a
+            read-only mapping with the same format (see `routingTable.py`).
+        multipath_table : dict
+            In `"ecmp"` routing mode, every equal-cost next hop of each
+            destiny with the cost of its link.
+            ex: {vertex1: ((next_hop, cost), (next_hop, cost), ...), ...}
+        prefix_table : PrefixTrie
+            The routing table aggregated by subnet (see
+            `construct_prefix_tables`), used by `route`.
+        forwarding_engine : ForwardingEngine
+            The prefix table compiled into a multibit trie (see
+            `construct_forwarding_engines`), used by `route` and
+            `route_batch` when built.
 
     Methods:
     --------
         __init__(identifier: str):
             Initializes an vertex object with a unique identifier.
+        next_hop(destiny: str, flow=None) -> str:
+            Returns the next hop to a given destiny.
+        next_hops(destiny: str) -> list:
+            Returns every equal-cost next hop to a given destiny.
+        hop_cost(destiny: str, flow=None) -> float:
+            Returns the cost of the first link on the way to a destiny.
+        path_cost(destiny: str) -> float:
+            Returns the total cost of the route to a destiny.
+        route(address: str) -> str:
+            Returns the next hop to an address by longest-prefix match.
+        route_batch(addresses: list) -> list:
+            Returns the next hop to each address (ints) by longest-prefix match.
     """
 
     def __init__(self, identifier: str = None):
@@ -31,8 +62,11 @@ class Vertex:
 
         self.identifier = identifier
         self.routing_table = {}
+        self.multipath_table = {}
+        self.prefix_table = None
+        self.forwarding_engine = None
     
-    def next_hop(self, destiny):
+    def next_hop(self, destiny, flow=None):
         """
         Returns the next hop to a given destiny.
 
@@ -40,9 +74,145 @@ class Vertex:
         -----------
             destiny (Vertex):
                 The destiny vertex to which the next hop is required.
+            flow:
+                A key identifying the flow of the packet (e.g. its source and
+                destiny, or a 5-tuple). When there are several equal-cost
+                next hops, the flow is hashed to pick one, so the packets of
+                a flow always take the same path while different flows are
+                spread over all of them. Without a flow, the single route
+                of the routing table is used.
         """
 
         if destiny not in self.routing_table:
             raise ValueError(f"Destiny {destiny} not in routing table")
 
-        return self.routing_table[destiny][1][0]
\ No newline at end of file
+        if flow is not None and len(self.multipath_table.get(destiny, ())) > 1:
+            return self._multipath_hop(destiny, flow)[0]
+
+        if isinstance(self.routing_table, CompactRoutingTable):
+            return self.routing_table.next_hop(destiny)
+
+        return self.routing_table[destiny][1][0]
+
+    def next_hops(self, destiny):
+        """
+        Returns every equal-cost next hop to a given destiny (only the next
+        hop of the routing table outside `"ecmp"` routing mode).
+
+        Parameters:
+        -----------
+            destiny (Vertex):
+                The destiny vertex to which the next hops are required.
+        """
+
+        if destiny in self.multipath_table:
+            return [hop for hop, _ in self.multipath_table[destiny]]
+
+        return [self.next_hop(destiny)]
+
+    def hop_cost(self, destiny, flow=None):
+        """
+        Returns the cost of the link between this vertex and its next hop
+        to a given destiny.
+
+        Parameters:
+        -----------
+            destiny (Vertex):
+                The destiny vertex of the route.
+            flow:
+                The flow of the packet (see `next_hop`).
+        """
+
+        if destiny not in self.routing_table:
+            raise ValueError(f"Destiny {destiny} not in routing table")
+
+        if flow is not None and len(self.multipath_table.get(destiny, ())) > 1:
+            return self._multipath_hop(destiny, flow)[1]
+
+        if isinstance(self.routing_table, CompactRoutingTable):
+            return self.routing_table.hop_cost(destiny)
+
+        return self.routing_table[destiny][1][1]
+
+    def path_cost(self, destiny):
+        """
+        Returns the total cost of the route to a given destiny
+        ('math.inf' if it is unreachable).
+
+        Parameters:
+        -----------
+            destiny (Vertex):
+                The destiny vertex of the route.
+        """
+
+        if destiny not in self.routing_table:
+            raise ValueError(f"Destiny {destiny} not in routing table")
+
+        if isinstance(self.routing_table, CompactRoutingTable):
+            return self.routing_table.path_cost(destiny)
+
+        path = self.routing_table[destiny]
+        return path[-1][1] if path else math.inf
+
+    def route(self, address):
+        """
+        Returns the next hop to an address by longest-prefix match in the
+        prefix table: the gateway of the most specific prefix containing it,
+        or the address itself when it is directly connected. Returns None
+        when there is no route.
+
+        Parameters:
+        -----------
+            address (str or int):
+                The destiny IPv4 address, dotted or as an int.
+        """
+
+        value = address if isinstance(address, int) else ip_to_int(address)
+
+        if self.forwarding_engine is not None:
+            next_hop = self.forwarding_engine.lookup(value)
+        elif self.prefix_table is not None:
+            next_hop = self.prefix_table.lookup(value)
+        else:
+            raise ValueError(f"Prefix table of {self.identifier} not built")
+
+        if next_hop == CONNECTED:
+            return int_to_ip(value)
+        if next_hop is None or next_hop == UNREACHABLE:
+            return None
+
+        return next_hop
+
+    def route_batch(self, addresses) -> list:
+        """
+        Returns the next hop to each address like `route`, for addresses
+        given as ints, with one forwarding engine lookup for all of them.
+
+        Parameters:
+        -----------
+            addresses (list):
+                The destiny IPv4 addresses, as ints.
+        """
+
+        if self.forwarding_engine is None:
+            raise ValueError(f"Forwarding engine of {self.identifier} not built")
+
+        return [
+            int_to_ip(address) if next_hop == CONNECTED else (None if next_hop == UNREACHABLE else next_hop)
+            for address, next_hop in zip(addresses, self.forwarding_engine.lookup_batch(addresses))
+        ]
+
+    def _multipath_hop(self, destiny, flow):
+        """
+        Picks the (next hop, cost) of a flow among the equal-cost next hops
+        to a destiny.
+
+        The CRC32 of the flow is mixed with the CRC32 of the identifier of
+        the vertex by a multiplicative hash: CRC32 alone is linear, so
+        every hop would make correlated choices (hash polarization).
+        """
+
+        hops = self.multipath_table[destiny]
+        mixed = ((zlib.crc32(str(flow).encode()) ^ zlib.crc32(self.identifier.encode())) * 0x9E3779B1) & 0xFFFFFFFF
+
+        return hops[(mixed >> 16) % len(hops)]